@@ -0,0 +1,82 @@
+"""Benchmark decoding a downloaded audio stream for Whisper.
+
+Compares the old download path, which re-encoded the native stream to a
+192k MP3 (what yt-dlp's FFmpegExtractAudio did) and then decoded that MP3
+to 16 kHz PCM, with decoding the native container straight to PCM through
+an ffmpeg pipe. Reports wall time, bytes written to disk and the block
+writes of the ffmpeg child processes.
+
+Pass a file as yt-dlp downloads it with 'bestaudio' (usually .m4a or .webm).
+
+Usage: python benchmarks/bench_audio_decode.py CLIP [--runs 3]
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.audio import SAMPLE_RATE, load_audio  # noqa: E402
+
+
+def child_blocks_written():
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_oublock
+
+
+def mp3_path(clip, workdir):
+    """Old path: encode to MP3 on disk, then decode the MP3."""
+    mp3 = Path(workdir) / "audio.mp3"
+    subprocess.run(["ffmpeg", "-nostdin", "-y", "-i", str(clip), "-vn", "-codec:a", "libmp3lame",
+                    "-b:a", "192k", str(mp3)], capture_output=True, check=True)
+    audio = load_audio(mp3)
+    written = mp3.stat().st_size
+    mp3.unlink()
+    return audio, written
+
+
+def direct_path(clip, workdir):
+    """New path: decode the native container straight to PCM."""
+    return load_audio(clip), 0
+
+
+def measure(path, clip, runs):
+    best = None
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(runs):
+            blocks = child_blocks_written()
+            start = time.perf_counter()
+            audio, written = path(clip, workdir)
+            elapsed = time.perf_counter() - start
+            sample = (elapsed, written, child_blocks_written() - blocks, len(audio))
+            best = sample if best is None or sample[0] < best[0] else best
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("clip", help="Downloaded audio stream (m4a, webm, opus...)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    clip = Path(args.clip)
+    print(f"{clip.name}: {clip.stat().st_size / 1e6:.1f} MB native stream")
+    print(f"\n{'path':26} {'wall':>9} {'written':>10} {'blocks out':>11} {'audio':>8}")
+    results = {}
+    for name, path in (("mp3 re-encode + decode", mp3_path), ("direct decode", direct_path)):
+        elapsed, written, blocks, samples = measure(path, clip, args.runs)
+        results[name] = elapsed
+        print(f"{name:26} {elapsed:8.2f}s {written / 1e6:8.1f}MB {blocks:11d} "
+              f"{samples / SAMPLE_RATE:7.0f}s")
+
+    saved = results["mp3 re-encode + decode"] - results["direct decode"]
+    print(f"\ndirect decode saves {saved:.2f}s "
+          f"({saved / results['mp3 re-encode + decode']:.0%}) per file")
+
+
+if __name__ == "__main__":
+    main()
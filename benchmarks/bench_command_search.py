@@ -0,0 +1,76 @@
+"""Benchmark `nexus quick` search over a large synthetic command library.
+
+Generates N saved commands, then times the FTS5 search used by
+Storage.search_commands against the previous three-column LIKE scan.
+
+Usage: python benchmarks/bench_command_search.py [--commands 100000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.storage import Storage  # noqa: E402
+
+TOOLS = ["docker", "kubectl", "systemctl", "git", "rsync", "tar", "ssh", "journalctl", "apt", "ufw"]
+VERBS = ["status", "restart", "logs", "prune", "list", "inspect", "describe", "sync", "pull", "backup"]
+TARGETS = ["nginx", "postgres", "redis", "api", "worker", "cron", "grafana", "traefik", "minio", "vault"]
+QUERIES = ["dock prune", "kubectl logs", "nginx", "backup vault", "systemctl rest", "zzz-nomatch"]
+
+
+def populate(storage, count):
+    rng = random.Random(42)
+    rows = []
+    for _ in range(count):
+        tool, verb, target = rng.choice(TOOLS), rng.choice(VERBS), rng.choice(TARGETS)
+        rows.append((f"{tool} {verb} {target}-{rng.randint(1, 999)}", tool,
+                     f"{verb} the {target} service"))
+    with storage._connection() as conn:
+        conn.executemany("INSERT INTO commands (command, category, description) VALUES (?, ?, ?)", rows)
+
+
+def like_search(storage, keyword):
+    with storage._connection() as conn:
+        return conn.execute(
+            """SELECT * FROM commands
+               WHERE command LIKE ? OR category LIKE ? OR description LIKE ?
+               ORDER BY created_at DESC""",
+            (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%")
+        ).fetchall()
+
+
+def timed(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Storage(Path(tmpdir) / "bench.db")
+        start = time.perf_counter()
+        populate(storage, args.commands)
+        print(f"indexed {args.commands} commands in {time.perf_counter() - start:.2f}s")
+
+        print(f"{'query':16} {'LIKE scan':>16} {'FTS5 (limit ' + str(args.limit) + ')':>22}")
+        for query in QUERIES:
+            like_ms, like_rows = timed(lambda: like_search(storage, query))
+            fts_ms, fts_rows = timed(lambda: storage.search_commands(query, limit=args.limit))
+            print(f"{query:16} {like_ms:9.2f}ms {like_rows:5d} {fts_ms:13.2f}ms {fts_rows:5d}")
+
+
+if __name__ == "__main__":
+    main()
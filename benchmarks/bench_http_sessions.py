@@ -0,0 +1,95 @@
+"""Benchmark pooled HTTP sessions against bare requests.post.
+
+Starts a local stub Ollama server, asks the same question repeatedly through
+an OllamaClient and reports TCP connections opened plus p50/p99 latency.
+
+Usage: python benchmarks/bench_http_sessions.py [--requests 200]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests  # noqa: E402
+from nexus_qa.ai_client import OllamaClient  # noqa: E402
+from nexus_qa.models import ProviderConfig  # noqa: E402
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """Minimal /api/generate endpoint with keep-alive support."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubOllamaHandler.lock:
+            StubOllamaHandler.connections += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = json.dumps({"response": "docker ps", "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BareRequestsSession:
+    """Stand-in session that reproduces the old per-call requests.post."""
+
+    def post(self, *args, **kwargs):
+        return requests.post(*args, **kwargs)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(label, client, count):
+    StubOllamaHandler.connections = 0
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        client.ask(f"question {i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    print(f"{label:8} connections={StubOllamaHandler.connections:5d} "
+          f"p50={percentile(latencies, 50):.3f}ms p99={percentile(latencies, 99):.3f}ms "
+          f"mean={statistics.mean(latencies):.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllamaHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    config = ProviderConfig(model="stub", base_url=f"http://127.0.0.1:{server.server_port}")
+    try:
+        run("bare", OllamaClient(config, session=BareRequestsSession()), args.requests)
+        run("pooled", OllamaClient(config), args.requests)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
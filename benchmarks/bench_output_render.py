@@ -0,0 +1,91 @@
+"""Benchmark per-call answer rendering: rich panels vs machine output.
+
+Renders synthetic answers of --kb kilobytes with Formatter.format_response
+(panels, Syntax highlighting and Markdown, written to an in-memory terminal)
+and with MachineFormatter in each machine format, and reports the one-off
+import cost of each path in a fresh interpreter.
+
+Usage: python benchmarks/bench_output_render.py [--kb 2 20] [--runs 20]
+"""
+
+import argparse
+import io
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.machine_output import MACHINE_FORMATS, MachineFormatter  # noqa: E402
+
+BLOCKS = [
+    "## Checking the service\n",
+    "The daemon keeps its state in memory, so restarting it drops active sessions.\n",
+    "1. `systemctl status nginx` - check whether it is running\n",
+    "- docker ps: list running containers\n",
+    "$ sudo apt update && sudo apt upgrade\n",
+    "```bash\ndocker compose up -d\ndocker compose logs -f web\n```\n",
+    "\n",
+]
+
+def make_response(kb, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    while sum(map(len, parts)) < kb * 1024:
+        parts.append(rng.choice(BLOCKS))
+    return "".join(parts)
+
+
+IMPORT_CODE = ("import time; start = time.perf_counter(); import {module}; "
+               "print((time.perf_counter() - start) * 1000)")
+
+
+def import_ms(module):
+    result = subprocess.run([sys.executable, "-c", IMPORT_CODE.format(module=module)],
+                            capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parent.parent)
+    return float(result.stdout)
+
+
+def best_ms(render, response, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        render(response)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kb", type=int, nargs="+", default=[2, 20])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    from rich.console import Console
+    from nexus_qa.formatter import Formatter
+
+    renderers = {}
+    for verbose in (False, True):
+        formatter = Formatter(verbose=verbose)
+        formatter.console = Console(file=io.StringIO(), width=100, force_terminal=True)
+        renderers["rich (verbose)" if verbose else "rich"] = formatter.format_response
+    for output in MACHINE_FORMATS:
+        formatter = MachineFormatter(output, stream=io.StringIO(), err=io.StringIO())
+        renderers[output] = (lambda f: lambda response: f.format_response(
+            response, command="ask", provider="ollama", latency_ms=1.0))(formatter)
+
+    print(f"{'import':16} {'rich':>10} {import_ms('nexus_qa.formatter'):>8.1f}ms")
+    print(f"{'':16} {'machine':>10} {import_ms('nexus_qa.machine_output'):>8.1f}ms")
+    print()
+    print(f"{'renderer':16}" + "".join(f"{f'{kb}KB':>12}" for kb in args.kb))
+    responses = [make_response(kb) for kb in args.kb]
+    for name, render in renderers.items():
+        render(responses[0])  # warm up lazy imports (Markdown, Syntax)
+        print(f"{name:16}" + "".join(f"{best_ms(render, r, args.runs):>10.2f}ms" for r in responses))
+
+
+if __name__ == "__main__":
+    main()
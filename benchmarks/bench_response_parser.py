@@ -0,0 +1,66 @@
+"""Benchmark parsing large AI answers into commands and explanation.
+
+Builds synthetic answers of --kb kilobytes (headers, prose, bullet lists
+with inline code, $ prompts and fenced code blocks) and times
+response_parser.parse_response, which yields the commands, explanation and
+brief summary from a single pass.
+
+Usage: python benchmarks/bench_response_parser.py [--kb 100 1000] [--runs 5]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.response_parser import parse_response  # noqa: E402
+
+BLOCKS = [
+    "## Checking the service\n",
+    "The daemon keeps its state in memory, so restarting it drops active sessions.\n",
+    "1. `systemctl status nginx` - check whether it is running\n",
+    "2. `journalctl -u nginx --since today`: read today's logs\n",
+    "- docker ps: list running containers\n",
+    "$ sudo apt update && sudo apt upgrade\n",
+    "Use `git log --oneline` or `kubectl get pods -A` to inspect the state, not `ls`.\n",
+    "```bash\ndocker compose up -d\ndocker compose logs -f web\n```\n",
+    "sudo systemctl restart nginx\n",
+    "\n",
+]
+
+
+def make_response(kb, seed=0):
+    rng = random.Random(seed)
+    parts = []
+    size = 0
+    while size < kb * 1024:
+        block = rng.choice(BLOCKS)
+        parts.append(block)
+        size += len(block)
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kb", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'lines':>8} {'best':>10} {'MB/s':>8} {'commands':>9}")
+    for kb in args.kb:
+        response = make_response(kb)
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            parsed = parse_response(response)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{kb:>6}KB {response.count(chr(10)):>8} {best * 1000:>8.1f}ms "
+              f"{len(response) / best / 1e6:>8.1f} {len(parsed.commands):>9}")
+
+
+if __name__ == "__main__":
+    main()
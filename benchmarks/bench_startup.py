@@ -0,0 +1,86 @@
+"""Benchmark `nexus` cold start and guard it against import-time regressions.
+
+Uses `python -X importtime` to measure the cumulative import cost of
+nexus_qa.main and the heaviest modules it pulls in, then times full
+in-process runs of commands that never reach an AI provider. Exits 1 when
+the import cost exceeds --max-import-ms (or a command exceeds
+--max-command-ms), so it can run as a CI check.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--max-import-ms 60]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = [["--help"], ["quick", "docker"], ["history"], ["list"], ["config"]]
+
+
+def import_times(env):
+    """Return {module: cumulative microseconds} for `import nexus_qa.main`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import nexus_qa.main"],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if module.strip() == "site":
+            # Interpreter start-up (site and .pth files) is not ours to budget
+            times = {}
+        elif cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def timed_run(argv, env):
+    start = time.perf_counter()
+    subprocess.run(argv, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                   check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def command_time(args, env, runs):
+    return min(timed_run([sys.executable, "-m", "nexus_qa.main", *args], env) for _ in range(runs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=60.0)
+    parser.add_argument("--max-command-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {**os.environ, "HOME": home, "NEXUS_NO_DAEMON": "1"}
+
+        samples = [import_times(env) for _ in range(args.runs)]
+        main_ms = min(sample["nexus_qa.main"] for sample in samples) / 1000
+        heaviest = sorted(samples[-1].items(), key=lambda item: item[1], reverse=True)[:8]
+        print(f"import nexus_qa.main: {main_ms:.1f}ms (budget {args.max_import_ms:.0f}ms)")
+        for module, cumulative in heaviest:
+            print(f"  {cumulative / 1000:8.1f}ms  {module}")
+
+        baseline_ms = min(timed_run([sys.executable, "-c", "pass"], env) for _ in range(args.runs))
+        print(f"\n{'command':24} {'wall':>10}   (bare interpreter {baseline_ms:.0f}ms)")
+
+        failed = main_ms > args.max_import_ms
+        for command in COMMANDS:
+            elapsed = command_time(command, env, args.runs)
+            print(f"nexus {' '.join(command):18} {elapsed:8.1f}ms")
+            if args.max_command_ms is not None and elapsed > args.max_command_ms:
+                failed = True
+
+    if failed:
+        print("\nstartup budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
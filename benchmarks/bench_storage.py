@@ -0,0 +1,70 @@
+"""Benchmark Storage history inserts and cache lookups.
+
+Compares the old connection-per-operation behaviour (default rollback journal,
+no pragmas) against the shared WAL connection.
+
+Usage: python benchmarks/bench_storage.py [--ops 2000]
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.storage import Storage  # noqa: E402
+
+
+class PerOperationStorage(Storage):
+    """Storage that opens and closes a plain connection for every operation."""
+
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._get_connection()
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def measure(label, func, ops):
+    start = time.perf_counter()
+    for i in range(ops):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:16} {ops / elapsed:10.0f} ops/sec")
+
+
+def run(label, storage, ops):
+    print(label)
+    expires_at = datetime.now() + timedelta(hours=1)
+    for i in range(100):
+        storage.save_cache(f"hash-{i}", f"query {i}", "response " * 50, "ollama", expires_at)
+
+    measure("history insert", lambda i: storage.save_history(f"query {i}", "response", "ollama"), ops)
+    measure("cache lookup", lambda i: storage.get_cache(f"hash-{i % 100}"), ops)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        run("per-operation connection", PerOperationStorage(Path(tmpdir) / "before.db"), args.ops)
+        run("shared WAL connection", Storage(Path(tmpdir) / "after.db"), args.ops)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark listing transcriptions: full file reads vs the metadata index.
+
+Writes --count synthetic transcripts of --kb kilobytes each, then times the
+old listing (read every file to parse its header), a cold index build, and a
+warm listing where nothing changed.
+
+Usage: python benchmarks/bench_transcript_list.py [--count 5000] [--kb 50]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.transcript_index import TranscriptIndex  # noqa: E402
+
+
+def write_corpus(directory, count, kb):
+    body = ("lorem ipsum dolor sit amet " * (kb * 40))[:kb * 1024]
+    for i in range(count):
+        (directory / f"video{i:05d}_20240101_000000.txt").write_text(
+            f"{'=' * 80}\nYOUTUBE VIDEO TRANSCRIPTION\n{'=' * 80}\n"
+            f"Video ID:     video{i:05d}\nTitle:        Video {i}\nUploader:     someone\n"
+            f"Upload Date:  20240101\nDuration:     600 seconds\n"
+            f"Transcribed:  2024-01-01 00:00:00\n{'=' * 80}\n\n{body}",
+            encoding="utf-8",
+        )
+
+
+def full_read_listing(directory):
+    """The listing as it was before the index: read and split every file."""
+    transcriptions = []
+    for file_path in sorted(directory.glob("*.txt"), reverse=True):
+        content = file_path.read_text(encoding="utf-8")
+        metadata = {'file': file_path.name, 'size': file_path.stat().st_size,
+                    'modified': datetime.fromtimestamp(file_path.stat().st_mtime)}
+        for line in content.split('\n')[:10]:
+            if line.startswith('Title:'):
+                metadata['title'] = line.split(':', 1)[1].strip()
+        transcriptions.append(metadata)
+    return transcriptions
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--kb", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        write_corpus(directory, args.count, args.kb)
+        print(f"{args.count} transcripts x {args.kb} KB")
+
+        elapsed, listed = timed(lambda: full_read_listing(directory))
+        print(f"{'full read (before)':24} {elapsed:9.1f}ms  {len(listed)} entries")
+
+        index = TranscriptIndex(directory)
+        elapsed, listed = timed(index.list)
+        print(f"{'index, cold build':24} {elapsed:9.1f}ms  {len(listed)} entries")
+        elapsed, listed = timed(index.list)
+        print(f"{'index, warm':24} {elapsed:9.1f}ms  {len(listed)} entries")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
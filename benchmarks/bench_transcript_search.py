@@ -0,0 +1,86 @@
+"""Benchmark full-text search over transcript segments.
+
+Writes --count synthetic transcripts with --segments timestamped segments
+each (plus their .segments.json sidecars), builds the index, then times
+queries and an incremental sync after a few new transcripts land.
+
+Usage: python benchmarks/bench_transcript_search.py [--count 2000] [--segments 300]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.transcript_index import TranscriptIndex, segments_path  # noqa: E402
+
+WORDS = ("kernel memory latency container deploy cluster network packet cache thread "
+         "scheduler socket storage index query replica failover rollout metric trace "
+         "the a of and to in is that it for on with as this").split()
+
+QUERIES = ["latency", "kubernetes", "cache replica", "failover rollout metric", "sched"]
+
+
+def write_transcript(directory, i, segment_count, rng):
+    path = directory / f"vid{i:08d}_20240101_000000.txt"
+    segments = []
+    for n in range(segment_count):
+        text = " ".join(rng.choice(WORDS) for _ in range(14))
+        if rng.random() < 0.001:
+            text += " kubernetes"
+        segments.append({"start": n * 5.0, "end": n * 5.0 + 5.0, "text": text})
+    segments_path(path).write_text(json.dumps(segments), encoding="utf-8")
+    path.write_text(
+        f"{'=' * 80}\nYOUTUBE VIDEO TRANSCRIPTION\n{'=' * 80}\n"
+        f"Video ID:     vid{i:08d}\nTitle:        Talk {i}\nUploader:     someone\n"
+        f"Upload Date:  20240101\nDuration:     {segment_count * 5} seconds\n"
+        f"Transcribed:  2024-01-01 00:00:00\n{'=' * 80}\n\n"
+        + " ".join(segment["text"] for segment in segments),
+        encoding="utf-8",
+    )
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--segments", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for i in range(args.count):
+            write_transcript(directory, i, args.segments, rng)
+        print(f"{args.count} transcripts x {args.segments} segments "
+              f"({args.count * args.segments} segments)")
+
+        index = TranscriptIndex(directory)
+        elapsed, indexed = timed(index.sync)
+        print(f"{'initial index build':28} {elapsed:9.1f}ms  ({indexed} files)")
+
+        for query in QUERIES:
+            best = min(timed(lambda: index.search(query))[0] for _ in range(args.runs))
+            hits = len(index.search(query))
+            print(f"{'search ' + repr(query):28} {best:9.2f}ms  ({hits} hits)")
+
+        for i in range(args.count, args.count + 10):
+            write_transcript(directory, i, args.segments, rng)
+        elapsed, indexed = timed(index.sync)
+        print(f"{'incremental sync':28} {elapsed:9.1f}ms  ({indexed} new files)")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare chunked parallel transcription with a single unchunked pass.
+
+Transcribes a local audio clip once on CPU without chunking and once split
+at silences across --workers processes. Prints the wall time and realtime
+factor of each, plus the word error rate of the chunked text measured
+against the unchunked text (the stitching cost in accuracy).
+
+Requires openai-whisper and ffmpeg.
+
+Usage: python benchmarks/bench_transcription_chunks.py CLIP [--model-size base] [--workers 4]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.audio import SAMPLE_RATE, find_split_points, load_audio  # noqa: E402
+from nexus_qa.transcriber import decode_options, transcribe_chunked  # noqa: E402
+from nexus_qa.whisper_models import get_model  # noqa: E402
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1] / max(1, len(ref))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("clip", help="Local audio or video file")
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--chunk-seconds", type=float, default=60.0)
+    args = parser.parse_args()
+
+    audio = load_audio(args.clip)
+    duration = len(audio) / SAMPLE_RATE
+    splits = find_split_points(audio, args.chunk_seconds)
+    print(f"{args.clip}: {duration:.1f}s of audio, "
+          f"splits at {', '.join(f'{s / SAMPLE_RATE:.1f}s' for s in splits) or 'none'}")
+
+    # Load outside the timed region so both paths measure inference only
+    model, _ = get_model(args.model_size, "cpu", "float32")
+    start = time.perf_counter()
+    baseline = model.transcribe(audio, **decode_options("float32"))["text"].strip()
+    unchunked = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = transcribe_chunked(audio, args.model_size, args.workers, args.chunk_seconds)
+    chunked = time.perf_counter() - start - result["model_load"]
+
+    print(f"\n{'path':28} {'wall':>9} {'x realtime':>11}")
+    print(f"{'unchunked (1 process)':28} {unchunked:8.1f}s {duration / unchunked:10.2f}x")
+    print(f"{f'chunked ({args.workers} workers)':28} {chunked:8.1f}s {duration / chunked:10.2f}x")
+    print(f"\nspeedup {unchunked / chunked:.2f}x, "
+          f"WER vs unchunked {word_error_rate(baseline, result['text']):.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Evaluate response-cache hit rates by replaying question history.
+
+Replays questions in order and counts how many would have been answered from
+an earlier question's cache entry with raw keys (the old behaviour),
+normalized keys, and normalized keys plus the MinHash similarity tier at each
+--thresholds value. Entries never expire during the replay.
+
+History comes from a nexus database (--db, default ~/.config/nexus/data/commands.db)
+or an exported file (--file): one question per line, or a JSON list of strings
+or of objects with "query" (and optionally "provider"). Without either, a small
+built-in set of reworded questions is used. --examples prints similarity
+matches so false positives can be checked by eye.
+
+Usage: python benchmarks/eval_cache_hit_rate.py [--db PATH | --file history.json]
+       [--thresholds 0.7 0.8 0.85 0.9] [--examples 10]
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from nexus_qa.cache_keys import (  # noqa: E402
+    COMMAND_PREFIXES, hash_query, is_question, minhash_signature, similarity,
+)
+
+SAMPLE = [
+    "how to check docker status",
+    "How to check Docker status?",
+    "how do I check the docker status",
+    "list docker volumes",
+    "how to list all docker volumes",
+    "git undo last commit",
+    "how do i undo the last git commit",
+    "how to install python 3.12 on ubuntu",
+    "how to install python 3.11 on ubuntu",
+    "restart nginx",
+    "restart apache",
+    "check:rm -rf /tmp/*",
+    "check:rm -rf /",
+    "find large files",
+    "Find large files.",
+]
+
+
+def load_history(args):
+    """Return ``(question, provider)`` pairs in the order they were asked."""
+    if args.file:
+        text = Path(args.file).read_text(encoding="utf-8")
+        if args.file.endswith(".json"):
+            entries = json.loads(text)
+            return [(e, None) if isinstance(e, str) else (e["query"], e.get("provider")) for e in entries]
+        return [(line.strip(), None) for line in text.splitlines() if line.strip()]
+
+    db = Path(args.db).expanduser()
+    if not db.exists():
+        print(f"No history database at {db}; using the built-in sample\n")
+        return [(question, None) for question in SAMPLE]
+    conn = sqlite3.connect(db)
+    rows = conn.execute("SELECT query, provider FROM history ORDER BY created_at, id").fetchall()
+    conn.close()
+    return [(history_key(query), provider) for query, provider in rows]
+
+
+def history_key(label):
+    """History labels command lookups "check: <command>"; their cache keys are "check:<command>"."""
+    command, separator, rest = label.partition(": ")
+    if separator and f"{command}:" in COMMAND_PREFIXES:
+        return f"{command}:{rest}"
+    return label
+
+
+def replay_exact(history, key):
+    seen = set()
+    hits = 0
+    for question, provider in history:
+        k = key(question, provider)
+        hits += k in seen
+        seen.add(k)
+    return hits
+
+
+def replay_similarity(history, threshold):
+    seen = set()
+    signatures = []  # (provider, signature, question)
+    hits, matches = 0, []
+    for question, provider in history:
+        k = hash_query(question, provider)
+        if k in seen:
+            hits += 1
+        elif is_question(question):
+            signature = minhash_signature(question)
+            best = max(((similarity(signature, s), q) for p, s, q in signatures if p == provider),
+                       default=(0.0, None))
+            if best[0] >= threshold:
+                hits += 1
+                matches.append((best[0], question, best[1]))
+            signatures.append((provider, signature, question))
+        seen.add(k)
+    return hits, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="~/.config/nexus/data/commands.db")
+    parser.add_argument("--file", help="Exported history (.json list or one question per line)")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.7, 0.8, 0.85, 0.9])
+    parser.add_argument("--examples", type=int, default=5, help="Similarity matches to print per threshold")
+    args = parser.parse_args()
+
+    history = load_history(args)
+    total = len(history)
+    if not total:
+        print("History is empty")
+        return
+
+    def raw_key(question, provider):
+        return hashlib.sha256(f"{provider}:{question}".encode()).hexdigest()
+
+    print(f"{total} questions, {len({q for q, _ in history})} distinct\n")
+    print(f"{'keying':24} {'hits':>6} {'hit rate':>9} {'time':>9}")
+
+    def report(name, hits, elapsed):
+        print(f"{name:24} {hits:>6} {hits / total:>8.1%} {elapsed * 1000:>7.1f}ms")
+
+    start = time.perf_counter()
+    report("raw", replay_exact(history, raw_key), time.perf_counter() - start)
+    start = time.perf_counter()
+    report("normalized", replay_exact(history, hash_query), time.perf_counter() - start)
+
+    examples = []
+    for threshold in args.thresholds:
+        start = time.perf_counter()
+        hits, matches = replay_similarity(history, threshold)
+        report(f"similarity >= {threshold:g}", hits, time.perf_counter() - start)
+        examples.append((threshold, matches))
+
+    for threshold, matches in examples:
+        if matches and args.examples:
+            print(f"\nSimilarity matches at {threshold:g}:")
+            for score, question, matched in matches[:args.examples]:
+                print(f"  {score:.2f}  {question!r} -> {matched!r}")
+
+
+if __name__ == "__main__":
+    main()
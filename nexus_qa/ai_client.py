@@ -1,201 +1,308 @@
 """AI client abstraction for multiple providers."""
 
+import json
 import os
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 import requests
-from nexus_qa.models import ProviderConfig
+from nexus_qa.models import ProviderConfig, HttpConfig
 from nexus_qa.rate_limiter import RateLimiter
 from nexus_qa.cache import Cache
+from nexus_qa.sessions import get_session
+from nexus_qa.single_flight import SingleFlight
+
+# Identical questions in flight at the same time, across all clients in this process
+_in_flight = SingleFlight()
+
+
+def coalesced_requests() -> int:
+    """Number of requests in this process that shared another request's provider call."""
+    return _in_flight.coalesced
 
 
 class AIClient(ABC):
-    """Abstract base class for AI clients."""
+    """Abstract base class for AI clients.
+    
+    Subclasses describe how to build a provider request and how to read its
+    response; ``ask`` and ``ask_stream`` share caching, rate limiting and
+    error handling. Concurrent ``ask`` calls for the same question, provider
+    and model share one provider call and one cache write.
+    """
     
-    def __init__(self, config: ProviderConfig, rate_limiter: Optional[RateLimiter] = None, 
-                 cache: Optional[Cache] = None):
+    provider_name = ""
+    display_name = ""
+    
+    def __init__(self, config: ProviderConfig, rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[Cache] = None, session: Optional[requests.Session] = None):
         """Initialize AI client."""
         self.config = config
         self.rate_limiter = rate_limiter
         self.cache = cache
+        self.session = session or get_session(self.provider_name or self.__class__.__name__)
+    
+    @abstractmethod
+    def _build_request(self, question: str, stream: bool = False) -> Dict[str, Any]:
+        """Build keyword arguments (url, headers, json) for the provider request."""
+        pass
     
     @abstractmethod
+    def _parse_answer(self, result: dict) -> str:
+        """Extract the answer text from a complete JSON response."""
+        pass
+    
+    @abstractmethod
+    def _iter_chunks(self, response: requests.Response) -> Iterator[str]:
+        """Yield answer text chunks from a streaming response."""
+        pass
+    
     def ask(self, question: str, verbose: bool = False) -> str:
         """Ask a question and get a response."""
-        pass
+        # Check cache first
+        cached = self._check_cache(question)
+        if cached:
+            return cached
+        
+        answer, _ = self.coalesce(question, lambda: self._fetch(question))
+        return answer
+    
+    def _fetch(self, question: str) -> str:
+        """Rate-limit, call the provider and cache the answer."""
+        self.check_rate_limit()
+        answer = self.complete(question)
+        self._save_cache(question, answer)
+        return answer
+        
+    def coalesce(self, key: str, fetch: Callable[[], str]) -> Tuple[str, bool]:
+        """Run ``fetch`` once for concurrent callers with the same key, provider and model.
+        
+        Returns ``(answer, shared)``; ``shared`` is True when another caller's
+        call produced the answer.
+        """
+        return _in_flight.do((self.cache_provider, self.config.model, key), fetch)
+    
+    def ask_stream(self, question: str, verbose: bool = False) -> Iterator[str]:
+        """Ask a question and yield the answer incrementally as it arrives.
+        
+        The full answer is cached once the stream completes; a cached answer
+        is yielded as a single chunk.
+        """
+        cached = self._check_cache(question)
+        if cached:
+            yield cached
+            return
+        
+        self.check_rate_limit()
+        chunks = []
+        for chunk in self.complete_stream(question):
+            chunks.append(chunk)
+            yield chunk
+        
+        # Only cache answers that streamed to completion
+        self._save_cache(question, "".join(chunks))
+    
+    def complete(self, question: str) -> str:
+        """Send a question to the provider, bypassing cache and rate limiter."""
+        request = self._build_request(question)
+        
+        try:
+            response = self.session.post(timeout=60, **request)
+            response.raise_for_status()
+            return self._parse_answer(response.json())
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Error connecting to {self.display_name}: {str(e)}")
+    
+    def complete_stream(self, question: str) -> Iterator[str]:
+        """Stream a question's answer from the provider, bypassing cache and rate limiter."""
+        request = self._build_request(question, stream=True)
+        
+        try:
+            with self.session.post(timeout=60, stream=True, **request) as response:
+                response.raise_for_status()
+                for chunk in self._iter_chunks(response):
+                    if chunk:
+                        yield chunk
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Error connecting to {self.display_name}: {str(e)}")
+        
+    @property
+    def cache_provider(self) -> str:
+        """Provider name that cache entries are keyed on (the config name, e.g. ``ollama``)."""
+        return self.provider_name or self.__class__.__name__
     
     def _check_cache(self, question: str) -> Optional[str]:
         """Check cache for question."""
         if self.cache:
-            return self.cache.get(question, self.__class__.__name__)
+            return self.cache.get(question, self.cache_provider)
         return None
     
     def _save_cache(self, question: str, response: str):
         """Save response to cache."""
-        if self.cache:
-            self.cache.set(question, response, self.__class__.__name__)
+        if self.cache and response:
+            self.cache.set(question, response, self.cache_provider)
+    
+    def check_rate_limit(self):
+        """Consume one request from the rate limiter, raising when it is exhausted."""
+        allowed, error = self._check_rate_limit()
+        if not allowed:
+            raise Exception(error)
     
     def _check_rate_limit(self) -> Tuple[bool, Optional[str]]:
         """Check rate limit."""
         if self.rate_limiter:
-            return self.rate_limiter.is_allowed(self.__class__.__name__)
+            return self.rate_limiter.is_allowed(self.cache_provider)
         return True, None
+    
+    @staticmethod
+    def _iter_json_lines(response: requests.Response) -> Iterator[dict]:
+        """Yield JSON objects from a newline-delimited JSON stream."""
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line.decode("utf-8"))
+    
+    @staticmethod
+    def _iter_sse_data(response: requests.Response) -> Iterator[dict]:
+        """Yield JSON payloads from the ``data:`` lines of a server-sent event stream."""
+        for line in response.iter_lines():
+            if not line or not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                return
+            yield json.loads(data.decode("utf-8"))
 
 
 class OllamaClient(AIClient):
     """Ollama AI client for local models."""
     
-    def ask(self, question: str, verbose: bool = False) -> str:
-        """Ask Ollama a question."""
-        # Check cache first
-        cached = self._check_cache(question)
-        if cached:
-            return cached
-        
-        # Check rate limit
-        allowed, error = self._check_rate_limit()
-        if not allowed:
-            raise Exception(error)
-        
+    provider_name = "ollama"
+    display_name = "Ollama"
+    
+    def _build_request(self, question: str, stream: bool = False) -> Dict[str, Any]:
+        """Build an /api/generate request."""
         base_url = self.config.base_url or "http://localhost:11434"
         model = self.config.model or "llama3.2"
         
-        try:
-            response = requests.post(
-                f"{base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": question,
-                    "stream": False,
-                },
-                timeout=60,
-            )
-            response.raise_for_status()
-            result = response.json()
-            answer = result.get("response", "No response from Ollama.")
-            
-            # Save to cache
-            self._save_cache(question, answer)
-            
-            return answer
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error connecting to Ollama: {str(e)}")
+        return {
+            "url": f"{base_url}/api/generate",
+            "json": {
+                "model": model,
+                "prompt": question,
+                "stream": stream,
+            },
+        }
+    
+    def _parse_answer(self, result: dict) -> str:
+        return result.get("response", "No response from Ollama.")
+    
+    def _iter_chunks(self, response: requests.Response) -> Iterator[str]:
+        # Ollama streams NDJSON objects with a partial "response" until "done"
+        for event in self._iter_json_lines(response):
+            if event.get("error"):
+                raise Exception(f"Ollama error: {event['error']}")
+            yield event.get("response", "")
+            if event.get("done"):
+                return
 
 
 class OpenAIClient(AIClient):
     """OpenAI API client."""
     
-    def ask(self, question: str, verbose: bool = False) -> str:
-        """Ask OpenAI a question."""
-        # Check cache first
-        cached = self._check_cache(question)
-        if cached:
-            return cached
-        
-        # Check rate limit
-        allowed, error = self._check_rate_limit()
-        if not allowed:
-            raise Exception(error)
-        
+    provider_name = "openai"
+    display_name = "OpenAI"
+    
+    def _build_request(self, question: str, stream: bool = False) -> Dict[str, Any]:
+        """Build a chat completions request."""
         api_key = self.config.api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise Exception("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
         
         model = self.config.model or "gpt-4o-mini"
         
-        try:
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "user", "content": question}
-                    ],
-                    "temperature": 0.7,
-                },
-                timeout=60,
-            )
-            response.raise_for_status()
-            result = response.json()
-            answer = result["choices"][0]["message"]["content"]
-            
-            # Save to cache
-            self._save_cache(question, answer)
-            
-            return answer
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error connecting to OpenAI: {str(e)}")
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": question}
+            ],
+            "temperature": 0.7,
+        }
+        if stream:
+            payload["stream"] = True
+        
+        return {
+            "url": "https://api.openai.com/v1/chat/completions",
+            "headers": {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            "json": payload,
+        }
+    
+    def _parse_answer(self, result: dict) -> str:
+        return result["choices"][0]["message"]["content"]
+    
+    def _iter_chunks(self, response: requests.Response) -> Iterator[str]:
+        for event in self._iter_sse_data(response):
+            choices = event.get("choices") or [{}]
+            yield choices[0].get("delta", {}).get("content") or ""
 
 
 class AnthropicClient(AIClient):
     """Anthropic (Claude) API client."""
     
-    def ask(self, question: str, verbose: bool = False) -> str:
-        """Ask Anthropic a question."""
-        # Check cache first
-        cached = self._check_cache(question)
-        if cached:
-            return cached
-        
-        # Check rate limit
-        allowed, error = self._check_rate_limit()
-        if not allowed:
-            raise Exception(error)
-        
+    provider_name = "anthropic"
+    display_name = "Anthropic"
+    
+    def _build_request(self, question: str, stream: bool = False) -> Dict[str, Any]:
+        """Build a messages API request."""
         api_key = self.config.api_key or os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise Exception("Anthropic API key not found. Set ANTHROPIC_API_KEY environment variable.")
         
         model = self.config.model or "claude-3-5-sonnet-20241022"
         
-        try:
-            response = requests.post(
-                "https://api.anthropic.com/v1/messages",
-                headers={
-                    "x-api-key": api_key,
-                    "anthropic-version": "2023-06-01",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": model,
-                    "max_tokens": 1024,
-                    "messages": [
-                        {"role": "user", "content": question}
-                    ],
-                },
-                timeout=60,
-            )
-            response.raise_for_status()
-            result = response.json()
-            answer = result["content"][0]["text"]
-            
-            # Save to cache
-            self._save_cache(question, answer)
-            
-            return answer
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error connecting to Anthropic: {str(e)}")
+        payload = {
+            "model": model,
+            "max_tokens": 1024,
+            "messages": [
+                {"role": "user", "content": question}
+            ],
+        }
+        if stream:
+            payload["stream"] = True
+        
+        return {
+            "url": "https://api.anthropic.com/v1/messages",
+            "headers": {
+                "x-api-key": api_key,
+                "anthropic-version": "2023-06-01",
+                "Content-Type": "application/json",
+            },
+            "json": payload,
+        }
+    
+    def _parse_answer(self, result: dict) -> str:
+        return result["content"][0]["text"]
+    
+    def _iter_chunks(self, response: requests.Response) -> Iterator[str]:
+        # Text arrives in content_block_delta events; everything else is bookkeeping
+        for event in self._iter_sse_data(response):
+            event_type = event.get("type")
+            if event_type == "content_block_delta":
+                yield event.get("delta", {}).get("text", "")
+            elif event_type == "error":
+                raise Exception(f"Anthropic error: {event.get('error', {}).get('message', event)}")
+            elif event_type == "message_stop":
+                return
 
 
 class DeepSeekClient(AIClient):
     """DeepSeek API client."""
     
-    def ask(self, question: str, verbose: bool = False) -> str:
-        """Ask DeepSeek a question."""
-        # Check cache first
-        cached = self._check_cache(question)
-        if cached:
-            return cached
-        
-        # Check rate limit
-        allowed, error = self._check_rate_limit()
-        if not allowed:
-            raise Exception(error)
-        
+    provider_name = "deepseek"
+    display_name = "DeepSeek"
+    
+    def _build_request(self, question: str, stream: bool = False) -> Dict[str, Any]:
+        """Build an OpenAI-compatible chat completions request."""
         api_key = self.config.api_key or os.getenv("DEEPSEEK_API_KEY")
         if not api_key:
             raise Exception("DeepSeek API key not found. Set DEEPSEEK_API_KEY environment variable.")
@@ -203,36 +310,36 @@ class DeepSeekClient(AIClient):
         base_url = self.config.base_url or "https://api.deepseek.com"
         model = self.config.model or "deepseek-chat"
         
-        try:
-            response = requests.post(
-                f"{base_url}/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "user", "content": question}
-                    ],
-                    "temperature": 0.7,
-                },
-                timeout=60,
-            )
-            response.raise_for_status()
-            result = response.json()
-            answer = result["choices"][0]["message"]["content"]
-            
-            # Save to cache
-            self._save_cache(question, answer)
-            
-            return answer
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error connecting to DeepSeek: {str(e)}")
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "user", "content": question}
+            ],
+            "temperature": 0.7,
+        }
+        if stream:
+            payload["stream"] = True
+        
+        return {
+            "url": f"{base_url}/v1/chat/completions",
+            "headers": {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            "json": payload,
+        }
+    
+    def _parse_answer(self, result: dict) -> str:
+        return result["choices"][0]["message"]["content"]
+    
+    def _iter_chunks(self, response: requests.Response) -> Iterator[str]:
+        for event in self._iter_sse_data(response):
+            choices = event.get("choices") or [{}]
+            yield choices[0].get("delta", {}).get("content") or ""
 
 
 def create_client(provider: str, config: ProviderConfig, rate_limiter: Optional[RateLimiter] = None,
-                  cache: Optional[Cache] = None) -> AIClient:
+                  cache: Optional[Cache] = None, http_config: Optional[HttpConfig] = None) -> AIClient:
     """Factory function to create appropriate AI client."""
     providers = {
         "ollama": OllamaClient,
@@ -245,5 +352,5 @@ def create_client(provider: str, config: ProviderConfig, rate_limiter: Optional[
     if not client_class:
         raise ValueError(f"Unknown provider: {provider}")
     
-    return client_class(config, rate_limiter, cache)
-
+    session = get_session(provider, http_config)
+    return client_class(config, rate_limiter, cache, session=session)
@@ -0,0 +1,159 @@
+"""Asyncio AI client abstraction mirroring :mod:`nexus_qa.ai_client`.
+
+There is no async HTTP library in the dependency set, so provider calls reuse
+the synchronous clients (and their pooled sessions) on a worker thread, while
+cache lookups go through aiosqlite and rate limiting through an asyncio lock.
+"""
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple, Type
+import requests
+from nexus_qa.ai_client import AIClient, OllamaClient, OpenAIClient, AnthropicClient, DeepSeekClient
+from nexus_qa.cache import AsyncCache
+from nexus_qa.models import ProviderConfig, HttpConfig
+from nexus_qa.rate_limiter import AsyncRateLimiter
+from nexus_qa.sessions import get_session
+from nexus_qa.single_flight import AsyncSingleFlight
+
+
+class AsyncAIClient:
+    """Base class for asyncio AI clients.
+    
+    Identical questions in flight at the same time share one provider call and
+    one cache write; ``coalesced`` counts the requests that were served that way.
+    """
+    
+    sync_class: Type[AIClient] = AIClient
+    
+    def __init__(self, config: ProviderConfig, rate_limiter: Optional[AsyncRateLimiter] = None,
+                 cache: Optional[AsyncCache] = None, session: Optional[requests.Session] = None):
+        """Initialize async AI client."""
+        self.config = config
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        # Cache and rate limiting are handled here, so the sync client only talks HTTP
+        self._client = self.sync_class(config, session=session)
+        self._cache_provider = self._client.cache_provider
+        self._in_flight = AsyncSingleFlight()
+    
+    @property
+    def coalesced(self) -> int:
+        """Number of requests that shared another request's provider call."""
+        return self._in_flight.coalesced
+    
+    async def ask(self, question: str, verbose: bool = False) -> str:
+        """Ask a question and get a response."""
+        answer, _ = await self.ask_cached(question, verbose)
+        return answer
+    
+    async def ask_cached(self, question: str, verbose: bool = False) -> Tuple[str, bool]:
+        """Ask a question and return ``(answer, from_cache)``."""
+        cached = await self._check_cache(question)
+        if cached:
+            return cached, True
+        
+        answer, _ = await self._in_flight.do((self.config.model, question), lambda: self._fetch(question))
+        return answer, False
+    
+    async def _fetch(self, question: str) -> str:
+        """Rate-limit, call the provider on a worker thread and cache the answer."""
+        allowed, error = await self._check_rate_limit()
+        if not allowed:
+            raise Exception(error)
+        
+        loop = asyncio.get_running_loop()
+        answer = await loop.run_in_executor(None, self._client.complete, question)
+        
+        await self._save_cache(question, answer)
+        return answer
+    
+    async def _check_cache(self, question: str) -> Optional[str]:
+        """Check cache for question."""
+        if self.cache:
+            return await self.cache.get(question, self._cache_provider)
+        return None
+    
+    async def _save_cache(self, question: str, response: str):
+        """Save response to cache."""
+        if self.cache and response:
+            await self.cache.set(question, response, self._cache_provider)
+    
+    async def _check_rate_limit(self) -> Tuple[bool, Optional[str]]:
+        """Check rate limit."""
+        if self.rate_limiter:
+            return await self.rate_limiter.is_allowed(self._cache_provider)
+        return True, None
+
+
+class AsyncOllamaClient(AsyncAIClient):
+    """Async Ollama AI client for local models."""
+    
+    sync_class = OllamaClient
+
+
+class AsyncOpenAIClient(AsyncAIClient):
+    """Async OpenAI API client."""
+    
+    sync_class = OpenAIClient
+
+
+class AsyncAnthropicClient(AsyncAIClient):
+    """Async Anthropic (Claude) API client."""
+    
+    sync_class = AnthropicClient
+
+
+class AsyncDeepSeekClient(AsyncAIClient):
+    """Async DeepSeek API client."""
+    
+    sync_class = DeepSeekClient
+
+
+def create_async_client(provider: str, config: ProviderConfig,
+                        rate_limiter: Optional[AsyncRateLimiter] = None,
+                        cache: Optional[AsyncCache] = None,
+                        http_config: Optional[HttpConfig] = None) -> AsyncAIClient:
+    """Factory function to create appropriate async AI client."""
+    providers = {
+        "ollama": AsyncOllamaClient,
+        "openai": AsyncOpenAIClient,
+        "anthropic": AsyncAnthropicClient,
+        "deepseek": AsyncDeepSeekClient,
+    }
+    
+    client_class = providers.get(provider.lower())
+    if not client_class:
+        raise ValueError(f"Unknown provider: {provider}")
+    
+    session = get_session(provider, http_config)
+    return client_class(config, rate_limiter, cache, session=session)
+
+
+async def ask_batch(client: AsyncAIClient, questions: List[str], concurrency: int = 4,
+                    verbose: bool = False) -> List[Dict]:
+    """Ask several questions concurrently, at most ``concurrency`` at a time.
+    
+    Returns one result dict per question, in input order, with the answer (or
+    error), whether it came from cache and the per-question latency in seconds.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    async def run_one(question: str) -> Dict:
+        async with semaphore:
+            result = {
+                'question': question,
+                'answer': None,
+                'from_cache': False,
+                'error': None,
+                'latency': 0.0,
+            }
+            start = time.perf_counter()
+            try:
+                result['answer'], result['from_cache'] = await client.ask_cached(question, verbose)
+            except Exception as e:
+                result['error'] = str(e)
+            result['latency'] = time.perf_counter() - start
+            return result
+    
+    return await asyncio.gather(*(run_one(question) for question in questions))
@@ -0,0 +1,127 @@
+"""Audio helpers for transcription: caching downloads, decoding to and chunking 16 kHz mono PCM."""
+
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Whisper works on 16 kHz mono float32 audio
+SAMPLE_RATE = 16000
+
+
+def load_audio(source: Union[str, Path], sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode any file ffmpeg can read (m4a, webm, opus, mp3, video...) to mono float32.
+    
+    ffmpeg resamples the first audio stream and writes raw 16-bit samples to a
+    pipe, so the native download is decoded once with no intermediate file.
+    """
+    command = [
+        "ffmpeg", "-nostdin", "-threads", "0", "-i", str(source),
+        "-vn", "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-",
+    ]
+    try:
+        output = subprocess.run(command, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode("utf-8", errors="replace").strip().splitlines()
+        raise RuntimeError(f"ffmpeg could not decode {source}: {message[-1] if message else e}")
+    return np.frombuffer(output, np.int16).astype(np.float32) / 32768.0
+
+
+def find_split_points(audio: np.ndarray, chunk_seconds: float = 60.0, search_seconds: float = 10.0,
+                      sample_rate: int = SAMPLE_RATE, frame_seconds: float = 0.03,
+                      smooth_seconds: float = 0.3) -> List[int]:
+    """Find sample offsets that split ``audio`` into chunks of about ``chunk_seconds``.
+    
+    Each split lands on the quietest point (lowest RMS energy, smoothed over
+    ``smooth_seconds`` so it falls inside a pause rather than between
+    syllables) within ``search_seconds`` of the target boundary. The result
+    is deterministic for a given input. Audio shorter than 1.5 chunks is not
+    split.
+    """
+    frame = max(1, int(sample_rate * frame_seconds))
+    frame_count = len(audio) // frame
+    chunk_frames = int(chunk_seconds / frame_seconds)
+    if frame_count <= chunk_frames * 1.5:
+        return []
+    
+    frames = audio[:frame_count * frame].astype(np.float32).reshape(frame_count, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    window = max(1, int(smooth_seconds / frame_seconds))
+    energy = np.convolve(rms, np.ones(window) / window, mode="same")
+    
+    search_frames = int(search_seconds / frame_seconds)
+    splits = []
+    last = 0
+    while frame_count - last > chunk_frames * 1.5:
+        target = last + chunk_frames
+        low = max(last + chunk_frames // 2, target - search_frames)
+        high = min(frame_count - chunk_frames // 2, target + search_frames)
+        split = low + int(np.argmin(energy[low:high]))
+        splits.append(split * frame)
+        last = split
+    return splits
+
+
+def split_audio(audio: np.ndarray, split_points: List[int],
+                sample_rate: int = SAMPLE_RATE) -> List[Tuple[float, np.ndarray]]:
+    """Cut ``audio`` at ``split_points`` into ``(offset_seconds, chunk)`` pairs."""
+    bounds = [0, *split_points, len(audio)]
+    return [(start / sample_rate, audio[start:end]) for start, end in zip(bounds, bounds[1:])]
+
+
+class AudioCache:
+    """Downloaded audio kept on disk for re-transcription, evicted LRU under a byte quota.
+    
+    Files are named ``<video_id>.<ext>``. A cache hit refreshes the file's
+    mtime, which is the recency used for eviction. Partial downloads
+    (``.part``/``.ytdl`` files) are never returned or evicted.
+    """
+    
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def is_partial(name: str) -> bool:
+        """Whether a file name belongs to a download that is still in progress."""
+        return name.endswith((".part", ".ytdl")) or ".part-Frag" in name
+    
+    def get(self, video_id: str) -> Optional[Path]:
+        """Get the cached audio for a video, marking it recently used."""
+        for path in self.directory.glob(f"{video_id}.*"):
+            if path.is_file() and not self.is_partial(path.name):
+                os.utime(path)
+                return path
+        return None
+    
+    def evict(self, keep: Iterable[Path] = ()) -> List[Path]:
+        """Delete least recently used files until the cache fits its quota.
+        
+        Files in ``keep`` (the file just downloaded and any audio still
+        waiting to be transcribed) and partial downloads are never evicted.
+        Returns the deleted paths.
+        """
+        keep = {Path(path) for path in keep}
+        with self._lock:
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+            
+            total = sum(size for _, size, _ in files)
+            evicted = []
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if path in keep or self.is_partial(path.name):
+                    continue
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted.append(path)
+            return evicted
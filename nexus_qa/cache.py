@@ -1,61 +1,198 @@
 """Caching system for Nexus CLI Assistant."""
 
-import hashlib
+import asyncio
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional, Tuple
+from nexus_qa.cache_keys import hash_query, is_question, minhash_signature, similarity
 from nexus_qa.models import CacheEntry, CacheConfig
 from nexus_qa.storage import Storage
 
 
+class CachedAnswer(NamedTuple):
+    """A cached response and whether it is past its TTL (served while being refreshed)."""
+    response: str
+    stale: bool = False
+
+
+def ttl_for(query: str, config: CacheConfig) -> int:
+    """TTL in seconds for a cache key, from ``command_ttl_seconds`` by its command prefix."""
+    command = query.split(":", 1)[0] if not is_question(query) else "ask"
+    return config.command_ttl_seconds.get(command, config.ttl_seconds)
+
+
+def stale_seconds(config: CacheConfig) -> int:
+    """How long expired entries are kept around to be served stale."""
+    return config.stale_max_seconds if config.stale_while_revalidate else 0
+
+
+def enforce_max_entries(storage: Storage, config: CacheConfig):
+    """Drop expired entries first, then evict the oldest ones past ``max_entries``."""
+    if storage.get_cache_count() > config.max_entries:
+        storage.cleanup_expired_cache(stale_seconds(config))
+        storage.trim_cache(config.max_entries)
+
+
+class MemoryCache:
+    """In-process LRU cache bounded by the total size of cached responses in bytes."""
+    
+    def __init__(self, max_bytes: int):
+        """Initialize memory cache with a byte budget."""
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get an unexpired response and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, expires_at, size = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.current_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return response
+    
+    def set(self, key: str, response: str, expires_at: float):
+        """Store a response, evicting least recently used entries to stay within budget."""
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (response, expires_at, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+    
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
 class Cache:
-    """Cache manager for query responses."""
+    """Cache manager for query responses.
+    
+    Lookups go to an in-process LRU tier first and fall back to the SQLite
+    cache table; writes go through to both tiers. Questions are keyed on their
+    normalized form (see :mod:`nexus_qa.cache_keys`). With ``similarity``
+    enabled, a question that misses both tiers is matched against the MinHash
+    signatures of cached questions and the closest one at or above
+    ``similarity_threshold`` is served.
+    
+    Entries expire after their command's TTL. With ``stale_while_revalidate``,
+    :meth:`lookup` keeps returning an expired entry (flagged stale) for up to
+    ``stale_max_seconds`` so the caller can answer immediately and refresh it.
+    """
     
     def __init__(self, storage: Storage, config: CacheConfig):
         """Initialize cache with storage and configuration."""
         self.storage = storage
         self.config = config
+        self.memory = MemoryCache(config.memory_max_bytes)
         self.hits = 0
         self.misses = 0
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.similarity_hits = 0
+        self.stale_serves = 0
     
     def _hash_query(self, query: str, provider: Optional[str] = None) -> str:
         """Generate hash for query."""
-        query_str = f"{provider}:{query}" if provider else query
-        return hashlib.sha256(query_str.encode()).hexdigest()
+        return hash_query(query, provider)
     
     def get(self, query: str, provider: Optional[str] = None) -> Optional[str]:
         """Get cached response for query."""
+        cached = self.lookup(query, provider, allow_stale=False)
+        return cached.response if cached else None
+    
+    def lookup(self, query: str, provider: Optional[str] = None,
+               allow_stale: bool = True) -> Optional[CachedAnswer]:
+        """Get a cached answer, including a stale one when ``allow_stale`` and
+        stale-while-revalidate is on.
+        """
         if not self.config.enabled:
             return None
         
         query_hash = self._hash_query(query, provider)
-        cache_entry = self.storage.get_cache(query_hash)
+        
+        response = self.memory.get(query_hash)
+        if response is not None:
+            self.memory_hits += 1
+            self.hits += 1
+            return CachedAnswer(response)
+        self.memory_misses += 1
+        
+        window = stale_seconds(self.config) if allow_stale else 0
+        cache_entry = self.storage.get_cache(query_hash, stale_seconds=window)
         
         if cache_entry:
             self.hits += 1
-            return cache_entry.response
-        else:
-            self.misses += 1
-            return None
+            if cache_entry.expires_at <= datetime.now():
+                self.stale_serves += 1
+                return CachedAnswer(cache_entry.response, stale=True)
+            self.disk_hits += 1
+            self.memory.set(query_hash, cache_entry.response, cache_entry.expires_at.timestamp())
+            return CachedAnswer(cache_entry.response)
+        self.disk_misses += 1
+        
+        if self.config.similarity and is_question(query):
+            match = self._find_similar(query, provider)
+            if match is not None:
+                response, expires_at = match
+                self.similarity_hits += 1
+                self.hits += 1
+                self.memory.set(query_hash, response, expires_at)
+                return CachedAnswer(response)
+        
+        self.misses += 1
+        return None
+    
+    def _find_similar(self, query: str, provider: Optional[str]) -> Optional[Tuple[str, float]]:
+        """Find the cached answer whose question is most similar to ``query``."""
+        signature = minhash_signature(query)
+        best_score, best = self.config.similarity_threshold, None
+        for candidate, response, expires_at in self.storage.get_cache_signatures(provider):
+            score = similarity(signature, candidate)
+            if score >= best_score:
+                best_score, best = score, (response, float(expires_at))
+        return best
     
     def set(self, query: str, response: str, provider: Optional[str] = None):
         """Cache a query response."""
         if not self.config.enabled:
             return
         
-        # Cleanup expired entries periodically
-        if self.storage.get_cache_count() > self.config.max_entries:
-            self.storage.cleanup_expired_cache()
-        
         query_hash = self._hash_query(query, provider)
-        expires_at = datetime.now() + timedelta(seconds=self.config.ttl_seconds)
+        expires_at = datetime.now() + timedelta(seconds=ttl_for(query, self.config))
         
-        self.storage.save_cache(query_hash, query, response, provider, expires_at)
+        self.memory.set(query_hash, response, expires_at.timestamp())
+        self.storage.save_cache(query_hash, query, response, provider, expires_at,
+                                minhash_signature(query))
+        enforce_max_entries(self.storage, self.config)
     
     def clear(self):
         """Clear all cache entries."""
+        self.memory.clear()
         # We'll implement this by deleting all entries
         # For now, we'll just cleanup expired ones
-        self.storage.cleanup_expired_cache()
+        self.storage.cleanup_expired_cache(stale_seconds(self.config))
     
     def get_stats(self) -> dict:
         """Get cache statistics."""
@@ -66,6 +203,79 @@ class Cache:
             "hits": self.hits,
             "misses": self.misses,
             "hit_rate": hit_rate,
+            "memory_hits": self.memory_hits,
+            "memory_misses": self.memory_misses,
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+            "similarity_hits": self.similarity_hits,
+            "stale_serves": self.stale_serves,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.current_bytes,
             "total_entries": self.storage.get_cache_count(),
         }
 
+
+
+class AsyncCache:
+    """Async cache manager over the same SQLite cache table, using aiosqlite.
+    
+    Entries are shared with :class:`Cache`, so answers cached by a synchronous
+    run are hits for async batches and vice versa.
+    """
+    
+    def __init__(self, storage: Storage, config: CacheConfig):
+        """Initialize async cache with storage and configuration."""
+        self.storage = storage
+        self.config = config
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+    
+    async def _get_connection(self):
+        """Get the shared aiosqlite connection, opening it on first use."""
+        if self._conn is None:
+            import aiosqlite
+            self._conn = await aiosqlite.connect(self.storage.db_path)
+        return self._conn
+    
+    async def get(self, query: str, provider: Optional[str] = None) -> Optional[str]:
+        """Get cached response for query."""
+        if not self.config.enabled:
+            return None
+        
+        conn = await self._get_connection()
+        async with conn.execute(
+            "SELECT response FROM cache WHERE query_hash = ? AND expires_at > ?",
+            (hash_query(query, provider), int(time.time()))
+        ) as cursor:
+            row = await cursor.fetchone()
+        
+        if row:
+            self.hits += 1
+            return row[0]
+        self.misses += 1
+        return None
+    
+    async def set(self, query: str, response: str, provider: Optional[str] = None):
+        """Cache a query response."""
+        if not self.config.enabled:
+            return
+        
+        expires_at = datetime.now() + timedelta(seconds=ttl_for(query, self.config))
+        conn = await self._get_connection()
+        await conn.execute(
+            """INSERT OR REPLACE INTO cache 
+               (query_hash, query_text, response, provider, expires_at, signature) 
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (hash_query(query, provider), query, response, provider, int(expires_at.timestamp()),
+             minhash_signature(query))
+        )
+        await conn.commit()
+        # Same eviction as Cache.set, off the event loop (the storage calls block)
+        await asyncio.to_thread(enforce_max_entries, self.storage, self.config)
+    
+    async def close(self):
+        """Close the underlying connection."""
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
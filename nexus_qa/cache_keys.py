@@ -0,0 +1,107 @@
+"""Canonical cache keys and MinHash signatures for cached questions.
+
+Natural-language questions are normalized before hashing (case, whitespace,
+punctuation at word edges and filler words), so "How to check Docker status?"
+and "how to check docker status" share one cache entry. Words that look like
+flags, paths or assignments (``-R``, ``~/Downloads``, ``LANG=C``, ``.bashrc``)
+keep their case, since ``ls -R`` and ``ls -r`` are different commands. Keys of command-style
+lookups (``debug:``, ``explain:``, ``check:``, ``script:``) carry shell commands
+or error text where case and punctuation matter, so only their whitespace is
+collapsed, and they never take part in similarity matching.
+"""
+
+import hashlib
+import re
+import struct
+from typing import Optional
+
+COMMAND_PREFIXES = ("debug:", "explain:", "check:", "script:")
+
+# Filler words dropped from questions; negations and prepositions that change
+# meaning ("not", "without", "from", "into") are deliberately kept
+STOPWORDS = frozenset("""
+    a an the to do does did i me my we you your can could would should please
+    is are was be of for on in with it this that there some any just how
+""".split())
+
+# Stripped from both ends of every word; "." only from the end so ".env" keeps its dot
+_EDGE_PUNCTUATION = "?!,;:'\"`()[]{}<>"
+_WHITESPACE = re.compile(r"\s+")
+
+SIGNATURE_SIZE = 64
+_SHINGLE = 3
+_PRIME = (1 << 61) - 1
+_MASK = 0xFFFFFFFF
+
+
+def _permutations(count: int):
+    """Fixed (a, b) pairs for the MinHash hash family ``(a * x + b) mod p``."""
+    pairs = []
+    for i in range(count):
+        digest = hashlib.blake2b(f"nexus-minhash-{i}".encode(), digest_size=16).digest()
+        a, b = struct.unpack("<QQ", digest)
+        pairs.append((a % (_PRIME - 1) + 1, b % _PRIME))
+    return pairs
+
+
+_PERMUTATIONS = _permutations(SIGNATURE_SIZE)
+
+
+def is_question(query: str) -> bool:
+    """Whether a cache key is a natural-language question rather than a command lookup."""
+    return not query.startswith(COMMAND_PREFIXES)
+
+
+def _is_shell_token(word: str) -> bool:
+    """Whether a word is a flag, path, assignment or file name whose case matters."""
+    return word.startswith("-") or any(c in word for c in "/=.")
+
+
+def normalize_question(question: str) -> str:
+    """Canonical form of a question: casefolded words without edge punctuation or
+    filler words; flags, paths and assignments keep their case.
+    """
+    words = []
+    for word in question.split():
+        word = word.strip(_EDGE_PUNCTUATION).rstrip(".")
+        if not _is_shell_token(word):
+            word = word.casefold()
+        if word and word not in STOPWORDS:
+            words.append(word)
+    # A question made only of filler words keeps them rather than becoming empty
+    return " ".join(words) or " ".join(question.lower().split())
+
+
+def canonical_query(query: str) -> str:
+    """Canonical form a cache key is hashed from."""
+    if is_question(query):
+        return normalize_question(query)
+    return _WHITESPACE.sub(" ", query.strip())
+
+
+def hash_query(query: str, provider: Optional[str] = None) -> str:
+    """Generate hash for query."""
+    query = canonical_query(query)
+    query_str = f"{provider}:{query}" if provider else query
+    return hashlib.sha256(query_str.encode()).hexdigest()
+
+
+def minhash_signature(query: str) -> Optional[bytes]:
+    """MinHash signature over character 3-grams of a normalized question.
+    
+    Returns ``None`` for command lookups, which are never matched by similarity.
+    """
+    if not is_question(query):
+        return None
+    text = f" {normalize_question(query)} "
+    shingles = {text[i:i + _SHINGLE] for i in range(max(1, len(text) - _SHINGLE + 1))}
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+              for s in shingles]
+    signature = [min((a * x + b) % _PRIME for x in hashes) & _MASK for a, b in _PERMUTATIONS]
+    return struct.pack(f"<{SIGNATURE_SIZE}I", *signature)
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures (share of equal slots)."""
+    return sum(a == b for a, b in zip(struct.unpack(f"<{SIGNATURE_SIZE}I", first),
+                                      struct.unpack(f"<{SIGNATURE_SIZE}I", second))) / SIGNATURE_SIZE
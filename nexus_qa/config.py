@@ -5,7 +5,9 @@ import re
 from pathlib import Path
 from typing import Optional
 import yaml
-from nexus_qa.models import Config, ProviderConfig, RateLimitingConfig, CacheConfig
+from nexus_qa.models import (
+    Config, ProviderConfig, RateLimitingConfig, CacheConfig, HttpConfig, TranscriptionConfig
+)
 
 
 def expand_env_vars(value: str) -> str:
@@ -44,6 +46,14 @@ def load_config(config_path: Optional[Path] = None) -> Config:
     cache_data = config_data.get("cache", {})
     cache = CacheConfig(**cache_data)
     
+    # Parse HTTP connection pooling config
+    http_data = config_data.get("http", {})
+    http = HttpConfig(**http_data)
+    
+    # Parse transcription config
+    transcription_data = config_data.get("transcription") or {}
+    transcription = TranscriptionConfig(**transcription_data)
+    
     # Parse providers
     providers = {}
     providers_data = config_data.get("providers", {})
@@ -59,6 +69,8 @@ def load_config(config_path: Optional[Path] = None) -> Config:
         output_mode=config_data.get("output_mode", "brief"),
         rate_limiting=rate_limiting,
         cache=cache,
+        http=http,
+        transcription=transcription,
         providers=providers,
     )
 
@@ -102,6 +114,10 @@ def _create_default_config(config_path: Path) -> Config:
             "ttl_seconds": 3600,
             "max_entries": 1000,
         },
+        "http": {
+            "pool_connections": 4,
+            "pool_maxsize": 10,
+        },
         "providers": {
             "ollama": {
                 "base_url": "http://localhost:11434",
@@ -0,0 +1,310 @@
+"""Background daemon that keeps Nexus warm behind a local Unix socket.
+
+The daemon imports everything once and keeps config, Storage, Cache,
+RateLimiter, pooled HTTP sessions and the in-memory cache alive between
+commands. ``nexus`` forwards supported commands to it over the socket and
+falls back to running in-process when no daemon is listening.
+
+Protocol: the daemon greets each connection it starts handling with
+``{"ready": true}``; the client then sends one JSON line ``{"argv": [...], ...}``
+and the daemon streams back JSON lines ``{"out": text}`` / ``{"err": text}``
+and finishes with ``{"exit": code}``. Commands are handled one at a time, so
+a client that is not greeted within ``READY_TIMEOUT`` (the daemon is busy,
+e.g. with a long transcription) runs its command in-process instead.
+
+The client side of this module only uses the standard library so forwarding
+stays cheap.
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Commands that are executed by the daemon when one is running
+FORWARDED_COMMANDS = {"ask", "debug", "explain", "check", "quick", "history", "transcribe"}
+
+# Seconds to wait for the daemon to pick up a forwarded command before running it in-process
+READY_TIMEOUT = 0.5
+
+
+def get_socket_path() -> Path:
+    """Get the path of the daemon's Unix socket."""
+    override = os.getenv("NEXUS_DAEMON_SOCKET")
+    if override:
+        return Path(override)
+    return Path.home() / ".config" / "nexus" / "daemon.sock"
+
+
+def _connect(timeout: Optional[float] = None) -> socket.socket:
+    """Connect to the daemon's socket."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(get_socket_path()))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _send(request: dict, timeout: Optional[float] = None) -> socket.socket:
+    """Connect to the daemon and send a single request line."""
+    sock = _connect(timeout)
+    try:
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _terminal_columns() -> int:
+    """Get the client's terminal width so the daemon renders to fit it."""
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return int(os.getenv("COLUMNS", "80"))
+
+
+def _is_forwarded(argv) -> bool:
+    """Check whether ``argv`` is a command the daemon runs."""
+    return isinstance(argv, list) and bool(argv) and argv[0] in FORWARDED_COMMANDS
+
+
+def forward(argv: List[str]) -> Optional[int]:
+    """Run a command in the daemon, streaming its output to this process.
+    
+    Returns the command's exit code, or ``None`` when the command should run
+    in-process instead (not forwardable, daemon disabled or not running).
+    """
+    if not _is_forwarded(argv) or os.getenv("NEXUS_NO_DAEMON"):
+        return None
+    if not get_socket_path().exists():
+        return None
+    
+    try:
+        sock = _connect(READY_TIMEOUT)
+    except OSError:
+        # Stale socket or daemon not accepting; run in-process
+        return None
+    
+    with sock, sock.makefile("rb") as reader:
+        try:
+            greeting = reader.readline()
+        except OSError:
+            greeting = None
+        if not greeting:
+            # Busy with another command; closing before sending anything
+            # means the daemon drops this connection when it gets to it
+            return None
+        sock.settimeout(None)
+        
+        request = {
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "columns": _terminal_columns(),
+            "stdout_isatty": sys.stdout.isatty(),
+            "stdin_isatty": sys.stdin.isatty(),
+            "stdin": None,
+        }
+        # Only `debug` reads stdin (piped error output); read it only once the
+        # daemon has taken the command so an in-process fallback still has it
+        if argv[0] == "debug" and not sys.stdin.isatty():
+            request["stdin"] = sys.stdin.read()
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        
+        for line in reader:
+            message = json.loads(line)
+            if "out" in message:
+                sys.stdout.write(message["out"])
+                sys.stdout.flush()
+            elif "err" in message:
+                sys.stderr.write(message["err"])
+                sys.stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+    
+    sys.stderr.write("Error: connection to nexus daemon lost\n")
+    return 1
+
+
+def control(command: str, timeout: float = 2.0) -> Optional[dict]:
+    """Send a control command (``ping`` or ``shutdown``) to the daemon.
+    
+    Returns the daemon's reply, ``{"busy": True}`` if it accepted the request
+    but did not answer within ``timeout`` (it is still running another
+    command and handles the request afterwards), or ``None`` if no daemon is
+    reachable.
+    """
+    try:
+        sock = _send({"control": command}, timeout=timeout)
+    except OSError:
+        return None
+    with sock, sock.makefile("rb") as reader:
+        try:
+            line = reader.readline()
+            if line and "ready" in json.loads(line):
+                line = reader.readline()
+        except OSError:
+            return {"busy": True}
+    return json.loads(line) if line else None
+
+
+class _ChannelWriter(io.TextIOBase):
+    """Text stream that forwards every write to the client as a JSON line."""
+    
+    encoding = "utf-8"
+    
+    def __init__(self, wfile, channel: str, isatty: bool):
+        self._wfile = wfile
+        self._channel = channel
+        self._isatty = isatty
+    
+    def write(self, text: str) -> int:
+        if isinstance(text, (bytes, bytearray)):
+            text = text.decode("utf-8", errors="replace")
+        if text:
+            self._wfile.write((json.dumps({self._channel: text}) + "\n").encode("utf-8"))
+            self._wfile.flush()
+        return len(text)
+    
+    def isatty(self) -> bool:
+        return self._isatty
+    
+    def writable(self) -> bool:
+        return True
+
+
+class _ClientStdin(io.StringIO):
+    """Stdin replacement carrying the client's piped input and tty status."""
+    
+    def __init__(self, data: str, isatty: bool):
+        super().__init__(data)
+        self._isatty = isatty
+    
+    def isatty(self) -> bool:
+        return self._isatty
+
+
+def serve(socket_path: Optional[Path] = None):
+    """Run the daemon in the foreground until it receives ``shutdown``.
+    
+    Requests are handled one at a time: commands write to process-wide
+    sys.stdout, which is redirected to the requesting client.
+    """
+    import contextlib
+    import socketserver
+    import threading
+    import traceback
+    import click
+    from nexus_qa import main
+    from nexus_qa.config import get_config_path
+    
+    socket_path = socket_path or get_socket_path()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        if control("ping") is not None:
+            raise RuntimeError(f"Nexus daemon already running on {socket_path}")
+        socket_path.unlink()
+    
+    state = {"started": time.time(), "requests": 0, "config_mtime": None}
+    
+    def warm_up():
+        """(Re)build the shared runtime when the config file changed."""
+        config_path = get_config_path()
+        mtime = config_path.stat().st_mtime if config_path.exists() else None
+        if state["config_mtime"] is None or mtime != state["config_mtime"]:
+            main.warm_up()
+            state["config_mtime"] = mtime
+    
+    def run_command(request: dict, wfile) -> int:
+        stdout = _ChannelWriter(wfile, "out", request.get("stdout_isatty", False))
+        stderr = _ChannelWriter(wfile, "err", request.get("stdout_isatty", False))
+        stdin = _ClientStdin(request.get("stdin") or "", request.get("stdin_isatty", True))
+        
+        previous_cwd = os.getcwd()
+        previous_columns = os.environ.get("COLUMNS")
+        previous_stdin = sys.stdin
+        os.environ["COLUMNS"] = str(request.get("columns", 80))
+        sys.stdin = stdin
+        try:
+            os.chdir(request.get("cwd") or previous_cwd)
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    warm_up()
+                    main.cli.main(args=request["argv"], prog_name="nexus", standalone_mode=False)
+                    return 0
+                except click.exceptions.Exit as e:
+                    return e.exit_code
+                except click.ClickException as e:
+                    e.show()
+                    return e.exit_code
+                except click.Abort:
+                    stderr.write("Aborted!\n")
+                    return 1
+                except SystemExit as e:
+                    return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                except Exception:
+                    stderr.write(traceback.format_exc())
+                    return 1
+        finally:
+            sys.stdin = previous_stdin
+            os.chdir(previous_cwd)
+            if previous_columns is None:
+                os.environ.pop("COLUMNS", None)
+            else:
+                os.environ["COLUMNS"] = previous_columns
+    
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                self.wfile.write(b'{"ready": true}\n')
+            except OSError:
+                # The client gave up waiting while another command ran
+                return
+            line = self.rfile.readline()
+            if not line:
+                return
+            request = json.loads(line)
+            
+            command = request.get("control")
+            if command == "ping":
+                reply = {"pid": os.getpid(), "uptime": time.time() - state["started"],
+                         "requests": state["requests"]}
+            elif command == "shutdown":
+                reply = {"stopping": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            elif not _is_forwarded(request.get("argv")):
+                # Only what `nexus` itself would forward; anything else is refused
+                self.wfile.write((json.dumps({"err": "Error: command not served by the daemon\n"}) + "\n").encode("utf-8"))
+                reply = {"exit": 2}
+            else:
+                state["requests"] += 1
+                reply = {"exit": run_command(request, self.wfile)}
+            
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+    
+    warm_up()
+    # Create the socket owner-only so no other user can connect before the chmod
+    previous_umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(str(socket_path), Handler)
+    finally:
+        os.umask(previous_umask)
+    os.chmod(socket_path, 0o600)
+    print(f"Nexus daemon listening on {socket_path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+
+
+if __name__ == "__main__":
+    serve()
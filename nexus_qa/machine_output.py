@@ -0,0 +1,118 @@
+"""Machine-readable output for scripts and pipes.
+
+Answers are emitted as JSON, newline-delimited JSON or plain text instead of
+rich panels. This module must not import rich (directly or through
+nexus_qa.formatter) so piped invocations skip that import entirely.
+"""
+
+import json
+import sys
+from typing import Dict, Iterable, Optional, TextIO
+
+from nexus_qa.response_parser import parse_response
+
+OUTPUT_FORMATS = ("rich", "json", "ndjson", "plain")
+MACHINE_FORMATS = ("json", "ndjson", "plain")
+
+
+def resolve_output(output: Optional[str], stream: Optional[TextIO] = None) -> str:
+    """Pick the output format: an explicit choice wins, otherwise rich on a
+    terminal and plain text when stdout is piped or redirected.
+    """
+    if output:
+        return output
+    stream = stream or sys.stdout
+    try:
+        return "rich" if stream.isatty() else "plain"
+    except (AttributeError, ValueError):
+        return "plain"
+
+
+class MachineFormatter:
+    """Drop-in for Formatter's answer/message methods that writes records
+    instead of rendering them.
+    
+    ``json`` writes one indented object (an array for batches), ``ndjson``
+    one compact object per line and ``plain`` the commands followed by the
+    explanation, with provider, cache status and latency on stderr.
+    """
+    
+    def __init__(self, output: str = "json", stream: Optional[TextIO] = None,
+                 err: Optional[TextIO] = None):
+        """Initialize formatter."""
+        if output not in MACHINE_FORMATS:
+            raise ValueError(f"Unknown machine output format: {output}")
+        self.output = output
+        self.stream = stream or sys.stdout
+        self.err = err or sys.stderr
+    
+    def record(self, response: str, from_cache: bool = False, **fields) -> Dict:
+        """Build the output record for an answer.
+        
+        ``fields`` (command, query, provider, latency_ms, ...) come first, in
+        the order given.
+        """
+        parsed = parse_response(response)
+        record = dict(fields)
+        record["cached"] = from_cache
+        record["commands"] = parsed.commands
+        record["explanation"] = parsed.explanation
+        return record
+    
+    def format_response(self, response: str, from_cache: bool = False, **fields):
+        """Write a single answer."""
+        self.emit(self.record(response, from_cache, **fields))
+    
+    def format_records(self, records: Iterable[Dict]):
+        """Write several records: a JSON array, or one record after another."""
+        if self.output == "json":
+            self._write(json.dumps(list(records), indent=2, ensure_ascii=False) + "\n")
+            return
+        for record in records:
+            self.emit(record)
+    
+    def emit(self, record: Dict):
+        """Write one record in the selected format."""
+        if self.output == "json":
+            self._write(json.dumps(record, indent=2, ensure_ascii=False) + "\n")
+        elif self.output == "ndjson":
+            self._write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            self._write_plain(record)
+    
+    def _write_plain(self, record: Dict):
+        """Commands one per line, a blank line, then the explanation."""
+        details = [f"{key}={value}" for key, value in record.items()
+                   if key not in ("commands", "explanation", "error") and not isinstance(value, dict)]
+        if details:
+            self.err.write("# " + " ".join(details) + "\n")
+            self.err.flush()
+        if "error" in record:
+            self.err.write(f"Error: {record['error']}\n")
+            self.err.flush()
+            return
+        
+        parts = []
+        if record["commands"]:
+            parts.append("\n".join(record["commands"]))
+        if record["explanation"]:
+            parts.append(record["explanation"])
+        self._write("\n\n".join(parts) + "\n")
+    
+    def _write(self, text: str):
+        self.stream.write(text)
+        self.stream.flush()
+    
+    def format_error(self, error: str):
+        """Write an error record (plain text goes to stderr)."""
+        self.emit({"error": error})
+    
+    def format_success(self, message: str):
+        """Status messages go to stderr so stdout stays parseable."""
+        self.err.write(f"{message}\n")
+        self.err.flush()
+    
+    def format_info(self, message: str):
+        """Status messages go to stderr so stdout stays parseable."""
+        self.err.write(f"{message}\n")
+        self.err.flush()
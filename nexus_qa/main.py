@@ -2,13 +2,6 @@
 
 import click
 import sys
-from nexus_qa.config import load_config, get_config_path
-from nexus_qa.storage import Storage
-from nexus_qa.cache import Cache
-from nexus_qa.rate_limiter import RateLimiter
-from nexus_qa.ai_client import create_client
-from nexus_qa.formatter import Formatter
-from nexus_qa.workflows.engine import WorkflowEngine
 
 
 @click.group()
@@ -18,53 +11,197 @@ def cli():
     pass
 
 
+# Keep in sync with nexus_qa.machine_output.OUTPUT_FORMATS (not imported here to keep startup light)
+OUTPUT_FORMATS = ("rich", "json", "ndjson", "plain")
+
+# Shared runtime reused across commands when running inside the daemon
+_warm_runtime = None
+
+
+def _get_runtime():
+    """Get config, storage, cache and rate limiter for a command."""
+    if _warm_runtime is not None:
+        return _warm_runtime
+    from nexus_qa.config import load_config
+    from nexus_qa.storage import Storage
+    from nexus_qa.cache import Cache
+    from nexus_qa.rate_limiter import RateLimiter
+    
+    config = load_config()
+    storage = Storage()
+    return config, storage, Cache(storage, config.cache), RateLimiter(config.rate_limiting, storage)
+
+
+def _get_storage():
+    """Get storage for a command, reusing the daemon's connection when warm."""
+    if _warm_runtime is not None:
+        return _warm_runtime[1]
+    from nexus_qa.storage import Storage
+    return Storage()
+
+
+def warm_up():
+    """Build the runtime once and reuse it for every later command (daemon mode)."""
+    global _warm_runtime
+    _warm_runtime = None
+    _warm_runtime = _get_runtime()
+
+
+def _output_option(*names):
+    """``--output`` choice shared by the answer commands (default: auto)."""
+    return click.option(*(names or ("--output",)), "output", type=click.Choice(OUTPUT_FORMATS),
+                        help="Output format (default: rich on a terminal, plain when piped)")
+
+
+def _formatter(output: str = None, verbose: bool = False):
+    """Get the formatter for an answer command.
+    
+    Machine formats never import rich, so piped runs skip that cost entirely.
+    """
+    from nexus_qa.machine_output import MachineFormatter, resolve_output
+    
+    output = resolve_output(output)
+    if output == "rich":
+        from nexus_qa.formatter import Formatter
+        return Formatter(verbose=verbose)
+    return MachineFormatter(output)
+
+
+def _ask_pipeline(output: str = None, verbose: bool = False):
+    """Build the request pipeline for the configured provider (None if it is not configured)."""
+    from nexus_qa.ai_client import create_client
+    from nexus_qa.pipeline import AskPipeline
+    
+    config, storage, cache, rate_limiter = _get_runtime()
+    
+    provider_name = config.ai_provider
+    if provider_name not in config.providers:
+        click.echo(f"Error: Provider '{provider_name}' not configured.", err=True)
+        return None
+    
+    client = create_client(provider_name, config.providers[provider_name], rate_limiter, cache, config.http)
+    # Stale answers are only revalidated in the background by the long-lived daemon
+    return AskPipeline(client, cache, storage, provider_name, _formatter(output, verbose),
+                       background_refresh=_warm_runtime is not None)
+
+
+def run():
+    """Console entry point: forward to a running daemon, else run in-process."""
+    from nexus_qa.daemon import forward
+    
+    exit_code = forward(sys.argv[1:])
+    if exit_code is None:
+        cli()
+    else:
+        sys.exit(exit_code)
+
+
 @cli.command()
-@click.argument("question", nargs=-1, required=True)
+@click.argument("question", nargs=-1, required=False)
 @click.option("--verbose", "-v", is_flag=True, help="Show verbose output")
-def ask(question: tuple, verbose: bool):
+@click.option("--stream", "-s", is_flag=True, help="Render the answer live as it is generated")
+@click.option("--batch", "-b", "batch_file", type=click.Path(exists=True, dir_okay=False),
+              help="Ask every question in a file (one per line) concurrently")
+@click.option("--concurrency", "-c", default=4, show_default=True,
+              help="Maximum number of questions in flight with --batch")
+@_output_option()
+def ask(question: tuple, verbose: bool, stream: bool, batch_file: str, concurrency: int, output: str):
     """Ask a question and get an AI-powered answer.
     
     You can provide the question with or without quotes.
     Example: nexus ask how to check docker status
     Example: nexus ask "how to check docker status"
+    Example: nexus ask --stream how to prune docker images
+    Example: nexus ask --batch questions.txt --concurrency 8
     """
+    if batch_file:
+        _ask_batch(batch_file, verbose, concurrency, output)
+        return
+    
+    if not question:
+        raise click.UsageError("Question is required. Usage: nexus ask <question>")
+    
     # Join multiple arguments into a single question string
     question_str = " ".join(question)
     try:
-        config = load_config()
-        storage = Storage()
-        cache = Cache(storage, config.cache)
-        rate_limiter = RateLimiter(config.rate_limiting)
+        pipeline = _ask_pipeline(output, verbose)
+        if pipeline is not None:
+            pipeline.run("ask", question_str, stream=stream)
+        
+    except Exception as e:
+        formatter = _formatter(output)
+        formatter.format_error(str(e))
+
+
+def _ask_batch(batch_file: str, verbose: bool, concurrency: int, output: str = None):
+    """Ask every question in a file concurrently and print answers in input order."""
+    import asyncio
+    from nexus_qa.async_client import create_async_client, ask_batch
+    from nexus_qa.cache import AsyncCache
+    from nexus_qa.rate_limiter import AsyncRateLimiter
+    from nexus_qa.machine_output import MachineFormatter
+    
+    formatter = _formatter(output, verbose)
+    try:
+        with open(batch_file, 'r', encoding='utf-8') as f:
+            questions = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        
+        if not questions:
+            formatter.format_error(f"No questions found in {batch_file}")
+            return
+        
+        config, storage, _, sync_limiter = _get_runtime()
         
-        # Get provider config
         provider_name = config.ai_provider
         if provider_name not in config.providers:
             click.echo(f"Error: Provider '{provider_name}' not configured.", err=True)
             return
         
-        provider_config = config.providers[provider_name]
-        client = create_client(provider_name, provider_config, rate_limiter, cache)
-        
-        formatter = Formatter(verbose=verbose)
-        
-        # Check cache first
-        cached_response = cache.get(question_str, provider_name)
-        from_cache = cached_response is not None
-        
-        if cached_response:
-            response = cached_response
-        else:
-            # Ask AI
-            response = client.ask(question_str, verbose=verbose)
-            
-            # Save to history
-            storage.save_history(question_str, response, provider_name)
+        cache = AsyncCache(storage, config.cache)
+        rate_limiter = AsyncRateLimiter(sync_limiter)
+        client = create_async_client(provider_name, config.providers[provider_name],
+                                     rate_limiter, cache, config.http)
         
-        # Format and display
-        formatter.format_response(response, from_cache=from_cache)
+        async def run():
+            try:
+                return await ask_batch(client, questions, concurrency, verbose)
+            finally:
+                await cache.close()
+        
+        results = asyncio.run(run())
+        
+        if isinstance(formatter, MachineFormatter):
+            records = []
+            for result in results:
+                fields = {"command": "ask", "query": result['question'], "provider": provider_name,
+                          "latency_ms": round(result['latency'] * 1000, 1)}
+                if result['error']:
+                    records.append({**fields, "error": result['error']})
+                    continue
+                if not result['from_cache']:
+                    storage.save_history(result['question'], result['answer'], provider_name)
+                records.append(formatter.record(result['answer'], result['from_cache'], **fields))
+            formatter.format_records(records)
+            return
         
+        for i, result in enumerate(results, 1):
+            status = "cached" if result['from_cache'] else "fresh"
+            formatter.format_info(
+                f"[{i}/{len(results)}] {result['question']} ({result['latency']:.2f}s, {status})"
+            )
+            if result['error']:
+                formatter.format_error(result['error'])
+                continue
+            if not result['from_cache']:
+                storage.save_history(result['question'], result['answer'], provider_name)
+            formatter.format_response(result['answer'])
+        
+        failed = sum(1 for result in results if result['error'])
+        cached = sum(1 for result in results if result['from_cache'])
+        formatter.format_info(
+            f"\n{len(results)} questions: {cached} cached, {client.coalesced} coalesced, {failed} failed"
+        )
     except Exception as e:
-        formatter = Formatter()
         formatter.format_error(str(e))
 
 
@@ -74,6 +211,9 @@ def ask(question: tuple, verbose: bool):
 @click.option("--all", "-a", "show_all", is_flag=True, help="Show all commands")
 def list(category: str, category_flag: str, show_all: bool):
     """List saved commands, optionally filtered by category."""
+    from nexus_qa.storage import Storage
+    from nexus_qa.formatter import Formatter
+    
     storage = Storage()
     formatter = Formatter()
     
@@ -100,6 +240,9 @@ def save(category: str, command: str, category_flag: str, description: str):
         nexus save <category> <command>
         nexus save --category <category> <command>
     """
+    from nexus_qa.storage import Storage
+    from nexus_qa.formatter import Formatter
+    
     storage = Storage()
     formatter = Formatter()
     
@@ -124,13 +267,22 @@ def save(category: str, command: str, category_flag: str, description: str):
 
 
 @cli.command()
-@click.argument("keyword", required=True)
-def quick(keyword: str):
-    """Quick access to saved commands by keyword (no AI processing)."""
-    storage = Storage()
+@click.argument("keyword", nargs=-1, required=True)
+@click.option("--limit", "-l", default=50, show_default=True, help="Maximum number of results")
+def quick(keyword: tuple, limit: int):
+    """Quick access to saved commands by keyword (no AI processing).
+    
+    Every word must prefix-match the command, category or description; the
+    best matches are listed first.
+    Example: nexus quick dock prune
+    """
+    from nexus_qa.formatter import Formatter
+    
+    keyword = " ".join(keyword)
+    storage = _get_storage()
     formatter = Formatter()
     
-    commands = storage.search_commands(keyword)
+    commands = storage.search_commands(keyword, limit=limit)
     
     if not commands:
         formatter.format_info(f"No commands found matching '{keyword}'")
@@ -143,7 +295,9 @@ def quick(keyword: str):
 @click.option("--limit", "-l", default=20, help="Number of entries to show")
 def history(limit: int):
     """View command history."""
-    storage = Storage()
+    from nexus_qa.formatter import Formatter
+    
+    storage = _get_storage()
     formatter = Formatter()
     
     history_entries = storage.get_history(limit=limit)
@@ -154,6 +308,9 @@ def history(limit: int):
 @click.argument("command_id", type=int, required=True)
 def delete(command_id: int):
     """Delete a saved command by ID."""
+    from nexus_qa.storage import Storage
+    from nexus_qa.formatter import Formatter
+    
     storage = Storage()
     formatter = Formatter()
     
@@ -174,6 +331,9 @@ def config(provider: str, set_provider: str):
     Show config: nexus config
     Set provider: nexus config --set-provider ollama
     """
+    from nexus_qa.config import load_config, get_config_path
+    from nexus_qa.formatter import Formatter
+    
     formatter = Formatter()
     config_path = get_config_path()
     
@@ -210,7 +370,8 @@ def config(provider: str, set_provider: str):
 @cli.command()
 @click.argument("error_message", nargs=-1, required=False)
 @click.option("--verbose", "-v", is_flag=True, help="Show verbose output")
-def debug(error_message: tuple, verbose: bool):
+@_output_option()
+def debug(error_message: tuple, verbose: bool, output: str):
     """Debug an error message and get a solution.
     
     You can provide the error message as an argument or pipe it from stdin.
@@ -226,63 +387,21 @@ def debug(error_message: tuple, verbose: bool):
             if not sys.stdin.isatty():
                 error_str = sys.stdin.read().strip()
             else:
-                formatter = Formatter()
+                formatter = _formatter(output)
                 formatter.format_error("No error message provided. Provide as argument or pipe from stdin.")
                 return
         
         if not error_str:
-            formatter = Formatter()
+            formatter = _formatter(output)
             formatter.format_error("Error message is empty.")
             return
         
-        # Create prompt for error debugging
-        debug_prompt = f"""I encountered the following error. Please analyze it and provide:
-1. What the error means
-2. Why it occurred
-3. Step-by-step solution to fix it
-4. How to prevent it in the future
-
-Error message:
-{error_str}
-
-Provide a clear, actionable solution with commands if applicable."""
-        
-        config = load_config()
-        storage = Storage()
-        cache = Cache(storage, config.cache)
-        rate_limiter = RateLimiter(config.rate_limiting)
-        
-        # Get provider config
-        provider_name = config.ai_provider
-        if provider_name not in config.providers:
-            click.echo(f"Error: Provider '{provider_name}' not configured.", err=True)
-            return
-        
-        provider_config = config.providers[provider_name]
-        client = create_client(provider_name, provider_config, rate_limiter, cache)
-        
-        formatter = Formatter(verbose=verbose)
-        
-        # Check cache first (use error message as key)
-        cache_key = f"debug:{error_str}"
-        cached_response = cache.get(cache_key, provider_name)
-        from_cache = cached_response is not None
-        
-        if cached_response:
-            response = cached_response
-        else:
-            # Ask AI
-            response = client.ask(debug_prompt, verbose=verbose)
-            
-            # Save to cache and history
-            cache.set(cache_key, response, provider_name)
-            storage.save_history(f"debug: {error_str[:100]}", response, provider_name)
-        
-        # Format and display
-        formatter.format_response(response, from_cache=from_cache)
+        pipeline = _ask_pipeline(output, verbose)
+        if pipeline is not None:
+            pipeline.run("debug", error_str)
         
     except Exception as e:
-        formatter = Formatter()
+        formatter = _formatter(output)
         formatter.format_error(str(e))
 
 
@@ -291,7 +410,8 @@ Provide a clear, actionable solution with commands if applicable."""
 @click.option("--file", "-f", "file_path", help="Explain commands from a file")
 @click.option("--learn", "-l", is_flag=True, help="Explain like I'm a beginner")
 @click.option("--verbose", "-v", is_flag=True, help="Show verbose output")
-def explain(command: tuple, file_path: str, learn: bool, verbose: bool):
+@_output_option()
+def explain(command: tuple, file_path: str, learn: bool, verbose: bool, output: str):
     """Explain what a command does in detail.
     
     Example: nexus explain "docker run -d -p 8080:80 -v /data:/app/data --name myapp nginx:latest"
@@ -305,85 +425,39 @@ def explain(command: tuple, file_path: str, learn: bool, verbose: bool):
                 with open(file_path, 'r') as f:
                     command_str = f.read()
             except FileNotFoundError:
-                formatter = Formatter()
+                formatter = _formatter(output)
                 formatter.format_error(f"File not found: {file_path}")
                 return
             except Exception as e:
-                formatter = Formatter()
+                formatter = _formatter(output)
                 formatter.format_error(f"Error reading file: {str(e)}")
                 return
         else:
             if not command:
-                formatter = Formatter()
+                formatter = _formatter(output)
                 formatter.format_error("Command is required. Provide as argument or use --file option.")
                 return
             command_str = " ".join(command)
         
         if not command_str.strip():
-            formatter = Formatter()
+            formatter = _formatter(output)
             formatter.format_error("Command is empty.")
             return
         
-        # Create prompt for command explanation
-        learn_mode = "Explain this like I'm a beginner. " if learn else ""
-        explain_prompt = f"""{learn_mode}Please explain the following command(s) in detail:
-
-{command_str}
-
-Provide:
-1. What the command does overall
-2. Breakdown of each flag/argument and what it does
-3. Common use cases
-4. Alternative approaches (if applicable)
-5. Potential side effects or things to be aware of
-
-Format the explanation clearly with sections for each part."""
-        
-        config = load_config()
-        storage = Storage()
-        cache = Cache(storage, config.cache)
-        rate_limiter = RateLimiter(config.rate_limiting)
-        
-        # Get provider config
-        provider_name = config.ai_provider
-        if provider_name not in config.providers:
-            click.echo(f"Error: Provider '{provider_name}' not configured.", err=True)
-            return
-        
-        provider_config = config.providers[provider_name]
-        client = create_client(provider_name, provider_config, rate_limiter, cache)
-        
-        formatter = Formatter(verbose=verbose)
-        
-        # Check cache first
-        cache_key = f"explain:{command_str}"
-        if learn:
-            cache_key = f"explain:learn:{command_str}"
-        cached_response = cache.get(cache_key, provider_name)
-        from_cache = cached_response is not None
-        
-        if cached_response:
-            response = cached_response
-        else:
-            # Ask AI
-            response = client.ask(explain_prompt, verbose=verbose)
-            
-            # Save to cache and history
-            cache.set(cache_key, response, provider_name)
-            storage.save_history(f"explain: {command_str[:100]}", response, provider_name)
-        
-        # Format and display
-        formatter.format_response(response, from_cache=from_cache)
+        pipeline = _ask_pipeline(output, verbose)
+        if pipeline is not None:
+            pipeline.run("explain", command_str, learn=learn)
         
     except Exception as e:
-        formatter = Formatter()
+        formatter = _formatter(output)
         formatter.format_error(str(e))
 
 
 @cli.command()
 @click.argument("command", nargs=-1, required=True)
 @click.option("--interactive", "-i", is_flag=True, help="Show interactive warning before execution")
-def check(command: tuple, interactive: bool):
+@_output_option()
+def check(command: tuple, interactive: bool, output: str):
     """Check if a command is safe to run.
     
     Analyzes the command for dangerous operations and provides safety warnings.
@@ -394,64 +468,21 @@ def check(command: tuple, interactive: bool):
         command_str = " ".join(command)
         
         if not command_str.strip():
-            formatter = Formatter()
+            formatter = _formatter(output)
             formatter.format_error("Command is empty.")
             return
         
-        # Create prompt for safety check
-        safety_prompt = f"""Analyze the following command for safety and security:
-
-{command_str}
-
-Provide:
-1. Safety assessment (Safe / Caution / Dangerous)
-2. What the command does
-3. Potential risks and why they're dangerous
-4. Safer alternatives (if applicable)
-5. Best practices for this type of operation
-
-Be specific about destructive operations, security risks, and data loss potential."""
-        
-        config = load_config()
-        storage = Storage()
-        cache = Cache(storage, config.cache)
-        rate_limiter = RateLimiter(config.rate_limiting)
-        
-        # Get provider config
-        provider_name = config.ai_provider
-        if provider_name not in config.providers:
-            click.echo(f"Error: Provider '{provider_name}' not configured.", err=True)
+        pipeline = _ask_pipeline(output, verbose=True)  # Always verbose for safety checks
+        if pipeline is None:
             return
-        
-        provider_config = config.providers[provider_name]
-        client = create_client(provider_name, provider_config, rate_limiter, cache)
-        
-        formatter = Formatter(verbose=True)  # Always verbose for safety checks
-        
-        # Check cache first
-        cache_key = f"check:{command_str}"
-        cached_response = cache.get(cache_key, provider_name)
-        from_cache = cached_response is not None
-        
-        if cached_response:
-            response = cached_response
-        else:
-            # Ask AI
-            response = client.ask(safety_prompt, verbose=True)
-            
-            # Save to cache and history
-            cache.set(cache_key, response, provider_name)
-            storage.save_history(f"check: {command_str[:100]}", response, provider_name)
-        
-        # Format and display
-        formatter.format_response(response, from_cache=from_cache)
+        pipeline.run("check", command_str)
         
         # If interactive mode, show additional warning
         if interactive:
-            formatter.format_info("\n⚠️  Review the analysis above before executing this command.")
+            pipeline.formatter.format_info("\n⚠️  Review the analysis above before executing this command.")
         
     except Exception as e:
-        formatter = Formatter()
+        formatter = _formatter(output)
         formatter.format_error(str(e))
 
 
@@ -460,7 +491,8 @@ Be specific about destructive operations, security risks, and data loss potentia
 @click.option("--language", "-l", default="bash", help="Script language (bash, python, etc.)")
 @click.option("--output", "-o", "output_file", help="Save script to file")
 @click.option("--verbose", "-v", is_flag=True, help="Show verbose output")
-def script(description: tuple, language: str, output_file: str, verbose: bool):
+@_output_option("--format")
+def script(description: tuple, language: str, output_file: str, verbose: bool, output: str):
     """Generate a complete, production-ready script.
     
     Example: nexus script "backup MySQL database with compression and email notification"
@@ -470,59 +502,15 @@ def script(description: tuple, language: str, output_file: str, verbose: bool):
         description_str = " ".join(description)
         
         if not description_str.strip():
-            formatter = Formatter()
+            formatter = _formatter(output)
             formatter.format_error("Description is empty.")
             return
         
-        # Create prompt for script generation
-        script_prompt = f"""Generate a complete, production-ready {language} script based on this description:
-
-{description_str}
-
-The script must include:
-1. Proper error handling (try/catch, exit codes, etc.)
-2. Logging functionality
-3. Input validation
-4. Configuration options (use environment variables or config file)
-5. Usage documentation/comments
-6. Best practices for the language
-7. Proper shebang line if applicable
-
-Provide the complete script with all necessary components. Include comments explaining key parts."""
-        
-        config = load_config()
-        storage = Storage()
-        cache = Cache(storage, config.cache)
-        rate_limiter = RateLimiter(config.rate_limiting)
-        
-        # Get provider config
-        provider_name = config.ai_provider
-        if provider_name not in config.providers:
-            click.echo(f"Error: Provider '{provider_name}' not configured.", err=True)
+        pipeline = _ask_pipeline(output, verbose)
+        if pipeline is None:
             return
-        
-        provider_config = config.providers[provider_name]
-        client = create_client(provider_name, provider_config, rate_limiter, cache)
-        
-        formatter = Formatter(verbose=verbose)
-        
-        # Check cache first
-        cache_key = f"script:{language}:{description_str}"
-        cached_response = cache.get(cache_key, provider_name)
-        from_cache = cached_response is not None
-        
-        if cached_response:
-            response = cached_response
-        else:
-            # Ask AI
-            response = client.ask(script_prompt, verbose=verbose)
-            
-            # Save to cache and history
-            cache.set(cache_key, response, provider_name)
-            storage.save_history(f"script: {description_str[:100]}", response, provider_name)
-        
-        # Format and display
-        formatter.format_response(response, from_cache=from_cache)
+        formatter = pipeline.formatter
+        response = pipeline.run("script", description_str, language=language).response
         
         # Save to file if requested
         if output_file:
@@ -542,7 +530,7 @@ Provide the complete script with all necessary components. Include comments expl
                 formatter.format_error(f"Error saving script to file: {str(e)}")
         
     except Exception as e:
-        formatter = Formatter()
+        formatter = _formatter(output)
         formatter.format_error(str(e))
 
 
@@ -556,6 +544,9 @@ def workflow():
 @click.option("--all", "-a", is_flag=True, help="Show all workflows including templates")
 def workflow_list(all: bool):
     """List available workflows."""
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.workflows.engine import WorkflowEngine
+    
     try:
         engine = WorkflowEngine()
         workflows = engine.list_workflows()
@@ -600,8 +591,14 @@ def workflow_list(all: bool):
 @click.argument("name", required=True)
 @click.option("--verbose", "-v", is_flag=True, help="Show verbose output")
 @click.option("--var", "variables", multiple=True, help="Set workflow variables (format: KEY=VALUE)")
-def workflow_run(name: str, verbose: bool, variables: tuple):
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="Maximum steps to run at once for parallel workflows")
+@click.option("--stream", "-s", is_flag=True, help="Print step output live as it is produced")
+def workflow_run(name: str, verbose: bool, variables: tuple, jobs: int, stream: bool):
     """Run a workflow by name."""
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.workflows.engine import WorkflowEngine
+    
     try:
         engine = WorkflowEngine()
         workflow = engine.load_workflow(name)
@@ -620,20 +617,21 @@ def workflow_run(name: str, verbose: bool, variables: tuple):
                 var_dict[key.strip()] = value.strip()
         
         # Execute workflow
-        execution = engine.execute_workflow(workflow, variables=var_dict, verbose=verbose)
+        execution = engine.execute_workflow(workflow, variables=var_dict, verbose=verbose,
+                                           max_workers=jobs, stream=stream)
         
         formatter = Formatter(verbose=verbose)
         
-        # Display results
+        # Display results (already printed line by line when streaming)
         if execution.status == 'completed':
             formatter.format_success(f"\n✓ Workflow '{name}' completed successfully")
-            if execution.output:
+            if execution.output and not stream:
                 print("\n" + execution.output)
         elif execution.status == 'failed':
             formatter.format_error(f"\n✗ Workflow '{name}' failed")
             if execution.error:
                 formatter.format_error(f"Error: {execution.error}")
-            if execution.output:
+            if execution.output and not stream:
                 print("\n" + execution.output)
         
         # Show summary
@@ -650,6 +648,9 @@ def workflow_run(name: str, verbose: bool, variables: tuple):
 @click.option("--from-template", "-t", "template_name", help="Create from template")
 def workflow_create(name: str, template_name: str):
     """Create a new workflow."""
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.workflows.engine import WorkflowEngine
+    
     try:
         engine = WorkflowEngine()
         formatter = Formatter()
@@ -680,7 +681,9 @@ def workflow_create(name: str, template_name: str):
                 'steps': [step.dict() for step in template.steps],
                 'output_format': template.output_format,
                 'estimated_duration': template.estimated_duration,
-                'variables': template.variables
+                'variables': template.variables,
+                'parallel': template.parallel,
+                'max_workers': template.max_workers
             }
             
             with open(user_path, 'w', encoding='utf-8') as f:
@@ -718,6 +721,9 @@ def workflow_create(name: str, template_name: str):
 @click.argument("name", required=True)
 def workflow_show(name: str):
     """Show workflow details."""
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.workflows.engine import WorkflowEngine
+    
     try:
         engine = WorkflowEngine()
         workflow = engine.load_workflow(name)
@@ -735,13 +741,16 @@ def workflow_show(name: str):
             formatter.format_info(f"Tags: {', '.join(workflow.tags)}")
         if workflow.estimated_duration:
             formatter.format_info(f"Estimated Duration: {workflow.estimated_duration}")
-        formatter.format_info(f"\nSteps ({len(workflow.steps)}):")
+        mode = " (parallel)" if workflow.parallel else ""
+        formatter.format_info(f"\nSteps ({len(workflow.steps)}){mode}:")
         
         for i, step in enumerate(workflow.steps, 1):
             formatter.format_info(f"  {i}. {step.name}")
             if step.description:
                 formatter.format_info(f"     {step.description}")
             formatter.format_info(f"     Command: {step.command}")
+            if step.depends_on:
+                formatter.format_info(f"     Depends on: {', '.join(step.depends_on)}")
         
     except Exception as e:
         formatter = Formatter()
@@ -754,6 +763,33 @@ def transcribe():
     pass
 
 
+def _transcription_dir():
+    """Get the transcription output directory from config, or ./transcriptions."""
+    from pathlib import Path
+    from nexus_qa.config import load_config
+    
+    try:
+        output_dir = load_config().transcription.output_dir
+        if output_dir:
+            return Path(output_dir).expanduser()
+    except Exception:
+        pass
+    return Path.cwd() / "transcriptions"
+
+
+def _audio_cache():
+    """Get the LRU cache for downloaded audio from config, or None if it is disabled."""
+    from pathlib import Path
+    from nexus_qa.audio import AudioCache
+    from nexus_qa.config import load_config
+    
+    settings = load_config().transcription
+    if settings.audio_cache_max_bytes <= 0:
+        return None
+    directory = settings.audio_cache_dir or Path.home() / ".cache" / "nexus" / "audio"
+    return AudioCache(Path(directory), settings.audio_cache_max_bytes)
+
+
 @transcribe.command("url")
 @click.argument("url")
 @click.option("--model-size", "-m", 
@@ -763,13 +799,23 @@ def transcribe():
 @click.option("--output-dir", "-o",
               type=click.Path(),
               help="Custom output directory for transcriptions")
-def transcribe_url(url: str, model_size: str, output_dir: str):
+@click.option("--device", "-d", help="Torch device for Whisper, e.g. cpu or cuda (default: auto)")
+@click.option("--workers", "-w", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Split long audio at silences and transcribe chunks in parallel (CPU)")
+@click.option("--force", "-f", is_flag=True, help="Transcribe again even if a transcript already exists")
+def transcribe_url(url: str, model_size: str, output_dir: str, device: str, workers: int, force: bool):
     """Transcribe a YouTube video to text.
     
     Examples:
         nexus transcribe url "https://www.youtube.com/watch?v=VIDEO_ID"
         nexus transcribe url VIDEO_URL --model-size small
         nexus transcribe url VIDEO_URL -o ~/my-transcriptions
+        nexus transcribe url VIDEO_URL --device cpu --workers 4
+        nexus transcribe url VIDEO_URL --force
+    
+    A video already transcribed with the same model size and Whisper version
+    returns the existing transcript; downloaded audio is kept in an LRU cache
+    (transcription.audio_cache_max_bytes) for re-transcription.
     
     Model sizes (larger = more accurate but slower):
         - tiny: Fastest, least accurate (~1GB RAM)
@@ -778,36 +824,34 @@ def transcribe_url(url: str, model_size: str, output_dir: str):
         - medium: High accuracy (~5GB RAM)
         - large: Best accuracy (~10GB RAM)
     """
+    from nexus_qa.formatter import Formatter
+    
     try:
         from nexus_qa.transcriber import YouTubeTranscriber, TranscriptionError
         from pathlib import Path
         
         # Determine output directory
-        if output_dir:
-            out_path = Path(output_dir)
-        else:
-            # Use config or default
-            try:
-                config = load_config()
-                if hasattr(config, 'transcription') and config.transcription.get('output_dir'):
-                    out_path = Path(config.transcription['output_dir'])
-                else:
-                    out_path = Path.cwd() / "transcriptions"
-            except:
-                out_path = Path.cwd() / "transcriptions"
+        out_path = Path(output_dir) if output_dir else _transcription_dir()
         
         # Create transcriber
-        transcriber = YouTubeTranscriber(output_dir=out_path)
+        transcriber = YouTubeTranscriber(output_dir=out_path, audio_cache=_audio_cache())
         
         # Transcribe
-        output_file, metadata = transcriber.transcribe(url, model_size=model_size)
+        output_file, metadata = transcriber.transcribe(url, model_size=model_size, device=device,
+                                                       workers=workers, force=force)
         
         # Success message
         formatter = Formatter()
-        formatter.format_success("Transcription complete!")
+        if metadata.get('cached'):
+            formatter.format_success("Existing transcription found (use --force to transcribe again)")
+        else:
+            formatter.format_success("Transcription complete!")
         formatter.format_info(f"File: {output_file}")
         formatter.format_info(f"Title: {metadata.get('title', 'N/A')}")
         formatter.format_info(f"Duration: {metadata.get('duration', 'N/A')} seconds")
+        timings = metadata.get('timings', {})
+        if timings:
+            formatter.format_info(f"Model load: {timings['model_load']:.2f}s, inference: {timings['inference']:.2f}s")
         
     except TranscriptionError as e:
         formatter = Formatter()
@@ -819,6 +863,127 @@ def transcribe_url(url: str, model_size: str, output_dir: str):
         sys.exit(1)
 
 
+@transcribe.command("batch")
+@click.argument("batch_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--model-size", "-m",
+              type=click.Choice(['tiny', 'base', 'small', 'medium', 'large']),
+              default='base',
+              help="Whisper model size (default: base)")
+@click.option("--output-dir", "-o",
+              type=click.Path(),
+              help="Custom output directory for transcriptions")
+@click.option("--device", "-d", help="Torch device for Whisper, e.g. cpu or cuda (default: auto)")
+@click.option("--workers", "-w", default=2, show_default=True, type=click.IntRange(min=1),
+              help="Transcription worker processes")
+@click.option("--downloads", default=2, show_default=True, type=click.IntRange(min=1),
+              help="Concurrent downloads")
+@click.option("--force", "-f", is_flag=True, help="Transcribe again even if a transcript already exists")
+def transcribe_batch(batch_file: str, model_size: str, output_dir: str, device: str, workers: int,
+                     downloads: int, force: bool):
+    """Transcribe every URL, playlist or local audio file listed in a file.
+    
+    One source per line; blank lines and lines starting with # are ignored.
+    Downloads overlap with transcription, which runs in a pool of worker
+    processes that each keep their Whisper model loaded.
+    
+    Examples:
+        nexus transcribe batch videos.txt
+        nexus transcribe batch videos.txt --workers 4 --model-size small
+    """
+    from pathlib import Path
+    from nexus_qa.formatter import Formatter
+    
+    formatter = Formatter()
+    try:
+        from nexus_qa.transcriber import YouTubeTranscriber, TranscriptionError
+        
+        with open(batch_file, 'r', encoding='utf-8') as f:
+            sources = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        
+        transcriber = YouTubeTranscriber(output_dir=Path(output_dir) if output_dir else _transcription_dir(),
+                                         audio_cache=_audio_cache())
+        sources = transcriber.expand_sources(sources)
+        if not sources:
+            formatter.format_error(f"No sources found in {batch_file}")
+            return
+        
+        formatter.format_info(f"Transcribing {len(sources)} source(s) with {workers} worker(s)...\n")
+        completed = []
+        
+        def report(result):
+            completed.append(result)
+            prefix = f"[{len(completed)}/{len(sources)}]"
+            if result['error']:
+                formatter.format_error(f"{prefix} {result['source']}: {result['error']}")
+                return
+            if result['cached']:
+                formatter.format_success(f"{prefix} {result['metadata'].get('title') or result['source']} (cached)")
+                formatter.format_info(f"    {result['path']}")
+                return
+            timings = result['timings']
+            formatter.format_success(
+                f"{prefix} {result['metadata'].get('title') or result['source']} "
+                f"({result['audio_seconds']:.0f}s audio, model load {timings['model_load']:.1f}s, "
+                f"inference {timings['inference']:.1f}s)"
+            )
+            formatter.format_info(f"    {result['path']}")
+        
+        totals = transcriber.transcribe_batch(sources, model_size=model_size, device=device,
+                                              workers=workers, downloads=downloads, on_result=report,
+                                              force=force)
+        
+        throughput = totals['audio_seconds'] / totals['wall_seconds'] if totals['wall_seconds'] else 0.0
+        formatter.format_info(
+            f"\nTranscribed {totals['files']} file(s), {totals['cached']} cached, {totals['failed']} failed: "
+            f"{totals['audio_seconds']:.0f} audio-seconds in {totals['wall_seconds']:.1f}s "
+            f"({throughput:.2f} audio-seconds per wall-second)"
+        )
+        if totals['failed']:
+            sys.exit(1)
+    
+    except TranscriptionError as e:
+        formatter.format_error(str(e))
+        sys.exit(1)
+    except Exception as e:
+        formatter.format_error(f"Unexpected error: {e}")
+        sys.exit(1)
+
+
+@transcribe.command("preload")
+@click.option("--model-size", "-m",
+              type=click.Choice(['tiny', 'base', 'small', 'medium', 'large']),
+              default='base',
+              help="Whisper model size (default: base)")
+@click.option("--device", "-d", help="Torch device for Whisper, e.g. cpu or cuda (default: auto)")
+def transcribe_preload(model_size: str, device: str):
+    """Load a Whisper model ahead of time.
+    
+    With the daemon running, the model stays resident and later
+    'nexus transcribe url' calls skip the load. Without it, this only
+    downloads the model weights and reports how long a load takes.
+    """
+    from nexus_qa.formatter import Formatter
+    
+    formatter = Formatter()
+    try:
+        from nexus_qa.whisper_models import get_model, loaded_models
+        
+        _, load_seconds = get_model(model_size, device)
+        if load_seconds:
+            formatter.format_success(f"Loaded Whisper model '{model_size}' in {load_seconds:.1f}s")
+        else:
+            formatter.format_info(f"Whisper model '{model_size}' is already loaded")
+        for size, model_device, dtype in loaded_models():
+            formatter.format_info(f"  Resident: {size} ({model_device}, {dtype})")
+    
+    except ImportError:
+        formatter.format_error("openai-whisper is not installed. Install with: pip install openai-whisper")
+        sys.exit(1)
+    except Exception as e:
+        formatter.format_error(f"Failed to load Whisper model: {e}")
+        sys.exit(1)
+
+
 @transcribe.command("list")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed information")
 def transcribe_list(verbose: bool):
@@ -828,22 +993,16 @@ def transcribe_list(verbose: bool):
         nexus transcribe list
         nexus transcribe list --verbose
     """
+    from nexus_qa.formatter import Formatter
+    
     try:
-        from nexus_qa.transcriber import YouTubeTranscriber
-        from pathlib import Path
+        from nexus_qa.transcript_index import TranscriptIndex
         
         # Get output directory from config or use default
-        try:
-            config = load_config()
-            if hasattr(config, 'transcription') and config.transcription.get('output_dir'):
-                out_path = Path(config.transcription['output_dir'])
-            else:
-                out_path = Path.cwd() / "transcriptions"
-        except:
-            out_path = Path.cwd() / "transcriptions"
+        out_path = _transcription_dir()
         
-        transcriber = YouTubeTranscriber(output_dir=out_path)
-        transcriptions = transcriber.list_transcriptions()
+        # Listing only needs the index, not Whisper or ffmpeg
+        transcriptions = TranscriptIndex(out_path).list() if out_path.exists() else []
         
         if not transcriptions:
             formatter = Formatter()
@@ -876,6 +1035,126 @@ def transcribe_list(verbose: bool):
         sys.exit(1)
 
 
+@transcribe.command("search")
+@click.argument("query")
+@click.option("--limit", "-n", default=20, show_default=True, help="Maximum number of hits")
+@click.option("--output-dir", "-o", type=click.Path(), help="Transcription directory to search")
+def transcribe_search(query: str, limit: int, output_dir: str):
+    """Search saved transcriptions for QUERY.
+    
+    Every word must match (prefix match, so 'deploy' finds 'deployment').
+    Hits show the video, the timestamp of the matching segment and a link
+    that starts playback there.
+    
+    Examples:
+        nexus transcribe search kubernetes
+        nexus transcribe search "garbage collector" -n 5
+    """
+    from pathlib import Path
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.transcript_index import TranscriptIndex
+    
+    formatter = Formatter()
+    try:
+        out_path = Path(output_dir) if output_dir else _transcription_dir()
+        if not out_path.exists():
+            formatter.format_info(f"No transcriptions found in {out_path}")
+            return
+        
+        hits = TranscriptIndex(out_path).search(query, limit=limit, highlight=Formatter.HIT_MARKERS)
+        formatter.format_transcript_hits(hits)
+    
+    except Exception as e:
+        formatter.format_error(str(e))
+        sys.exit(1)
+
+
+@cli.group()
+def daemon():
+    """Background daemon that keeps Nexus warm for faster commands."""
+    pass
+
+
+@daemon.command("start")
+@click.option("--foreground", "-f", is_flag=True, help="Run in the foreground instead of detaching")
+def daemon_start(foreground: bool):
+    """Start the Nexus daemon."""
+    import subprocess
+    import time
+    from nexus_qa.config import get_config_path
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.daemon import control, get_socket_path, serve
+    
+    formatter = Formatter()
+    status = control("ping")
+    if status and status.get("busy"):
+        formatter.format_info("Nexus daemon already running (busy with a command)")
+        return
+    if status:
+        formatter.format_info(f"Nexus daemon already running (pid {status['pid']})")
+        return
+    
+    if foreground:
+        serve()
+        return
+    
+    log_path = get_config_path().parent / "daemon.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'a') as log:
+        subprocess.Popen([sys.executable, "-m", "nexus_qa.daemon"], stdin=subprocess.DEVNULL,
+                         stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+    
+    # Wait for the daemon to finish warming up and accept connections
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        status = control("ping")
+        if status and not status.get("busy"):
+            formatter.format_success(f"Nexus daemon started (pid {status['pid']}) on {get_socket_path()}")
+            return
+        time.sleep(0.05)
+    
+    formatter.format_error(f"Nexus daemon did not start, see {log_path}")
+    sys.exit(1)
+
+
+@daemon.command("stop")
+def daemon_stop():
+    """Stop the Nexus daemon."""
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.daemon import control
+    
+    formatter = Formatter()
+    reply = control("shutdown")
+    if reply is None:
+        formatter.format_info("Nexus daemon is not running")
+    elif reply.get("busy"):
+        formatter.format_info("Nexus daemon is busy with a command; it will stop once that finishes")
+    else:
+        formatter.format_success("Nexus daemon stopped")
+
+
+@daemon.command("status")
+def daemon_status():
+    """Show whether the Nexus daemon is running."""
+    from nexus_qa.formatter import Formatter
+    from nexus_qa.daemon import control, get_socket_path
+    
+    formatter = Formatter()
+    status = control("ping")
+    if status is None:
+        formatter.format_info("Nexus daemon is not running")
+        return
+    if status.get("busy"):
+        formatter.format_success("Nexus daemon running (busy with a command)")
+        formatter.format_info(f"Socket: {get_socket_path()}")
+        return
+    
+    formatter.format_success(f"Nexus daemon running (pid {status['pid']})")
+    formatter.format_info(f"Socket: {get_socket_path()}")
+    formatter.format_info(f"Uptime: {status['uptime']:.0f}s")
+    formatter.format_info(f"Requests served: {status['requests']}")
+
+
 if __name__ == "__main__":
-    cli()
+    run()
 
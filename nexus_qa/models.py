@@ -61,6 +61,32 @@ class CacheConfig(BaseModel):
     enabled: bool = True
     ttl_seconds: int = 3600
     max_entries: int = 1000
+    memory_max_bytes: int = 8 * 1024 * 1024  # in-process LRU tier budget
+    similarity: bool = False  # serve answers to near-identical questions (MinHash)
+    similarity_threshold: float = 0.85  # minimum estimated Jaccard similarity for a match
+    # Per-command TTLs ("ask", "debug", "explain", "check", "script"); others use ttl_seconds
+    command_ttl_seconds: Dict[str, int] = Field(default_factory=lambda: {
+        "check": 30 * 24 * 3600,
+        "explain": 30 * 24 * 3600,
+    })
+    stale_while_revalidate: bool = False  # serve expired answers while refreshing them in the background
+    stale_max_seconds: int = 7 * 24 * 3600  # how long past expiry an answer may still be served
+
+
+class HttpConfig(BaseModel):
+    """Model for HTTP connection pooling configuration."""
+    pool_connections: int = 4  # number of hosts to keep pools for
+    pool_maxsize: int = 10  # max keep-alive connections per host
+    pool_block: bool = False  # block instead of opening extra connections past pool_maxsize
+    max_retries: int = 0
+
+
+class TranscriptionConfig(BaseModel):
+    """Model for YouTube transcription configuration."""
+    output_dir: Optional[str] = None  # defaults to ./transcriptions
+    default_model_size: str = "base"
+    audio_cache_dir: Optional[str] = None  # defaults to ~/.cache/nexus/audio
+    audio_cache_max_bytes: int = 2 * 1024 ** 3  # LRU quota for downloaded audio; 0 disables the cache
 
 
 class Config(BaseModel):
@@ -70,6 +96,8 @@ class Config(BaseModel):
     output_mode: str = "brief"
     rate_limiting: RateLimitingConfig = Field(default_factory=RateLimitingConfig)
     cache: CacheConfig = Field(default_factory=CacheConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    transcription: TranscriptionConfig = Field(default_factory=TranscriptionConfig)
     providers: dict[str, ProviderConfig] = Field(default_factory=dict)
 
 
@@ -89,6 +117,7 @@ class WorkflowStep(BaseModel):
     alternative: Optional[str] = None
     requires_root: bool = False
     skip_if_no_permission: bool = True
+    depends_on: Optional[List[str]] = None  # step names; defaults to the previous step unless parallel
 
 
 class Workflow(BaseModel):
@@ -103,6 +132,8 @@ class Workflow(BaseModel):
     output_format: str = "summary"  # summary, detailed, json
     estimated_duration: Optional[str] = None
     variables: Dict[str, Any] = Field(default_factory=dict)
+    parallel: bool = False  # steps without depends_on may run concurrently
+    max_workers: Optional[int] = None
 
 
 class WorkflowExecution(BaseModel):
@@ -0,0 +1,235 @@
+"""Request pipeline shared by the answer commands (ask, debug, explain, check, script).
+
+Each run builds the prompt, looks the answer up in the cache exactly once under
+one canonical key, and on a miss takes a rate-limit token, calls the provider,
+writes the cache and history, then renders the answer. Concurrent identical
+misses share one provider call and cache write (``AIClient.coalesce``). With
+stale-while-revalidate enabled and a long-lived process (the daemon), an
+expired answer is rendered straight away and refreshed by a background
+thread. Time spent in every stage of the request is accumulated in
+``AskPipeline.timings``.
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, NamedTuple
+
+from nexus_qa.machine_output import MachineFormatter
+
+PROMPTS = {
+    "ask": "{text}",
+    "debug": """I encountered the following error. Please analyze it and provide:
+1. What the error means
+2. Why it occurred
+3. Step-by-step solution to fix it
+4. How to prevent it in the future
+
+Error message:
+{text}
+
+Provide a clear, actionable solution with commands if applicable.""",
+    "explain": """{learn_mode}Please explain the following command(s) in detail:
+
+{text}
+
+Provide:
+1. What the command does overall
+2. Breakdown of each flag/argument and what it does
+3. Common use cases
+4. Alternative approaches (if applicable)
+5. Potential side effects or things to be aware of
+
+Format the explanation clearly with sections for each part.""",
+    "check": """Analyze the following command for safety and security:
+
+{text}
+
+Provide:
+1. Safety assessment (Safe / Caution / Dangerous)
+2. What the command does
+3. Potential risks and why they're dangerous
+4. Safer alternatives (if applicable)
+5. Best practices for this type of operation
+
+Be specific about destructive operations, security risks, and data loss potential.""",
+    "script": """Generate a complete, production-ready {language} script based on this description:
+
+{text}
+
+The script must include:
+1. Proper error handling (try/catch, exit codes, etc.)
+2. Logging functionality
+3. Input validation
+4. Configuration options (use environment variables or config file)
+5. Usage documentation/comments
+6. Best practices for the language
+7. Proper shebang line if applicable
+
+Provide the complete script with all necessary components. Include comments explaining key parts.""",
+}
+
+STAGES = ("prompt", "cache_lookup", "rate_limit", "provider", "cache_write", "history", "render")
+
+
+def build_prompt(command: str, text: str, learn: bool = False, language: str = "bash") -> str:
+    """Build the provider prompt for a command."""
+    learn_mode = "Explain this like I'm a beginner. " if learn else ""
+    return PROMPTS[command].format(text=text, learn_mode=learn_mode, language=language)
+
+
+def cache_key(command: str, text: str, learn: bool = False, language: str = "bash") -> str:
+    """Canonical cache key for a command's input (stored with the config provider name)."""
+    if command == "ask":
+        return text
+    if command == "explain" and learn:
+        return f"explain:learn:{text}"
+    if command == "script":
+        return f"script:{language}:{text}"
+    return f"{command}:{text}"
+
+
+def history_label(command: str, text: str) -> str:
+    """Question text saved to history."""
+    return text if command == "ask" else f"{command}: {text[:100]}"
+
+
+class Answer(NamedTuple):
+    """Result of a pipeline run."""
+    response: str
+    from_cache: bool
+    latency: float
+    coalesced: bool = False
+    stale: bool = False
+
+
+class AskPipeline:
+    """Runs a command's question through cache, rate limiter, provider, history and formatter."""
+    
+    def __init__(self, client, cache, storage, provider: str, formatter,
+                 background_refresh: bool = False):
+        """Initialize pipeline.
+        
+        ``client`` is only used for its rate limiter and provider call; the
+        pipeline does the caching itself under ``provider``. Expired answers
+        are only served (and refreshed in a background thread) with
+        ``background_refresh``; a one-shot process would have to wait for the
+        refresh before exiting, so it treats them as misses instead.
+        """
+        self.client = client
+        self.cache = cache
+        self.storage = storage
+        self.provider = provider
+        self.formatter = formatter
+        self.background_refresh = background_refresh
+        self.timings: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.counts: Dict[str, int] = dict.fromkeys(STAGES, 0)
+        self.coalesced = 0
+        self.refreshes: List[threading.Thread] = []
+    
+    @contextmanager
+    def _stage(self, name: str):
+        """Add the time spent in the block to a stage's counters."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+            self.counts[name] += 1
+    
+    def run(self, command: str, text: str, stream: bool = False, **options) -> Answer:
+        """Answer ``text`` for ``command`` and render it.
+        
+        ``options`` are ``learn`` (explain) and ``language`` (script). With
+        ``stream`` a rich formatter renders the answer as it arrives.
+        """
+        started = time.perf_counter()
+        
+        with self._stage("prompt"):
+            prompt = build_prompt(command, text, **options)
+            key = cache_key(command, text, **options)
+        
+        with self._stage("cache_lookup"):
+            cached = self.cache.lookup(key, self.provider, allow_stale=self.background_refresh)
+        from_cache = cached is not None
+        response = cached.response if from_cache else None
+        stale = from_cache and cached.stale
+        
+        rendered = False
+        coalesced = False
+        if stale:
+            self._refresh(prompt, key)
+        elif not from_cache:
+            if stream and not isinstance(self.formatter, MachineFormatter):
+                # Rendering happens while the answer streams in, so streams are not shared
+                with self._stage("rate_limit"):
+                    self.client.check_rate_limit()
+                with self._stage("provider"):
+                    response = self.formatter.format_stream(self.client.complete_stream(prompt))
+                rendered = True
+                self._write_cache(key, response)
+            else:
+                # Identical questions already in flight share one provider call and cache write
+                response, coalesced = self.client.coalesce(key, lambda: self._fetch(prompt, key))
+                if coalesced:
+                    self.coalesced += 1
+            
+            with self._stage("history"):
+                self.storage.save_history(history_label(command, text), response, self.provider)
+        
+        latency = time.perf_counter() - started
+        if not rendered:
+            with self._stage("render"):
+                self._render(command, text, response, from_cache, latency, stale)
+        return Answer(response, from_cache, latency, coalesced, stale)
+    
+    def _refresh(self, prompt: str, key: str):
+        """Re-fetch a stale answer in a background thread.
+        
+        Its stage times are not counted in this request's timings. Failures
+        leave the stale entry in place.
+        """
+        def untimed(name: str):
+            return nullcontext()
+        
+        def refresh():
+            try:
+                self.client.coalesce(key, lambda: self._fetch(prompt, key, untimed))
+            except Exception:
+                pass
+        
+        thread = threading.Thread(target=refresh, name="nexus-cache-refresh", daemon=True)
+        thread.start()
+        self.refreshes.append(thread)
+    
+    def _fetch(self, prompt: str, key: str, stage=None) -> str:
+        """Rate-limit, call the provider and cache the answer."""
+        stage = stage or self._stage
+        with stage("rate_limit"):
+            self.client.check_rate_limit()
+        with stage("provider"):
+            response = self.client.complete(prompt)
+        self._write_cache(key, response, stage)
+        return response
+    
+    def _write_cache(self, key: str, response: str, stage=None):
+        if response:
+            with (stage or self._stage)("cache_write"):
+                self.cache.set(key, response, self.provider)
+    
+    def _render(self, command: str, text: str, response: str, from_cache: bool, latency: float,
+                stale: bool = False):
+        """Display an answer; machine output also records provider, latency and stage timings."""
+        if isinstance(self.formatter, MachineFormatter):
+            self.formatter.format_response(
+                response, from_cache=from_cache, command=command, query=text,
+                provider=self.provider, stale=stale, latency_ms=round(latency * 1000, 1),
+                timings_ms=self.timings_ms(),
+            )
+        else:
+            self.formatter.format_response(response, from_cache=from_cache, stale=stale)
+    
+    def timings_ms(self) -> Dict[str, float]:
+        """Time spent per stage so far, in milliseconds (stages that never ran are omitted)."""
+        return {stage: round(seconds * 1000, 3) for stage, seconds in self.timings.items()
+                if self.counts[stage]}
@@ -1,85 +1,129 @@
 """Rate limiting for Nexus CLI Assistant."""
 
+import asyncio
+import threading
 import time
-from collections import defaultdict
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 from nexus_qa.models import RateLimitingConfig
+from nexus_qa.storage import Storage
 
 
 class RateLimiter:
-    """Token bucket rate limiter implementation."""
+    """Token bucket rate limiter implementation.
     
-    def __init__(self, config: RateLimitingConfig):
+    Buckets refill continuously. When a :class:`Storage` is given, bucket state
+    lives in its SQLite database and is refilled and consumed inside a single
+    write transaction, so limits hold across separate ``nexus`` processes.
+    Without storage the buckets are kept in process memory.
+    """
+    
+    def __init__(self, config: RateLimitingConfig, storage: Optional[Storage] = None):
         """Initialize rate limiter with configuration."""
         self.config = config
+        self.storage = storage
         self.tokens_per_minute = config.requests_per_minute
         self.tokens_per_hour = config.requests_per_hour
         
-        # Token buckets: {provider: {minute: tokens, hour: tokens, last_update: time}}
-        self.buckets = defaultdict(lambda: {
-            "minute": self.tokens_per_minute,
-            "hour": self.tokens_per_hour,
-            "last_minute_update": time.time(),
-            "last_hour_update": time.time(),
-        })
+        # Bucket capacity and refill period (seconds) per window
+        self.limits = {
+            "minute": (self.tokens_per_minute, 60),
+            "hour": (self.tokens_per_hour, 3600),
+        }
+    
+        # In-memory buckets: {provider: {window: (tokens, last_update)}}
+        self.buckets: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        self._lock = threading.Lock()
     
-    def _refill_tokens(self, provider: str):
+    def _refill_tokens(self, state: Dict[str, Tuple[float, float]], now: float) -> Dict[str, Tuple[float, float]]:
         """Refill tokens based on elapsed time."""
-        bucket = self.buckets[provider]
-        now = time.time()
+        refilled = {}
+        for window, (capacity, period) in self.limits.items():
+            tokens, last_update = state.get(window, (capacity, now))
+            elapsed = max(0.0, now - last_update)
+            refilled[window] = (min(capacity, tokens + elapsed * capacity / period), now)
+        return refilled
         
-        # Refill minute bucket
-        elapsed_minutes = (now - bucket["last_minute_update"]) / 60
-        if elapsed_minutes >= 1:
-            bucket["minute"] = self.tokens_per_minute
-            bucket["last_minute_update"] = now
-        elif elapsed_minutes > 0:
-            # Partial refill
-            tokens_to_add = int(elapsed_minutes * self.tokens_per_minute)
-            bucket["minute"] = min(self.tokens_per_minute, bucket["minute"] + tokens_to_add)
-        
-        # Refill hour bucket
-        elapsed_hours = (now - bucket["last_hour_update"]) / 3600
-        if elapsed_hours >= 1:
-            bucket["hour"] = self.tokens_per_hour
-            bucket["last_hour_update"] = now
-        elif elapsed_hours > 0:
-            # Partial refill
-            tokens_to_add = int(elapsed_hours * self.tokens_per_hour)
-            bucket["hour"] = min(self.tokens_per_hour, bucket["hour"] + tokens_to_add)
-    
-    def is_allowed(self, provider: str) -> Tuple[bool, Optional[str]]:
-        """Check if request is allowed for provider."""
-        if not self.config.enabled:
-            return True, None
+    def _take(self, state: Dict[str, Tuple[float, float]], consume: bool):
+        """Refill a bucket state and optionally consume one token from every window.
         
-        self._refill_tokens(provider)
-        bucket = self.buckets[provider]
+        Returns ``(new_state, (allowed, error))``.
+        """
+        state = self._refill_tokens(state, time.time())
+        if not consume:
+            return state, (True, None)
         
         # Check both minute and hour limits
-        if bucket["minute"] <= 0:
-            wait_time = 60 - (time.time() - bucket["last_minute_update"])
-            return False, f"Rate limit exceeded. Try again in {int(wait_time)} seconds."
+        minute_tokens = state["minute"][0]
+        if minute_tokens < 1:
+            wait_time = (1 - minute_tokens) * 60 / max(self.tokens_per_minute, 1)
+            return state, (False, f"Rate limit exceeded. Try again in {int(wait_time) + 1} seconds.")
         
-        if bucket["hour"] <= 0:
-            wait_time = 3600 - (time.time() - bucket["last_hour_update"])
-            return False, f"Hourly rate limit exceeded. Try again in {int(wait_time / 60)} minutes."
+        hour_tokens = state["hour"][0]
+        if hour_tokens < 1:
+            wait_time = (1 - hour_tokens) * 3600 / max(self.tokens_per_hour, 1)
+            return state, (False, f"Hourly rate limit exceeded. Try again in {int(wait_time / 60) + 1} minutes.")
         
         # Consume tokens
-        bucket["minute"] -= 1
-        bucket["hour"] -= 1
+        consumed = {window: (tokens - 1, updated) for window, (tokens, updated) in state.items()}
+        return consumed, (True, None)
+    
+    def _update(self, provider: str, consume: bool):
+        """Atomically refill (and optionally consume from) a provider's buckets."""
+        if self.storage is not None:
+            return self.storage.update_rate_limit_buckets(
+                provider, lambda state: self._take(state, consume)
+            )
+        
+        with self._lock:
+            state, result = self._take(self.buckets.get(provider, {}), consume)
+            self.buckets[provider] = state
+        return state, result
+    
+    def is_allowed(self, provider: str) -> Tuple[bool, Optional[str]]:
+        """Check if request is allowed for provider."""
+        if not self.config.enabled:
+            return True, None
         
-        return True, None
+        _, result = self._update(provider, consume=True)
+        return result
     
     def get_status(self, provider: str) -> dict:
         """Get rate limit status for provider."""
-        self._refill_tokens(provider)
-        bucket = self.buckets[provider]
+        state, _ = self._update(provider, consume=False)
         
         return {
-            "minute_tokens": bucket["minute"],
-            "hour_tokens": bucket["hour"],
+            "minute_tokens": int(state["minute"][0]),
+            "hour_tokens": int(state["hour"][0]),
             "minute_limit": self.tokens_per_minute,
             "hour_limit": self.tokens_per_hour,
         }
 
+
+class AsyncRateLimiter:
+    """Asyncio wrapper that serializes token checks on a shared RateLimiter.
+    
+    Checks run in a worker thread: with SQLite-backed buckets a check can wait
+    up to the busy timeout for another process's write lock, which must not
+    stall the event loop.
+    """
+    
+    def __init__(self, rate_limiter: RateLimiter):
+        """Initialize with the rate limiter whose buckets should be shared."""
+        self.rate_limiter = rate_limiter
+        self._lock: Optional[asyncio.Lock] = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """Create the lock lazily so it binds to the running event loop."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+    
+    async def is_allowed(self, provider: str) -> Tuple[bool, Optional[str]]:
+        """Check if request is allowed for provider."""
+        async with self._get_lock():
+            return await asyncio.to_thread(self.rate_limiter.is_allowed, provider)
+    
+    async def get_status(self, provider: str) -> dict:
+        """Get rate limit status for provider."""
+        async with self._get_lock():
+            return await asyncio.to_thread(self.rate_limiter.get_status, provider)
@@ -0,0 +1,138 @@
+"""Parse AI answers into shell commands and explanation text.
+
+Kept free of rich so it can be used (and benchmarked) without a console.
+All patterns are compiled once at import and each answer is tokenized in a
+single pass that feeds both the command/explanation split and the brief
+summary.
+"""
+
+import re
+from typing import List, NamedTuple
+
+# Words that mark a line or inline snippet as a shell command
+COMMAND_WORDS = (
+    'docker', 'sudo', 'apt', 'systemctl', 'ufw', 'git', 'npm', 'pip', 'python', 'curl',
+    'wget', 'kubectl', 'helm', 'ssh', 'scp', 'rsync', 'tar', 'gzip', 'unzip', 'chmod',
+    'chown', 'ls', 'cd', 'cat', 'grep', 'find', 'ps', 'kill', 'top', 'htop',
+)
+
+# "docker " etc. anywhere in the text / at the start of a line
+_COMMAND = re.compile("|".join(re.escape(word + " ") for word in COMMAND_WORDS))
+# The bare word anywhere, used for backticked list items like "1. `docker ps`"
+_COMMAND_WORD = re.compile("|".join(re.escape(word) for word in COMMAND_WORDS))
+_LIST_ITEM = re.compile(r'^(\d+\.|\*|-)\s*(.+)')
+_INLINE_CODE = re.compile(r'`([^`]+)`')
+_BLANK_RUNS = re.compile(r'\n(?:[^\S\n]*\n)+')
+
+# Lines kept in the brief summary
+_BRIEF_LIST_PREFIXES = ('-', '*', '1.', '2.', '3.', '4.', '5.')
+_BRIEF_KEYWORDS = re.compile(r'\$|sudo|apt|docker|ufw|systemctl|git')
+
+_EXPLANATION_MARKERS = frozenset(':-—•')
+
+
+class ParsedResponse(NamedTuple):
+    """An answer split into commands, explanation and a brief summary."""
+    commands: List[str]
+    explanation: str
+    brief: str
+
+
+def _collapse_blank_lines(text: str) -> str:
+    """Collapse each run of blank lines to its first line."""
+    return _BLANK_RUNS.sub(lambda match: "\n" + match.group(0).split("\n", 2)[1] + "\n", text)
+
+
+def parse_response(response: str) -> ParsedResponse:
+    """Split an answer into commands (fenced code, ``$`` prompts, recognized
+    list items and inline code) and the remaining explanation.
+    """
+    commands = []
+    explanation_parts = []
+    brief_lines = []
+    
+    in_code_block = False
+    current_code = []
+    in_brief_code = False
+    
+    for line in response.split('\n'):
+        stripped = line.strip()
+        
+        # Brief summary: headers become bold, code blocks, list items and command-ish lines stay
+        if stripped.startswith('#'):
+            header_text = line.lstrip('#').strip()
+            if header_text:
+                brief_lines.append(f"**{header_text}**")
+        elif stripped.startswith('```'):
+            in_brief_code = not in_brief_code
+            brief_lines.append(line)
+        elif in_brief_code or stripped.startswith(_BRIEF_LIST_PREFIXES) or _BRIEF_KEYWORDS.search(line):
+            brief_lines.append(line)
+        
+        # Code blocks
+        if '```' in line:
+            if in_code_block:
+                code_text = '\n'.join(current_code).strip()
+                if code_text:
+                    commands.append(code_text)
+                current_code = []
+            in_code_block = not in_code_block
+            continue
+        
+        if in_code_block:
+            current_code.append(line)
+            continue
+        
+        # "1. `docker ps` - description" or "1. docker ps: description"
+        list_match = _LIST_ITEM.match(stripped)
+        if list_match:
+            content = list_match.group(2).strip()
+            
+            backtick_match = _INLINE_CODE.search(content)
+            if backtick_match:
+                cmd = backtick_match.group(1).strip().rstrip(':')
+                if _COMMAND_WORD.search(cmd):
+                    commands.append(cmd)
+                    explanation_parts.append(line)
+                    continue
+            
+            if ':' in content:
+                potential_cmd = content.split(':')[0].strip()
+                if _COMMAND.search(potential_cmd):
+                    commands.append(potential_cmd)
+                    explanation_parts.append(line)
+                    continue
+        
+        # "$ command" (shell prompt)
+        if stripped.startswith('$'):
+            cmd = stripped.lstrip('$ ').strip()
+            if cmd:
+                commands.append(cmd)
+                continue
+        
+        # Inline code with at least two words, e.g. "use `git log --oneline`"
+        if '`' in stripped:
+            for cmd in _INLINE_CODE.findall(stripped):
+                if _COMMAND.search(cmd) and len(cmd.split()) > 1:
+                    commands.append(cmd)
+        
+        if stripped:
+            # A bare command line without any descriptive punctuation is not explanation
+            if _COMMAND.match(stripped) and _EXPLANATION_MARKERS.isdisjoint(stripped):
+                continue
+            explanation_parts.append(line)
+    
+    explanation = '\n'.join(explanation_parts).strip()
+    if not explanation and not commands:
+        explanation = response
+    if explanation:
+        explanation = _collapse_blank_lines(explanation).strip()
+    
+    if len(brief_lines) < 3:
+        # Not much structure: fall back to the first few sentences
+        brief = '. '.join(response.split('.')[:3]) + '.'
+    else:
+        brief = '\n'.join(brief_lines)
+    
+    # Remove duplicate commands, keeping the first occurrence
+    return ParsedResponse(list(dict.fromkeys(commands)), explanation, brief)
@@ -0,0 +1,52 @@
+"""Shared, provider-keyed HTTP session pool for AI clients."""
+
+import threading
+from typing import Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from nexus_qa.models import HttpConfig
+
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+
+def _build_session(config: HttpConfig) -> requests.Session:
+    """Create a keep-alive session with a bounded connection pool."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=config.max_retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session(provider: str, config: Optional[HttpConfig] = None) -> requests.Session:
+    """Get the pooled session for a provider, creating it on first use.
+    
+    Sessions are shared process-wide so repeated questions to the same provider
+    reuse TCP/TLS connections instead of paying a fresh handshake every time.
+    """
+    key = provider.lower()
+    session = _sessions.get(key)
+    if session is not None:
+        return session
+    
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _build_session(config or HttpConfig())
+            _sessions[key] = session
+        return session
+
+
+def close_sessions():
+    """Close all pooled sessions and drop them from the registry."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,109 @@
+"""Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one execution: the first
+caller (the leader) runs the function and every caller that arrives while it
+is still running waits for and receives the leader's result or exception.
+Nothing is remembered once the call finishes; caching is the cache's job.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+# Result handed to followers when the leader is cancelled, telling them to retry
+_LEADER_CANCELLED = object()
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Thread-safe single-flight group for blocking calls."""
+    
+    def __init__(self):
+        """Initialize an empty group."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+    
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``function`` unless a call for ``key`` is already in flight.
+        
+        Returns ``(result, shared)``; ``shared`` is True when the result came
+        from another caller's execution.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = function()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Single-flight group for coroutines running on one event loop."""
+    
+    def __init__(self):
+        """Initialize an empty group."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+    
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await ``function()`` unless a call for ``key`` is already in flight.
+        
+        Returns ``(result, shared)`` like :meth:`SingleFlight.do`. If the
+        leader is cancelled its followers are not: one of them runs the call.
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            # Shield so a cancelled follower does not cancel the leader's call
+            result = await asyncio.shield(future)
+            if result is not _LEADER_CANCELLED:
+                return result, True
+            # The leader was cancelled, not this caller: retry, and the first
+            # follower to resume becomes the new leader
+            self.coalesced -= 1
+        
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.set_result(_LEADER_CANCELLED)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Followers re-raise it; mark it retrieved when nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
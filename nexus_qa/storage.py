@@ -1,14 +1,37 @@
 """Storage layer for Nexus CLI Assistant using SQLite."""
 
+import os
+import re
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Callable, Dict, Iterator, Optional, List, Tuple
+from nexus_qa.cache_keys import hash_query, minhash_signature
 from nexus_qa.models import Command, Category, HistoryEntry, CacheEntry
 
 
 class Storage:
-    """SQLite storage manager for commands, categories, history, and cache."""
+    """SQLite storage manager for commands, categories, history, and cache.
+    
+    Each process holds a single long-lived connection (WAL journal, tuned
+    pragmas, cached prepared statements) shared by all threads behind a lock.
+    """
+    
+    # Pragmas applied to every new connection
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA busy_timeout=5000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",  # 8 MB page cache
+        "PRAGMA mmap_size=268435456",  # 256 MB memory-mapped I/O
+    )
+    
+    # Bumped whenever _migrate gains a step; stored in PRAGMA user_version
+    SCHEMA_VERSION = 3
     
     def __init__(self, db_path: Optional[Path] = None):
         """Initialize storage with database path."""
@@ -18,101 +41,224 @@ class Storage:
             db_path = db_dir / "commands.db"
         
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.RLock()
+        self.has_fts = False
         self._init_database()
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        """Get the process-wide database connection, opening it on first use."""
+        # A connection must not be shared across fork(); reopen in the child
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Hold the connection lock for one operation and commit it on success."""
+        with self._lock:
+            conn = self._get_connection()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
     
     def _init_database(self):
         """Initialize database schema."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Commands table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS commands (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    command TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    description TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Categories table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS categories (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT UNIQUE NOT NULL,
+                    description TEXT
+                )
+            """)
+            
+            # History table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    query TEXT NOT NULL,
+                    response TEXT,
+                    provider TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Cache table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    query_hash TEXT UNIQUE NOT NULL,
+                    query_text TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    provider TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    expires_at INTEGER NOT NULL,  -- unix epoch seconds
+                    signature BLOB  -- MinHash of the normalized question (similarity tier)
+                )
+            """)
+            
+            # Rate limit buckets, shared by every nexus process
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    provider TEXT NOT NULL,
+                    window TEXT NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (provider, window)
+                )
+            """)
+            
+            # Indexes
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON commands(category)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_created ON history(created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_hash ON cache(query_hash)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at)")
+            
+            self._migrate(conn)
+    
+    def _migrate(self, conn: sqlite3.Connection):
+        """Upgrade an existing database to the current schema version."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            if version < 1:
+                # v1: cache expiry moved from local-time ISO strings to integer epoch seconds
+                conn.execute(
+                    """UPDATE cache SET expires_at = CAST(strftime('%s', expires_at, 'utc') AS INTEGER)
+                       WHERE typeof(expires_at) = 'text'"""
+                )
+                version = 1
         
-        # Commands table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS commands (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                command TEXT NOT NULL,
-                category TEXT NOT NULL,
-                description TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+            if version < 2:
+                # v2: FTS5 index over saved commands (created below)
+                version = 2
+            
+            if version < 3:
+                # v3: cache keys hash the normalized question; MinHash signatures for similarity lookups
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(cache)")}
+                if "signature" not in columns:
+                    conn.execute("ALTER TABLE cache ADD COLUMN signature BLOB")
+                self._rekey_cache(conn)
+                version = 3
+            
+            conn.execute(f"PRAGMA user_version = {version}")
         
-        # Categories table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS categories (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT UNIQUE NOT NULL,
-                description TEXT
+        # The FTS5 index is retried on every run until SQLite supports it
+        self.has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'commands_fts'"
+        ).fetchone() is not None
+        if not self.has_fts:
+            try:
+                self._create_command_index(conn)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5; search falls back to LIKE
+                pass
+    
+    def _rekey_cache(self, conn: sqlite3.Connection):
+        """Recompute every cache row's hash and signature; the newest row wins when keys merge."""
+        rows = conn.execute("SELECT id, query_text, provider FROM cache ORDER BY id DESC").fetchall()
+        # Move rows out of the way first so new hashes cannot collide with old ones
+        conn.execute("UPDATE cache SET query_hash = 'rekey:' || id")
+        seen = set()
+        for row in rows:
+            query_hash = hash_query(row["query_text"], row["provider"])
+            if query_hash in seen:
+                conn.execute("DELETE FROM cache WHERE id = ?", (row["id"],))
+                continue
+            seen.add(query_hash)
+            conn.execute(
+                "UPDATE cache SET query_hash = ?, signature = ? WHERE id = ?",
+                (query_hash, minhash_signature(row["query_text"]), row["id"])
             )
-        """)
-        
-        # History table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                query TEXT NOT NULL,
-                response TEXT,
-                provider TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    
+    def _create_command_index(self, conn: sqlite3.Connection):
+        """Create the commands_fts table and its sync triggers, then index existing rows."""
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS commands_fts USING fts5(
+                command, category, description,
+                content='commands', content_rowid='id', prefix='2 3'
             )
         """)
-        
-        # Cache table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                query_hash TEXT UNIQUE NOT NULL,
-                query_text TEXT NOT NULL,
-                response TEXT NOT NULL,
-                provider TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP NOT NULL
-            )
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS commands_fts_insert AFTER INSERT ON commands BEGIN
+                INSERT INTO commands_fts(rowid, command, category, description)
+                VALUES (new.id, new.command, new.category, new.description);
+            END
         """)
-        
-        # Indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON commands(category)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_history_created ON history(created_at)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_hash ON cache(query_hash)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache(expires_at)")
-        
-        conn.commit()
-        conn.close()
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS commands_fts_delete AFTER DELETE ON commands BEGIN
+                INSERT INTO commands_fts(commands_fts, rowid, command, category, description)
+                VALUES ('delete', old.id, old.command, old.category, old.description);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS commands_fts_update AFTER UPDATE ON commands BEGIN
+                INSERT INTO commands_fts(commands_fts, rowid, command, category, description)
+                VALUES ('delete', old.id, old.command, old.category, old.description);
+                INSERT INTO commands_fts(rowid, command, category, description)
+                VALUES (new.id, new.command, new.category, new.description);
+            END
+        """)
+        conn.execute("INSERT INTO commands_fts(commands_fts) VALUES ('rebuild')")
     
     # Command operations
     def save_command(self, command: str, category: str, description: Optional[str] = None) -> int:
         """Save a command to the database."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO commands (command, category, description) VALUES (?, ?, ?)",
-            (command, category, description)
-        )
-        command_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO commands (command, category, description) VALUES (?, ?, ?)",
+                (command, category, description)
+            )
+            command_id = cursor.lastrowid
         return command_id
     
     def get_commands(self, category: Optional[str] = None) -> List[Command]:
         """Get commands, optionally filtered by category."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        if category:
-            cursor.execute(
-                "SELECT * FROM commands WHERE category = ? ORDER BY created_at DESC",
-                (category,)
-            )
-        else:
-            cursor.execute("SELECT * FROM commands ORDER BY created_at DESC")
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            if category:
+                cursor.execute(
+                    "SELECT * FROM commands WHERE category = ? ORDER BY created_at DESC",
+                    (category,)
+                )
+            else:
+                cursor.execute("SELECT * FROM commands ORDER BY created_at DESC")
+            
+            rows = cursor.fetchall()
         
         commands = []
         for row in rows:
@@ -125,18 +271,34 @@ class Storage:
             ))
         return commands
     
-    def search_commands(self, keyword: str) -> List[Command]:
-        """Search commands by keyword."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """SELECT * FROM commands 
-               WHERE command LIKE ? OR category LIKE ? OR description LIKE ?
-               ORDER BY created_at DESC""",
-            (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%")
-        )
-        rows = cursor.fetchall()
-        conn.close()
+    def search_commands(self, keyword: str, limit: Optional[int] = None) -> List[Command]:
+        """Search commands by keyword.
+        
+        Uses the FTS5 index when available: every word in ``keyword`` must
+        prefix-match a word in the command, category or description, and
+        results are ranked by BM25 (matches in the command text weigh most).
+        """
+        terms = re.findall(r"\w+", keyword)
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            if self.has_fts and terms:
+                cursor.execute(
+                    """SELECT commands.* FROM commands_fts
+                       JOIN commands ON commands.id = commands_fts.rowid
+                       WHERE commands_fts MATCH ?
+                       ORDER BY bm25(commands_fts, 10.0, 5.0, 1.0)
+                       LIMIT ?""",
+                    (" ".join(f'"{term}"*' for term in terms), limit if limit else -1)
+                )
+            else:
+                cursor.execute(
+                    """SELECT * FROM commands 
+                       WHERE command LIKE ? OR category LIKE ? OR description LIKE ?
+                       ORDER BY created_at DESC
+                       LIMIT ?""",
+                    (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", limit if limit else -1)
+                )
+            rows = cursor.fetchall()
         
         commands = []
         for row in rows:
@@ -151,49 +313,43 @@ class Storage:
     
     def delete_command(self, command_id: int) -> bool:
         """Delete a command by ID."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM commands WHERE id = ?", (command_id,))
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM commands WHERE id = ?", (command_id,))
+            deleted = cursor.rowcount > 0
         return deleted
     
     # Category operations
     def get_categories(self) -> List[Category]:
         """Get all categories."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT category as name FROM commands ORDER BY name")
-        rows = cursor.fetchall()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT category as name FROM commands ORDER BY name")
+            rows = cursor.fetchall()
         
         return [Category(name=row["name"]) for row in rows]
     
     # History operations
     def save_history(self, query: str, response: Optional[str] = None, provider: Optional[str] = None) -> int:
         """Save a history entry."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO history (query, response, provider) VALUES (?, ?, ?)",
-            (query, response, provider)
-        )
-        history_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO history (query, response, provider) VALUES (?, ?, ?)",
+                (query, response, provider)
+            )
+            history_id = cursor.lastrowid
         return history_id
     
     def get_history(self, limit: int = 20) -> List[HistoryEntry]:
         """Get recent history entries."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT * FROM history ORDER BY created_at DESC LIMIT ?",
-            (limit,)
-        )
-        rows = cursor.fetchall()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM history ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            )
+            rows = cursor.fetchall()
         
         history = []
         for row in rows:
@@ -207,75 +363,110 @@ class Storage:
         return history
     
     # Cache operations
-    def get_cache(self, query_hash: str) -> Optional[CacheEntry]:
-        """Get a cache entry by query hash."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        # Compare using ISO format to match how we store it
-        cursor.execute(
-            "SELECT * FROM cache WHERE query_hash = ?",
-            (query_hash,)
-        )
-        row = cursor.fetchone()
-        conn.close()
+    def get_cache(self, query_hash: str, stale_seconds: int = 0) -> Optional[CacheEntry]:
+        """Get a cache entry by query hash.
+        
+        Entries that expired less than ``stale_seconds`` ago are returned too.
+        """
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT * FROM cache WHERE query_hash = ? AND expires_at > ?",
+                (query_hash, int(time.time()) - stale_seconds)
+            )
+            row = cursor.fetchone()
         
         if row:
-            expires_at = datetime.fromisoformat(row["expires_at"])
-            # Check expiration in Python to ensure accurate comparison
-            if expires_at > datetime.now():
-                return CacheEntry(
-                    id=row["id"],
-                    query_hash=row["query_hash"],
-                    query_text=row["query_text"],
-                    response=row["response"],
-                    provider=row["provider"],
-                    created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else None,
-                    expires_at=expires_at,
-                )
+            return CacheEntry(
+                id=row["id"],
+                query_hash=row["query_hash"],
+                query_text=row["query_text"],
+                response=row["response"],
+                provider=row["provider"],
+                created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else None,
+                expires_at=datetime.fromtimestamp(row["expires_at"]),
+            )
         return None
     
     def save_cache(self, query_hash: str, query_text: str, response: str, 
-                   provider: Optional[str], expires_at: datetime) -> int:
+                   provider: Optional[str], expires_at: datetime,
+                   signature: Optional[bytes] = None) -> int:
         """Save a cache entry."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            """INSERT OR REPLACE INTO cache 
-               (query_hash, query_text, response, provider, expires_at) 
-               VALUES (?, ?, ?, ?, ?)""",
-            (query_hash, query_text, response, provider, expires_at.isoformat())
-        )
-        cache_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """INSERT OR REPLACE INTO cache 
+                   (query_hash, query_text, response, provider, expires_at, signature) 
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (query_hash, query_text, response, provider, int(expires_at.timestamp()), signature)
+            )
+            cache_id = cursor.lastrowid
         return cache_id
     
-    def cleanup_expired_cache(self):
-        """Remove expired cache entries."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        # Get all entries and filter in Python for accurate datetime comparison
-        cursor.execute("SELECT * FROM cache")
-        rows = cursor.fetchall()
-        now = datetime.now()
-        deleted_count = 0
-        
-        for row in rows:
-            expires_at = datetime.fromisoformat(row["expires_at"])
-            if expires_at <= now:
-                cursor.execute("DELETE FROM cache WHERE id = ?", (row["id"],))
-                deleted_count += 1
-        
-        conn.commit()
-        conn.close()
+    def get_cache_signatures(self, provider: Optional[str]) -> List[Tuple[bytes, str, int]]:
+        """Get ``(signature, response, expires_at)`` of unexpired entries with a signature."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                """SELECT signature, response, expires_at FROM cache
+                   WHERE provider IS ? AND expires_at > ? AND signature IS NOT NULL""",
+                (provider, int(time.time()))
+            ).fetchall()
+        return [(row["signature"], row["response"], row["expires_at"]) for row in rows]
+    
+    def cleanup_expired_cache(self, grace_seconds: int = 0) -> int:
+        """Remove cache entries that expired more than ``grace_seconds`` ago."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM cache WHERE expires_at <= ?", (int(time.time()) - grace_seconds,))
+            deleted_count = cursor.rowcount
+        return deleted_count
+            
+    def trim_cache(self, max_entries: int) -> int:
+        """Evict the oldest cache entries so at most ``max_entries`` remain."""
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            # Everything at or below the id of the (max_entries + 1)-th newest row goes
+            cursor.execute(
+                """DELETE FROM cache WHERE id <= (
+                       SELECT id FROM cache ORDER BY id DESC LIMIT 1 OFFSET ?
+                   )""",
+                (max(0, max_entries),)
+            )
+            deleted_count = cursor.rowcount
         return deleted_count
     
     def get_cache_count(self) -> int:
         """Get total number of cache entries."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) as count FROM cache")
-        count = cursor.fetchone()["count"]
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) as count FROM cache")
+            count = cursor.fetchone()["count"]
         return count
-
+    
+    # Rate limit operations
+    def update_rate_limit_buckets(
+        self,
+        provider: str,
+        update: Callable[[Dict[str, Tuple[float, float]]], Tuple[Dict[str, Tuple[float, float]], Any]],
+    ) -> Tuple[Dict[str, Tuple[float, float]], Any]:
+        """Atomically read, update and write a provider's rate limit buckets.
+        
+        ``update`` receives ``{window: (tokens, updated_at)}`` and returns the new
+        state plus a result. The read-modify-write runs under ``BEGIN IMMEDIATE``,
+        so concurrent processes cannot both spend the same token.
+        """
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT window, tokens, updated_at FROM rate_limits WHERE provider = ?",
+                (provider,)
+            ).fetchall()
+            state = {row["window"]: (row["tokens"], row["updated_at"]) for row in rows}
+            
+            new_state, result = update(state)
+            
+            conn.executemany(
+                "INSERT OR REPLACE INTO rate_limits (provider, window, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                [(provider, window, tokens, updated_at) for window, (tokens, updated_at) in new_state.items()]
+            )
+        return new_state, result
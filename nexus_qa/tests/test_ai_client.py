@@ -0,0 +1,121 @@
+import json
+import unittest
+
+from nexus_qa.ai_client import AnthropicClient, OllamaClient, OpenAIClient
+from nexus_qa.models import ProviderConfig
+
+
+class FakeResponse:
+    def __init__(self, lines=None, payload=None):
+        self.lines = lines or []
+        self.payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return self.payload
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+        self.calls = []
+
+    def post(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.response
+
+
+class FakeCache:
+    def __init__(self):
+        self.saved = {}
+
+    def get(self, query, provider=None):
+        return self.saved.get(query)
+
+    def set(self, query, response, provider=None):
+        self.saved[query] = response
+
+
+def sse(*events):
+    lines = []
+    for event in events:
+        lines.append(b"data: " + json.dumps(event).encode())
+        lines.append(b"")
+    return lines
+
+
+class AskStreamTests(unittest.TestCase):
+    def test_ollama_streams_ndjson_and_caches_full_answer(self) -> None:
+        lines = [
+            json.dumps({"response": "docker ", "done": False}).encode(),
+            json.dumps({"response": "ps", "done": False}).encode(),
+            json.dumps({"response": "", "done": True}).encode(),
+        ]
+        session = FakeSession(FakeResponse(lines))
+        cache = FakeCache()
+        client = OllamaClient(ProviderConfig(model="llama3.2"), cache=cache, session=session)
+
+        chunks = list(client.ask_stream("list containers"))
+
+        self.assertEqual(chunks, ["docker ", "ps"])
+        self.assertTrue(session.calls[0]["stream"])
+        self.assertTrue(session.calls[0]["json"]["stream"])
+        self.assertEqual(cache.saved["list containers"], "docker ps")
+
+    def test_openai_streams_sse_deltas(self) -> None:
+        lines = sse(
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "git "}}]},
+            {"choices": [{"delta": {"content": "status"}}]},
+        ) + [b"data: [DONE]"]
+        client = OpenAIClient(
+            ProviderConfig(model="gpt-4o-mini", api_key="test"),
+            session=FakeSession(FakeResponse(lines)),
+        )
+
+        self.assertEqual("".join(client.ask_stream("q")), "git status")
+
+    def test_anthropic_streams_content_block_deltas(self) -> None:
+        lines = sse(
+            {"type": "message_start", "message": {}},
+            {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "ls "}},
+            {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "-la"}},
+            {"type": "message_stop"},
+        )
+        client = AnthropicClient(
+            ProviderConfig(model="claude", api_key="test"),
+            session=FakeSession(FakeResponse(lines)),
+        )
+
+        self.assertEqual("".join(client.ask_stream("q")), "ls -la")
+
+    def test_cached_answer_is_yielded_without_request(self) -> None:
+        session = FakeSession(FakeResponse())
+        cache = FakeCache()
+        cache.set("q", "cached answer")
+        client = OllamaClient(ProviderConfig(model="llama3.2"), cache=cache, session=session)
+
+        self.assertEqual(list(client.ask_stream("q")), ["cached answer"])
+        self.assertEqual(session.calls, [])
+
+    def test_ask_parses_complete_response(self) -> None:
+        session = FakeSession(FakeResponse(payload={"response": "uptime"}))
+        client = OllamaClient(ProviderConfig(model="llama3.2"), session=session)
+
+        self.assertEqual(client.ask("load?"), "uptime")
+        self.assertFalse(session.calls[0]["json"]["stream"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from nexus_qa.async_client import AsyncOllamaClient, ask_batch
+from nexus_qa.cache import AsyncCache
+from nexus_qa.models import CacheConfig, ProviderConfig
+from nexus_qa.storage import Storage
+
+
+class SlowEchoResponse:
+    def __init__(self, prompt: str):
+        self.prompt = prompt
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self):
+        return {"response": f"answer: {self.prompt}"}
+
+
+class SlowEchoSession:
+    """Answers after a delay that shrinks with each call, so completion order is reversed."""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def post(self, **kwargs):
+        with self.lock:
+            self.calls += 1
+            delay = 0.2 / self.calls
+        time.sleep(delay)
+        return SlowEchoResponse(kwargs["json"]["prompt"])
+
+
+class AskBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self.tmpdir.name) / "test.db")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def run_batch(self, session, questions):
+        cache = AsyncCache(self.storage, CacheConfig())
+        client = self.client = AsyncOllamaClient(ProviderConfig(model="llama3.2"), cache=cache, session=session)
+
+        async def run():
+            try:
+                return await ask_batch(client, questions, concurrency=3)
+            finally:
+                await cache.close()
+
+        return asyncio.run(run())
+
+    def test_results_keep_input_order(self) -> None:
+        questions = ["one", "two", "three"]
+
+        results = self.run_batch(SlowEchoSession(), questions)
+
+        self.assertEqual([r["question"] for r in results], questions)
+        self.assertEqual([r["answer"] for r in results], [f"answer: {q}" for q in questions])
+        self.assertTrue(all(r["latency"] > 0 for r in results))
+
+    def test_second_batch_is_served_from_cache(self) -> None:
+        self.run_batch(SlowEchoSession(), ["one", "two"])
+        session = SlowEchoSession()
+
+        results = self.run_batch(session, ["one", "two"])
+
+        self.assertEqual(session.calls, 0)
+        self.assertTrue(all(r["from_cache"] for r in results))
+
+    def test_identical_questions_in_flight_share_one_call(self) -> None:
+        session = SlowEchoSession()
+
+        # All three start together (concurrency=3), so none can be a cache hit
+        results = self.run_batch(session, ["same", "other", "same"])
+
+        self.assertEqual(session.calls, 2)
+        self.assertEqual(self.client.coalesced, 1)
+        self.assertEqual([r["answer"] for r in results], ["answer: same", "answer: other", "answer: same"])
+        self.assertFalse(any(r["from_cache"] for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from nexus_qa.audio import SAMPLE_RATE, AudioCache, find_split_points, load_audio, split_audio
+
+
+def speech_with_pauses(seconds: float, pauses) -> np.ndarray:
+    """Noise standing in for speech, silenced during each (start, end) pause."""
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(int(seconds * SAMPLE_RATE)) * 0.3).astype(np.float32)
+    for start, end in pauses:
+        audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] = 0.0
+    return audio
+
+
+class FindSplitPointsTests(unittest.TestCase):
+    def test_splits_land_inside_pauses(self) -> None:
+        pauses = [(55.0, 56.0), (118.0, 118.5)]
+        audio = speech_with_pauses(180, pauses)
+
+        splits = find_split_points(audio, chunk_seconds=60.0, search_seconds=10.0)
+
+        self.assertEqual(len(splits), 2)
+        for split, (start, end) in zip(splits, pauses):
+            self.assertGreaterEqual(split / SAMPLE_RATE, start)
+            self.assertLessEqual(split / SAMPLE_RATE, end)
+
+    def test_splits_are_deterministic(self) -> None:
+        audio = speech_with_pauses(300, [(70.0, 70.4), (130.0, 131.0)])
+
+        self.assertEqual(find_split_points(audio), find_split_points(audio.copy()))
+
+    def test_short_audio_is_not_split(self) -> None:
+        audio = speech_with_pauses(80, [(40.0, 41.0)])
+
+        self.assertEqual(find_split_points(audio, chunk_seconds=60.0), [])
+
+    def test_split_audio_offsets_cover_whole_recording(self) -> None:
+        audio = speech_with_pauses(200, [(60.0, 61.0), (125.0, 126.0)])
+        splits = find_split_points(audio)
+
+        chunks = split_audio(audio, splits)
+
+        self.assertEqual(chunks[0][0], 0.0)
+        self.assertEqual([offset for offset, _ in chunks[1:]], [s / SAMPLE_RATE for s in splits])
+        self.assertEqual(sum(len(chunk) for _, chunk in chunks), len(audio))
+
+
+class LoadAudioTests(unittest.TestCase):
+    def test_decodes_native_stream_through_pipe(self) -> None:
+        pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+        completed = subprocess.CompletedProcess([], 0, stdout=pcm, stderr=b"")
+
+        with mock.patch("nexus_qa.audio.subprocess.run", return_value=completed) as run:
+            audio = load_audio("video.webm")
+
+        command = run.call_args.args[0]
+        self.assertEqual(command[command.index("-i") + 1], "video.webm")
+        self.assertEqual(command[command.index("-ar") + 1], str(SAMPLE_RATE))
+        self.assertEqual(command[command.index("-ac") + 1], "1")
+        self.assertEqual(command[-1], "-")
+        self.assertEqual(audio.dtype, np.float32)
+        np.testing.assert_allclose(audio, [0.0, 0.5, -1.0])
+
+    def test_ffmpeg_failure_is_reported(self) -> None:
+        error = subprocess.CalledProcessError(1, "ffmpeg", stderr=b"...\nvideo.webm: Invalid data found")
+
+        with mock.patch("nexus_qa.audio.subprocess.run", side_effect=error):
+            with self.assertRaisesRegex(RuntimeError, "Invalid data found"):
+                load_audio("video.webm")
+
+
+class AudioCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = AudioCache(Path(self.tmp.name), max_bytes=250)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def add(self, name: str, size: int, age: int) -> Path:
+        path = self.cache.directory / name
+        path.write_bytes(b"x" * size)
+        os.utime(path, (1_000_000 - age, 1_000_000 - age))
+        return path
+
+    def test_get_finds_any_container_and_marks_it_used(self) -> None:
+        path = self.add("abcdefghijk.webm", 10, age=100)
+        self.add("other.m4a.part", 10, age=0)
+
+        self.assertEqual(self.cache.get("abcdefghijk"), path)
+        self.assertGreater(path.stat().st_mtime, 1_000_000)
+        self.assertIsNone(self.cache.get("other"))
+
+    def test_evicts_least_recently_used_until_under_quota(self) -> None:
+        oldest = self.add("a.m4a", 100, age=30)
+        middle = self.add("b.m4a", 100, age=20)
+        newest = self.add("c.m4a", 100, age=10)
+
+        self.assertEqual(self.cache.evict(), [oldest])
+        self.assertTrue(middle.exists())
+        self.assertTrue(newest.exists())
+
+    def test_evict_never_removes_kept_file(self) -> None:
+        kept = self.add("big.webm", 300, age=50)
+        other = self.add("small.webm", 10, age=40)
+
+        self.assertEqual(self.cache.evict(keep={kept}), [other])
+        self.assertTrue(kept.exists())
+
+    def test_evict_skips_partial_downloads_and_in_flight_audio(self) -> None:
+        partial = self.add("a.webm.part", 100, age=50)
+        queued = self.add("b.m4a", 100, age=40)
+        idle = self.add("c.m4a", 100, age=30)
+        just_downloaded = self.add("d.m4a", 100, age=0)
+
+        self.assertEqual(self.cache.evict(keep={queued, just_downloaded}), [idle])
+        self.assertTrue(partial.exists())
+        self.assertTrue(queued.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from nexus_qa.cache import AsyncCache, Cache, MemoryCache, ttl_for
+from nexus_qa.cache_keys import canonical_query, hash_query, minhash_signature, normalize_question
+from nexus_qa.models import CacheConfig
+from nexus_qa.storage import Storage
+
+
+class MemoryCacheTests(unittest.TestCase):
+    def test_evicts_least_recently_used_by_bytes(self) -> None:
+        memory = MemoryCache(max_bytes=10)
+        expires = time.time() + 60
+
+        memory.set("a", "aaaa", expires)
+        memory.set("b", "bbbb", expires)
+        memory.get("a")
+        memory.set("c", "cccc", expires)
+
+        self.assertEqual(memory.get("a"), "aaaa")
+        self.assertIsNone(memory.get("b"))
+        self.assertEqual(memory.get("c"), "cccc")
+        self.assertEqual(memory.current_bytes, 8)
+
+    def test_expired_entries_are_dropped(self) -> None:
+        memory = MemoryCache(max_bytes=100)
+        memory.set("a", "value", time.time() - 1)
+
+        self.assertIsNone(memory.get("a"))
+        self.assertEqual(memory.current_bytes, 0)
+
+
+class TwoTierCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self.tmpdir.name) / "test.db")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_set_writes_through_and_hot_keys_skip_sqlite(self) -> None:
+        cache = Cache(self.storage, CacheConfig())
+        cache.set("q", "answer", "ollama")
+
+        with mock.patch.object(self.storage, "get_cache", wraps=self.storage.get_cache) as get_cache:
+            self.assertEqual(cache.get("q", "ollama"), "answer")
+            get_cache.assert_not_called()
+
+        # A fresh process only has the SQLite tier, then promotes the entry
+        fresh = Cache(self.storage, CacheConfig())
+        self.assertEqual(fresh.get("q", "ollama"), "answer")
+        self.assertEqual(fresh.get("q", "ollama"), "answer")
+        self.assertIsNone(fresh.get("other", "ollama"))
+
+        stats = fresh.get_stats()
+        self.assertEqual(stats["memory_hits"], 1)
+        self.assertEqual(stats["disk_hits"], 1)
+        self.assertEqual(stats["disk_misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+
+
+class CacheKeyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self.tmpdir.name) / "test.db")
+
+    def tearDown(self) -> None:
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def test_questions_are_normalized(self) -> None:
+        self.assertEqual(normalize_question("  How do I check the Docker status? "), "check docker status")
+        self.assertEqual(normalize_question("How to stop `nginx` without downtime."), "stop nginx without downtime")
+        self.assertEqual(normalize_question("how to do it?"), "how to do it?")
+
+    def test_flags_and_paths_keep_their_case(self) -> None:
+        self.assertNotEqual(canonical_query("What is -R in ls"), canonical_query("what is -r in ls"))
+        self.assertEqual(canonical_query("What is -R in LS?"), canonical_query("what is -R in ls"))
+        self.assertEqual(normalize_question("Copy ~/Downloads/Report.PDF with LANG=C"),
+                         "copy ~/Downloads/Report.PDF LANG=C")
+
+    def test_command_lookups_keep_case_and_punctuation(self) -> None:
+        self.assertEqual(canonical_query("check:ls   -L"), "check:ls -L")
+        self.assertNotEqual(hash_query("check:ls -L"), hash_query("check:ls -l"))
+        self.assertIsNone(minhash_signature("check:rm -rf /"))
+
+    def test_reworded_question_hits(self) -> None:
+        cache = Cache(self.storage, CacheConfig())
+        cache.set("how to check docker status", "answer", "ollama")
+
+        fresh = Cache(self.storage, CacheConfig())
+        self.assertEqual(fresh.get("How to check Docker status?", "ollama"), "answer")
+        self.assertIsNone(fresh.get("how to check docker container status", "ollama"))
+
+    def test_similarity_tier_matches_near_duplicates_only(self) -> None:
+        Cache(self.storage, CacheConfig()).set("how do I undo the last git commit", "git reset", "ollama")
+        cache = Cache(self.storage, CacheConfig(similarity=True, similarity_threshold=0.85))
+
+        self.assertEqual(cache.get("git: undo last commit", "ollama"), "git reset")
+        self.assertIsNone(cache.get("git undo last push", "ollama"))
+        self.assertIsNone(cache.get("git undo last commit", "openai"))
+        self.assertEqual(cache.get_stats()["similarity_hits"], 1)
+
+        # Served from memory under its own key afterwards
+        with mock.patch.object(self.storage, "get_cache_signatures") as signatures:
+            self.assertEqual(cache.get("git: undo last commit", "ollama"), "git reset")
+            signatures.assert_not_called()
+
+
+class ExpiryPolicyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self.tmpdir.name) / "test.db")
+
+    def tearDown(self) -> None:
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def save_expired(self, query: str, response: str, seconds_ago: int) -> None:
+        expires_at = datetime.now() - timedelta(seconds=seconds_ago)
+        self.storage.save_cache(hash_query(query, "ollama"), query, response, "ollama", expires_at)
+
+    def test_ttl_depends_on_command(self) -> None:
+        config = CacheConfig(ttl_seconds=3600, command_ttl_seconds={"check": 86400, "ask": 600})
+
+        self.assertEqual(ttl_for("check:rm -rf /tmp", config), 86400)
+        self.assertEqual(ttl_for("how to list volumes", config), 600)
+        self.assertEqual(ttl_for("debug:port is already allocated", config), 3600)
+        self.assertEqual(ttl_for("explain:ls -la", CacheConfig()), 30 * 24 * 3600)
+
+    def test_expired_entry_is_served_stale_only_by_lookup(self) -> None:
+        self.save_expired("q", "old answer", 60)
+        cache = Cache(self.storage, CacheConfig(stale_while_revalidate=True))
+
+        self.assertIsNone(cache.get("q", "ollama"))
+        cached = cache.lookup("q", "ollama")
+        self.assertEqual(cached.response, "old answer")
+        self.assertTrue(cached.stale)
+        self.assertEqual(cache.get_stats()["stale_serves"], 1)
+
+        # Without stale-while-revalidate, or past stale_max_seconds, it is a miss
+        self.assertIsNone(Cache(self.storage, CacheConfig()).lookup("q", "ollama"))
+        self.assertIsNone(Cache(self.storage, CacheConfig(stale_while_revalidate=True,
+                                                          stale_max_seconds=30)).lookup("q", "ollama"))
+
+    def test_async_set_enforces_max_entries(self) -> None:
+        self.save_expired("old", "a", 60)
+        cache = AsyncCache(self.storage, CacheConfig(max_entries=3))
+
+        async def run():
+            try:
+                for i in range(5):
+                    await cache.set(f"question {i}", "answer", "ollama")
+            finally:
+                await cache.close()
+
+        asyncio.run(run())
+
+        self.assertEqual(self.storage.get_cache_count(), 3)
+        self.assertIsNotNone(self.storage.get_cache(hash_query("question 4", "ollama")))
+        self.assertIsNone(self.storage.get_cache(hash_query("old", "ollama"), stale_seconds=3600))
+
+    def test_cleanup_keeps_entries_within_stale_window(self) -> None:
+        self.save_expired("recent", "a", 60)
+        self.save_expired("old", "b", 7200)
+
+        self.assertEqual(self.storage.cleanup_expired_cache(grace_seconds=3600), 1)
+        self.assertIsNotNone(self.storage.get_cache(hash_query("recent", "ollama"), stale_seconds=3600))
+
+
+if __name__ == "__main__":
+    unittest.main()
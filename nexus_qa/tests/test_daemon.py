@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from nexus_qa import daemon
+
+
+class DaemonTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = Path(self.tmpdir.name) / "daemon.sock"
+        env = {"HOME": self.tmpdir.name, "NEXUS_DAEMON_SOCKET": str(self.socket_path)}
+        self.env = mock.patch.dict(os.environ, env)
+        self.env.start()
+        os.environ.pop("NEXUS_NO_DAEMON", None)
+
+    def tearDown(self) -> None:
+        self.env.stop()
+        self.tmpdir.cleanup()
+
+    def start_daemon(self) -> subprocess.Popen:
+        process = subprocess.Popen([sys.executable, "-m", "nexus_qa.daemon"],
+                                   stdout=subprocess.DEVNULL)
+        deadline = time.time() + 10
+        while daemon.control("ping") is None:
+            self.assertIsNone(process.poll(), "daemon exited")
+            self.assertLess(time.time(), deadline, "daemon did not start")
+            time.sleep(0.01)
+        return process
+
+    def test_falls_back_without_daemon(self) -> None:
+        self.assertIsNone(daemon.forward(["history"]))
+
+        self.socket_path.touch()
+        self.assertIsNone(daemon.forward(["history"]))
+        self.assertIsNone(daemon.forward(["workflow", "list"]))
+
+    def test_busy_daemon_is_reported_and_bypassed(self) -> None:
+        # A listening socket that never accepts looks like a daemon busy with another command
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(self.socket_path))
+            server.listen()
+
+            self.assertEqual(daemon.control("ping", timeout=0.1), {"busy": True})
+            with mock.patch.object(daemon, "READY_TIMEOUT", 0.1):
+                self.assertIsNone(daemon.forward(["history"]))
+
+        self.assertIsNone(daemon.control("ping", timeout=0.1))
+
+    def test_forwards_commands_to_daemon(self) -> None:
+        process = self.start_daemon()
+        try:
+            stdout = io.StringIO()
+            stderr = io.StringIO()
+            with mock.patch("sys.stdout", stdout), mock.patch("sys.stderr", stderr):
+                self.assertEqual(daemon.forward(["history"]), 0)
+                self.assertEqual(daemon.forward(["quick", "docker"]), 0)
+                self.assertEqual(daemon.forward(["history", "--bogus"]), 2)
+
+            self.assertIn("No history found", stdout.getvalue())
+            self.assertIn("No commands found matching 'docker'", stdout.getvalue())
+            self.assertIn("No such option", stderr.getvalue())
+            self.assertEqual(daemon.control("ping")["requests"], 3)
+            self.assertEqual(self.socket_path.stat().st_mode & 0o777, 0o600)
+
+            # Commands `nexus` would not forward are refused
+            with daemon._connect(5) as sock, sock.makefile("rb") as reader:
+                reader.readline()
+                sock.sendall(json.dumps({"argv": ["workflow", "run", "deploy"]}).encode("utf-8") + b"\n")
+                replies = [json.loads(line) for line in reader]
+            self.assertIn("not served by the daemon", replies[0]["err"])
+            self.assertEqual(replies[-1], {"exit": 2})
+            self.assertEqual(daemon.control("ping")["requests"], 3)
+
+            # While a client holds the daemon, forwarded commands run in-process
+            with daemon._connect() as busy, busy.makefile("rb") as reader:
+                reader.readline()
+                with mock.patch.object(daemon, "READY_TIMEOUT", 0.2):
+                    self.assertIsNone(daemon.forward(["history"]))
+            self.assertEqual(daemon.control("ping")["requests"], 3)
+        finally:
+            daemon.control("shutdown")
+            process.wait(10)
+
+        self.assertFalse(self.socket_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import json
+import subprocess
+import sys
+import unittest
+
+from click.testing import CliRunner
+
+from nexus_qa import main
+from nexus_qa.machine_output import MachineFormatter, resolve_output
+
+ANSWER = "Use this:\n$ docker ps\nLists running containers."
+
+
+class TTYStream(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+class MachineFormatterTests(unittest.TestCase):
+    def render(self, output: str, **fields):
+        stream, err = io.StringIO(), io.StringIO()
+        MachineFormatter(output, stream=stream, err=err).format_response(ANSWER, from_cache=True, **fields)
+        return stream.getvalue(), err.getvalue()
+
+    def test_json_record(self) -> None:
+        out, _ = self.render("json", command="ask", provider="ollama", latency_ms=12.5)
+
+        self.assertEqual(json.loads(out), {
+            "command": "ask",
+            "provider": "ollama",
+            "latency_ms": 12.5,
+            "cached": True,
+            "commands": ["docker ps"],
+            "explanation": "Use this:\nLists running containers.",
+        })
+
+    def test_ndjson_is_one_line_per_record(self) -> None:
+        stream = io.StringIO()
+        formatter = MachineFormatter("ndjson", stream=stream)
+        formatter.format_records([formatter.record(ANSWER, query="a"), {"query": "b", "error": "timeout"}])
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["commands"], ["docker ps"])
+        self.assertEqual(json.loads(lines[1])["error"], "timeout")
+
+    def test_plain_keeps_metadata_off_stdout(self) -> None:
+        out, err = self.render("plain", provider="ollama")
+
+        self.assertEqual(out, "docker ps\n\nUse this:\nLists running containers.\n")
+        self.assertEqual(err, "# provider=ollama cached=True\n")
+
+    def test_auto_selects_rich_only_on_a_terminal(self) -> None:
+        self.assertEqual(resolve_output(None, TTYStream()), "rich")
+        self.assertEqual(resolve_output(None, io.StringIO()), "plain")
+        self.assertEqual(resolve_output("json", TTYStream()), "json")
+
+    def test_machine_output_does_not_import_rich(self) -> None:
+        code = (
+            "import sys\n"
+            "from unittest import mock\n"
+            "from nexus_qa import main\n"
+            "cache = mock.Mock()\n"
+            f"cache.lookup.return_value = mock.Mock(response={ANSWER!r}, stale=False)\n"
+            "config = mock.Mock(ai_provider='ollama', providers={'ollama': object()})\n"
+            "main._warm_runtime = (config, mock.Mock(), cache, mock.Mock())\n"
+            "with mock.patch('nexus_qa.ai_client.create_client'):\n"
+            "    main.cli.main(['ask', '--output', 'ndjson', 'list', 'containers'], standalone_mode=False)\n"
+            "print('rich' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        record, rich_loaded = result.stdout.splitlines()
+        self.assertEqual(json.loads(record)["query"], "list containers")
+        self.assertEqual(json.loads(record)["commands"], ["docker ps"])
+        self.assertEqual(rich_loaded, "False")
+
+    def test_ask_without_question_is_a_usage_error(self) -> None:
+        result = CliRunner().invoke(main.cli, ["ask", "--output", "json"])
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("Question is required", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import json
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from nexus_qa.ai_client import OllamaClient
+from nexus_qa.cache import Cache
+from nexus_qa.cache_keys import hash_query
+from nexus_qa.machine_output import MachineFormatter
+from nexus_qa.models import CacheConfig, ProviderConfig
+from nexus_qa.pipeline import AskPipeline, build_prompt
+from nexus_qa.storage import Storage
+
+
+class AskPipelineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self.tmpdir.name) / "test.db")
+        self.client = OllamaClient(ProviderConfig(model="llama3.2"), session=mock.Mock())
+        self.out = io.StringIO()
+
+    def tearDown(self) -> None:
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def pipeline(self, config: CacheConfig = None, background_refresh: bool = False) -> AskPipeline:
+        # A fresh Cache has an empty memory tier, like a new `nexus` process
+        formatter = MachineFormatter("ndjson", stream=self.out, err=io.StringIO())
+        cache = Cache(self.storage, config or CacheConfig())
+        return AskPipeline(self.client, cache, self.storage, "ollama", formatter, background_refresh)
+
+    def count_statements(self) -> list:
+        statements = []
+        self.storage._get_connection().set_trace_callback(statements.append)
+        return statements
+
+    def test_cached_hit_is_one_db_round_trip(self) -> None:
+        with mock.patch.object(self.client, "complete", return_value="$ docker ps") as complete:
+            first = self.pipeline().run("debug", "port is already allocated")
+        self.assertFalse(first.from_cache)
+        complete.assert_called_once_with(build_prompt("debug", "port is already allocated"))
+
+        pipeline = self.pipeline()
+        statements = self.count_statements()
+        with mock.patch.object(self.client, "complete") as complete, \
+                mock.patch.object(self.client, "check_rate_limit") as rate_limit:
+            answer = pipeline.run("debug", "port is already allocated")
+            complete.assert_not_called()
+            rate_limit.assert_not_called()
+
+        self.assertTrue(answer.from_cache)
+        self.assertEqual(answer.response, "$ docker ps")
+        self.assertEqual(len(statements), 1, statements)
+        self.assertTrue(statements[0].lstrip().upper().startswith("SELECT"))
+        self.assertEqual(pipeline.counts["cache_lookup"], 1)
+        self.assertEqual(pipeline.counts["provider"], 0)
+        self.assertEqual(pipeline.counts["history"], 0)
+
+    def test_miss_runs_every_stage_once(self) -> None:
+        pipeline = self.pipeline()
+        with mock.patch.object(self.storage, "get_cache", wraps=self.storage.get_cache) as get_cache, \
+                mock.patch.object(self.client, "complete", return_value="Use `git status -s`."):
+            pipeline.run("ask", "short git status")
+            get_cache.assert_called_once()
+
+        self.assertEqual(pipeline.counts, {stage: 1 for stage in pipeline.counts})
+        self.assertEqual(set(pipeline.timings_ms()), set(pipeline.counts))
+        self.assertEqual(self.storage.get_history(1)[0].query, "short git status")
+
+        record = json.loads(self.out.getvalue())
+        self.assertEqual(record["provider"], "ollama")
+        self.assertEqual(record["commands"], ["git status -s"])
+        self.assertIn("provider", record["timings_ms"])
+
+    def test_client_and_pipeline_share_cache_entries(self) -> None:
+        cache = Cache(self.storage, CacheConfig())
+        with mock.patch.object(self.client, "complete", return_value="answer"):
+            self.pipeline().run("ask", "how to list volumes")
+
+        client = OllamaClient(ProviderConfig(model="llama3.2"), cache=cache, session=mock.Mock())
+        with mock.patch.object(client, "complete") as complete:
+            self.assertEqual(client.ask("how to list volumes"), "answer")
+            complete.assert_not_called()
+
+    def save_expired(self, key: str, response: str) -> None:
+        expired = datetime.now() - timedelta(seconds=60)
+        self.storage.save_cache(hash_query(key, "ollama"), key, response, "ollama", expired)
+
+    def test_stale_answer_is_served_then_refreshed(self) -> None:
+        self.save_expired("explain:ls -la", "old answer")
+
+        pipeline = self.pipeline(CacheConfig(stale_while_revalidate=True), background_refresh=True)
+        with mock.patch.object(self.client, "complete", return_value="new answer") as complete:
+            answer = pipeline.run("explain", "ls -la")
+            for thread in pipeline.refreshes:
+                thread.join()
+            complete.assert_called_once_with(build_prompt("explain", "ls -la"))
+
+        self.assertTrue(answer.from_cache)
+        self.assertTrue(answer.stale)
+        self.assertEqual(answer.response, "old answer")
+        self.assertTrue(json.loads(self.out.getvalue())["stale"])
+        self.assertEqual(pipeline.cache.get_stats()["stale_serves"], 1)
+        self.assertEqual(Cache(self.storage, CacheConfig()).get("explain:ls -la", "ollama"), "new answer")
+
+        # The refresh is not part of the request's stage timings
+        self.assertEqual(pipeline.counts["provider"], 0)
+        self.assertEqual(pipeline.counts["cache_write"], 0)
+
+    def test_one_shot_process_fetches_expired_answers(self) -> None:
+        self.save_expired("explain:ls -la", "old answer")
+
+        pipeline = self.pipeline(CacheConfig(stale_while_revalidate=True))
+        with mock.patch.object(self.client, "complete", return_value="new answer"):
+            answer = pipeline.run("explain", "ls -la")
+
+        self.assertFalse(answer.from_cache)
+        self.assertEqual(answer.response, "new answer")
+        self.assertEqual(pipeline.refreshes, [])
+        self.assertEqual(pipeline.cache.get_stats()["stale_serves"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
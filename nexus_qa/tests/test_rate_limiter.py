@@ -0,0 +1,124 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from nexus_qa.ai_client import OllamaClient
+from nexus_qa.async_client import AsyncOllamaClient
+from nexus_qa.models import ProviderConfig, RateLimitingConfig
+from nexus_qa.rate_limiter import AsyncRateLimiter, RateLimiter
+from nexus_qa.storage import Storage
+
+
+class PersistentRateLimiterTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "test.db"
+        self.config = RateLimitingConfig(requests_per_minute=5, requests_per_hour=100)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_limit_is_shared_between_limiter_instances(self) -> None:
+        first = RateLimiter(self.config, Storage(self.db_path))
+        second = RateLimiter(self.config, Storage(self.db_path))
+
+        for _ in range(3):
+            self.assertTrue(first.is_allowed("ollama")[0])
+        for _ in range(2):
+            self.assertTrue(second.is_allowed("ollama")[0])
+
+        allowed, error = second.is_allowed("ollama")
+        self.assertFalse(allowed)
+        self.assertIn("Rate limit exceeded", error)
+        self.assertTrue(second.is_allowed("openai")[0])
+
+    def test_concurrent_checks_never_overspend(self) -> None:
+        allowed = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            limiter = RateLimiter(self.config, Storage(self.db_path))
+            for _ in range(4):
+                ok, _ = limiter.is_allowed("ollama")
+                with lock:
+                    allowed.append(ok)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(allowed), 5)
+
+    def test_tokens_refill_over_time(self) -> None:
+        limiter = RateLimiter(self.config, Storage(self.db_path))
+
+        with mock.patch("nexus_qa.rate_limiter.time.time", return_value=1000.0):
+            for _ in range(5):
+                limiter.is_allowed("ollama")
+            self.assertFalse(limiter.is_allowed("ollama")[0])
+
+        # One token refills every 12 seconds at 5 requests per minute
+        with mock.patch("nexus_qa.rate_limiter.time.time", return_value=1012.5):
+            self.assertTrue(limiter.is_allowed("ollama")[0])
+            self.assertFalse(limiter.is_allowed("ollama")[0])
+
+    def test_in_memory_limiter_without_storage(self) -> None:
+        limiter = RateLimiter(self.config)
+
+        results = [limiter.is_allowed("ollama")[0] for _ in range(6)]
+
+        self.assertEqual(results, [True] * 5 + [False])
+        self.assertEqual(limiter.get_status("ollama")["minute_tokens"], 0)
+
+
+class AsyncRateLimiterTests(unittest.TestCase):
+    def test_blocked_check_does_not_stall_event_loop(self) -> None:
+        limiter = RateLimiter(RateLimitingConfig())
+
+        def slow_is_allowed(provider):
+            # Stands in for BEGIN IMMEDIATE waiting on another process's lock
+            time.sleep(0.2)
+            return True, None
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            result = await AsyncRateLimiter(limiter).is_allowed("ollama")
+            task.cancel()
+            return result, ticks
+
+        with mock.patch.object(limiter, "is_allowed", side_effect=slow_is_allowed):
+            result, ticks = asyncio.run(run())
+
+        self.assertEqual(result, (True, None))
+        self.assertGreater(ticks, 5)
+
+
+class ClientBucketTests(unittest.TestCase):
+    def test_sync_and_async_clients_share_the_provider_bucket(self) -> None:
+        limiter = RateLimiter(RateLimitingConfig(requests_per_minute=2, requests_per_hour=100))
+        config = ProviderConfig(model="llama3.2")
+
+        self.assertTrue(OllamaClient(config, limiter)._check_rate_limit()[0])
+        async_client = AsyncOllamaClient(config, AsyncRateLimiter(limiter))
+        self.assertTrue(asyncio.run(async_client._check_rate_limit())[0])
+
+        self.assertFalse(limiter.is_allowed("ollama")[0])
+        self.assertTrue(limiter.is_allowed("openai")[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
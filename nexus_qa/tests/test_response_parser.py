@@ -0,0 +1,105 @@
+import unittest
+
+from nexus_qa.formatter import Formatter
+from nexus_qa.response_parser import parse_response
+
+# Outputs pinned from the original per-line Formatter parser, which the
+# single-pass parser must reproduce exactly.
+CASES = {
+    "code_block_and_list": (
+        "# Restart a container\n"
+        "\n"
+        "```bash\n"
+        "docker restart web\n"
+        "docker logs -f web\n"
+        "```\n"
+        "\n"
+        "1. `docker ps` - list running containers\n"
+        "2. `docker ps:` shows the same\n"
+        "- `echo hi` is not a known command\n"
+        "\n"
+        "\n"
+        "\n"
+        "The restart keeps volumes.",
+        ['docker restart web\ndocker logs -f web', 'docker ps'],
+        '# Restart a container\n1. `docker ps` - list running containers\n2. `docker ps:` shows the same\n'
+        '- `echo hi` is not a known command\nThe restart keeps volumes.',
+        '**Restart a container**\n```bash\ndocker restart web\ndocker logs -f web\n```\n'
+        '1. `docker ps` - list running containers\n2. `docker ps:` shows the same\n'
+        '- `echo hi` is not a known command',
+    ),
+    "prompts_and_inline": (
+        "Run these:\n"
+        "$ sudo apt update\n"
+        "$ \n"
+        "sudo systemctl restart nginx\n"
+        "git status - check the tree\n"
+        "Use `git log --oneline` or `kubectl get pods -A` to inspect, not `ls`.\n"
+        "* chmod 755: make it executable\n"
+        "- find files: with find . -name x\n"
+        "1.5 GB is plenty",
+        ['sudo apt update', 'git log --oneline', 'kubectl get pods -A', 'chmod 755', 'find files'],
+        'Run these:\n$ \ngit status - check the tree\n'
+        'Use `git log --oneline` or `kubectl get pods -A` to inspect, not `ls`.\n'
+        '* chmod 755: make it executable\n- find files: with find . -name x\n1.5 GB is plenty',
+        '$ sudo apt update\n$ \nsudo systemctl restart nginx\ngit status - check the tree\n'
+        'Use `git log --oneline` or `kubectl get pods -A` to inspect, not `ls`.\n'
+        '* chmod 755: make it executable\n- find files: with find . -name x\n1.5 GB is plenty',
+    ),
+    "plain_text": (
+        "Containers share the host kernel.\nVirtual machines do not.",
+        [],
+        'Containers share the host kernel.\nVirtual machines do not.',
+        'Containers share the host kernel. \nVirtual machines do not. .',
+    ),
+    "empty_fences": (
+        "```\n```",
+        [],
+        '```\n```',
+        '```\n```.',
+    ),
+    "unterminated_block": (
+        "Try this:\n```\ncurl -I example.com\n",
+        [],
+        'Try this:',
+        '```\ncurl -I example.com\n',
+    ),
+    "tools_substring": (
+        "- `build tools` matter\n- `python3 -m venv .venv`: create a venv",
+        ['build tools', 'python3 -m venv .venv'],
+        '- `build tools` matter\n- `python3 -m venv .venv`: create a venv',
+        '- `build tools` matter\n- `python3 -m venv . venv`: create a venv.',
+    ),
+    "fallback_collapses_blank_lines": (
+        "sudo reboot\n\n \n\t\ncd /tmp\n",
+        [],
+        'sudo reboot\n\ncd /tmp',
+        'sudo reboot\n\n \n\t\ncd /tmp\n.',
+    ),
+}
+
+
+class ResponseParserTests(unittest.TestCase):
+    def test_matches_original_parser(self) -> None:
+        for name, (response, commands, explanation, brief) in CASES.items():
+            with self.subTest(name):
+                parsed = parse_response(response)
+                self.assertEqual(parsed.commands, commands)
+                self.assertEqual(parsed.explanation, explanation)
+                self.assertEqual(parsed.brief, brief)
+
+    def test_formatter_uses_parser(self) -> None:
+        response, commands, explanation, brief = CASES["code_block_and_list"]
+        formatter = Formatter()
+
+        self.assertEqual(formatter._parse_response(response), (commands, explanation))
+        self.assertEqual(formatter._extract_brief(response), brief)
+
+    def test_commands_are_deduplicated_in_order(self) -> None:
+        parsed = parse_response("$ docker ps\n1. `git status` - tree\n$ docker ps\n$ git status")
+
+        self.assertEqual(parsed.commands, ["docker ps", "git status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
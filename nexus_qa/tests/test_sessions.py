@@ -0,0 +1,52 @@
+import unittest
+
+from nexus_qa.ai_client import create_client
+from nexus_qa.models import HttpConfig, ProviderConfig
+from nexus_qa.sessions import close_sessions, get_session
+
+
+class SessionRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        close_sessions()
+
+    def tearDown(self) -> None:
+        close_sessions()
+
+    def test_same_provider_reuses_one_session(self) -> None:
+        session = get_session("ollama")
+
+        self.assertIs(get_session("ollama"), session)
+        self.assertIs(get_session("Ollama"), session)
+        config = ProviderConfig(model="llama3.2")
+        self.assertIs(create_client("ollama", config).session, session)
+        self.assertIs(create_client("ollama", config).session, session)
+
+    def test_providers_get_separate_sessions(self) -> None:
+        ollama = get_session("ollama")
+        openai = get_session("openai")
+
+        self.assertIsNot(ollama, openai)
+        self.assertIs(create_client("openai", ProviderConfig(model="gpt-4o-mini")).session, openai)
+
+        # Closing drops the registry; the next request builds a new session
+        close_sessions()
+        self.assertIsNot(get_session("ollama"), ollama)
+
+    def test_pool_sizes_come_from_http_config(self) -> None:
+        config = HttpConfig(pool_connections=2, pool_maxsize=7, pool_block=True, max_retries=3)
+
+        session = get_session("anthropic", config)
+
+        for prefix in ("http://", "https://"):
+            adapter = session.get_adapter(prefix + "api.example.com")
+            self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 7)
+            self.assertTrue(adapter.poolmanager.connection_pool_kw["block"])
+            self.assertEqual(adapter.poolmanager.pools._maxsize, 2)
+            self.assertEqual(adapter.max_retries.total, 3)
+
+        # The config only applies when the session is created
+        self.assertIs(get_session("anthropic", HttpConfig(pool_maxsize=1)), session)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from nexus_qa import ai_client
+from nexus_qa.ai_client import OllamaClient
+from nexus_qa.models import ProviderConfig
+from nexus_qa.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def run_concurrently(function, count):
+    barrier = threading.Barrier(count)
+    results, errors = [], []
+
+    def worker():
+        barrier.wait()
+        try:
+            results.append(function())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_callers_share_one_call(self) -> None:
+        group = SingleFlight()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return "answer"
+
+        results, errors = run_concurrently(lambda: group.do("key", slow), 5)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True, True])
+        self.assertEqual(group.coalesced, 4)
+
+    def test_followers_get_the_leaders_error_and_later_calls_run_again(self) -> None:
+        group = SingleFlight()
+
+        def failing():
+            time.sleep(0.1)
+            raise RuntimeError("provider down")
+
+        results, errors = run_concurrently(lambda: group.do("key", failing), 3)
+
+        self.assertEqual(results, [])
+        self.assertEqual([str(e) for e in errors], ["provider down"] * 3)
+        self.assertEqual(group.do("key", lambda: "ok"), ("ok", False))
+
+
+class AsyncSingleFlightTests(unittest.TestCase):
+    def test_cancelled_leader_hands_over_to_a_follower(self) -> None:
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "answer"
+
+        async def scenario():
+            leader = asyncio.create_task(group.do("key", slow))
+            await asyncio.sleep(0)
+            followers = [asyncio.create_task(group.do("key", slow)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*followers)
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return results
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(sorted(results), [("answer", False), ("answer", True), ("answer", True)])
+        self.assertEqual(group.coalesced, 2)
+
+
+class FakeCache:
+    def __init__(self):
+        self.saved = {}
+        self.writes = 0
+
+    def get(self, query, provider=None):
+        return self.saved.get((query, provider))
+
+    def set(self, query, response, provider=None):
+        self.writes += 1
+        self.saved[(query, provider)] = response
+
+
+class ClientCoalescingTests(unittest.TestCase):
+    def test_identical_asks_share_one_provider_call_and_cache_write(self) -> None:
+        cache = FakeCache()
+        client = OllamaClient(ProviderConfig(model="llama3.2"), cache=cache, session=mock.Mock())
+        before = ai_client.coalesced_requests()
+
+        def slow_complete(question):
+            time.sleep(0.1)
+            return f"answer: {question}"
+
+        with mock.patch.object(client, "complete", side_effect=slow_complete) as complete:
+            results, errors = run_concurrently(lambda: client.ask("docker ps?"), 4)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, ["answer: docker ps?"] * 4)
+        complete.assert_called_once_with("docker ps?")
+        self.assertEqual(cache.writes, 1)
+        self.assertEqual(ai_client.coalesced_requests() - before, 3)
+
+    def test_different_models_are_not_coalesced(self) -> None:
+        small = OllamaClient(ProviderConfig(model="llama3.2:1b"), session=mock.Mock())
+        large = OllamaClient(ProviderConfig(model="llama3.2"), session=mock.Mock())
+
+        def slow_complete(question):
+            time.sleep(0.1)
+            return "answer"
+
+        with mock.patch.object(small, "complete", side_effect=slow_complete) as small_complete, \
+                mock.patch.object(large, "complete", side_effect=slow_complete) as large_complete:
+            barrier = threading.Barrier(2)
+            threads = [threading.Thread(target=lambda c=c: (barrier.wait(), c.ask("q"))) for c in (small, large)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        small_complete.assert_called_once()
+        large_complete.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ["requests", "rich", "yaml", "pydantic", "nexus_qa.storage", "nexus_qa.workflows.engine"]
+
+
+class StartupImportTests(unittest.TestCase):
+    def test_main_defers_heavy_imports(self) -> None:
+        code = (
+            "import sys, nexus_qa.main\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_formatter_defers_markdown_rendering(self) -> None:
+        code = "import sys, nexus_qa.formatter\nprint('rich.markdown' in sys.modules, 'rich.syntax' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.strip(), "False False")
+
+
+if __name__ == "__main__":
+    unittest.main()
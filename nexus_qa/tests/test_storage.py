@@ -0,0 +1,201 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+from nexus_qa.cache_keys import hash_query
+from nexus_qa.storage import Storage
+
+
+class SharedConnectionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self.tmpdir.name) / "test.db")
+
+    def tearDown(self) -> None:
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def history_count(self) -> int:
+        with self.storage._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def test_threads_share_one_connection(self) -> None:
+        connections = set()
+        errors = []
+
+        def worker(n: int) -> None:
+            try:
+                for i in range(50):
+                    self.storage.save_history(f"question {n}-{i}", "answer")
+                    connections.add(id(self.storage._get_connection()))
+                    self.storage.get_history(5)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(connections), 1)
+        self.assertEqual(self.history_count(), 400)
+
+    def test_failed_operation_is_rolled_back(self) -> None:
+        with self.assertRaises(ValueError):
+            with self.storage._connection() as conn:
+                conn.execute("INSERT INTO history (query) VALUES ('lost')")
+                raise ValueError("boom")
+
+        self.assertEqual(self.history_count(), 0)
+        self.storage.save_history("kept")
+        self.assertEqual(self.history_count(), 1)
+
+    def test_reopens_connection_after_fork(self) -> None:
+        parent = self.storage._get_connection()
+        self.assertIs(self.storage._get_connection(), parent)
+
+        with mock.patch("nexus_qa.storage.os.getpid", return_value=os.getpid() + 1):
+            child = self.storage._get_connection()
+            self.assertIsNot(child, parent)
+            self.assertEqual(child.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.storage.save_history("from child")
+
+        # The parent's connection was left open, not closed from the "child"
+        self.assertEqual(parent.execute("SELECT COUNT(*) FROM history").fetchone()[0], 1)
+        child.close()
+        parent.close()
+
+
+class CacheExpiryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "test.db"
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_migrates_iso_expiry_to_epoch(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query_hash TEXT UNIQUE NOT NULL,
+                query_text TEXT NOT NULL,
+                response TEXT NOT NULL,
+                provider TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at TIMESTAMP NOT NULL
+            )
+        """)
+        live = datetime.now() + timedelta(hours=1)
+        conn.executemany(
+            "INSERT INTO cache (query_hash, query_text, response, expires_at) VALUES (?, ?, ?, ?)",
+            [
+                ("live", "q1", "r1", live.isoformat()),
+                ("stale", "q2", "r2", (datetime.now() - timedelta(hours=1)).isoformat()),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        storage = Storage(self.db_path)
+
+        # v3 rekeys rows by their normalized question
+        entry = storage.get_cache(hash_query("q1"))
+        self.assertEqual(entry.response, "r1")
+        self.assertAlmostEqual(entry.expires_at.timestamp(), live.timestamp(), delta=1)
+        self.assertIsNone(storage.get_cache(hash_query("q2")))
+        with storage._connection() as conn:
+            types = {row[0] for row in conn.execute("SELECT typeof(expires_at) FROM cache")}
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        self.assertEqual(types, {"integer"})
+        self.assertEqual(version, Storage.SCHEMA_VERSION)
+
+    def test_rekeys_cache_by_normalized_question(self) -> None:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE cache (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                query_hash TEXT UNIQUE NOT NULL,
+                query_text TEXT NOT NULL,
+                response TEXT NOT NULL,
+                provider TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at INTEGER NOT NULL
+            )
+        """)
+        expires = int((datetime.now() + timedelta(hours=1)).timestamp())
+        conn.executemany(
+            "INSERT INTO cache (query_hash, query_text, response, provider, expires_at) VALUES (?, ?, ?, ?, ?)",
+            [
+                ("h1", "How to check Docker status?", "old", "ollama", expires),
+                ("h2", "how to check docker status", "new", "ollama", expires),
+                ("h3", "check:ls -L", "check", "ollama", expires),
+            ],
+        )
+        conn.execute("PRAGMA user_version = 2")
+        conn.commit()
+        conn.close()
+
+        storage = Storage(self.db_path)
+
+        self.assertEqual(storage.get_cache_count(), 2)
+        self.assertEqual(storage.get_cache(hash_query("check docker status!", "ollama")).response, "new")
+        self.assertEqual(storage.get_cache(hash_query("check:ls  -L", "ollama")).response, "check")
+        self.assertIsNone(storage.get_cache(hash_query("check:ls -l", "ollama")))
+        self.assertEqual(len(storage.get_cache_signatures("ollama")), 1)
+
+    def test_cleanup_and_trim(self) -> None:
+        storage = Storage(self.db_path)
+        now = datetime.now()
+        for i in range(5):
+            storage.save_cache(f"expired-{i}", "q", "r", None, now - timedelta(seconds=10))
+        for i in range(5):
+            storage.save_cache(f"live-{i}", "q", "r", None, now + timedelta(hours=1))
+
+        self.assertEqual(storage.cleanup_expired_cache(), 5)
+        self.assertEqual(storage.trim_cache(3), 2)
+
+        self.assertEqual(storage.get_cache_count(), 3)
+        self.assertIsNone(storage.get_cache("live-0"))
+        self.assertIsNotNone(storage.get_cache("live-4"))
+        self.assertEqual(storage.trim_cache(3), 0)
+
+
+class CommandSearchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = Storage(Path(self.tmpdir.name) / "test.db")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_prefix_search_ranks_command_matches_first(self) -> None:
+        self.storage.save_command("systemctl status nginx", "services", "uses docker host")
+        docker_id = self.storage.save_command("docker system prune -a", "docker", "free disk space")
+        self.storage.save_command("df -h", "disk", None)
+
+        results = self.storage.search_commands("dock")
+
+        self.assertTrue(self.storage.has_fts)
+        self.assertEqual([c.id for c in results][0], docker_id)
+        self.assertEqual(len(results), 2)
+        self.assertEqual([c.command for c in self.storage.search_commands("dock prune")],
+                         ["docker system prune -a"])
+
+    def test_index_follows_deletes(self) -> None:
+        command_id = self.storage.save_command("kubectl get pods", "k8s")
+        self.storage.delete_command(command_id)
+
+        self.assertEqual(self.storage.search_commands("kubectl"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
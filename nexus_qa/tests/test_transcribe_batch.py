@@ -0,0 +1,207 @@
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from nexus_qa.audio import AudioCache
+from nexus_qa.tests.test_transcript_index import write_transcript
+from nexus_qa.transcriber import TranscriptionError, YouTubeTranscriber
+
+
+class ThreadWorkerPool(ThreadPoolExecutor):
+    """Runs the transcription stage on threads so a fake worker can be patched in."""
+
+    def __init__(self, max_workers, mp_context=None, initializer=None, initargs=()):
+        super().__init__(max_workers=max_workers)
+
+
+def fake_worker(audio_path: str, model_size: str, device):
+    if "broken" in audio_path:
+        raise RuntimeError("decoder failed")
+    time.sleep(0.01)
+    return {
+        'text': f"transcript of {Path(audio_path).stem}",
+        'segments': [{'start': 0.0, 'end': 10.0, 'text': "hello"}],
+        'audio_seconds': 10.0,
+        'timings': {'model_load': 0.0, 'inference': 0.01},
+    }
+
+
+class TranscribeBatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name) / "transcriptions"
+        self.audio_dir = Path(self.tmp.name) / "audio"
+        self.audio_dir.mkdir()
+        with mock.patch.object(YouTubeTranscriber, "_check_dependencies"):
+            self.transcriber = YouTubeTranscriber(output_dir=self.dir)
+        for patch in (
+            mock.patch("nexus_qa.transcriber.whisper_version", return_value="20231117"),
+            mock.patch("nexus_qa.transcriber.ProcessPoolExecutor", ThreadWorkerPool),
+            mock.patch("nexus_qa.transcriber._transcribe_worker", fake_worker),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.lock = threading.Lock()
+        self.active = set()
+        self.max_active = 0
+
+    def tearDown(self) -> None:
+        self.transcriber.index.close()
+        self.tmp.cleanup()
+
+    def fake_prepare(self, source: str):
+        """Write a temp audio file for a URL; local files are used in place."""
+        with self.lock:
+            self.active.add(source)
+            self.max_active = max(self.max_active, len(self.active))
+        if "unreachable" in source:
+            raise TranscriptionError("Failed to get video info: HTTP 404")
+        if not source.startswith("https://"):
+            return Path(source), {'id': Path(source).stem, 'title': Path(source).name, 'duration': None}, False
+        video_id = source.rsplit("=", 1)[-1]
+        audio_path = self.audio_dir / f"{video_id}.m4a"
+        audio_path.write_bytes(b"audio")
+        return audio_path, {'id': video_id, 'title': video_id, 'duration': None}, True
+
+    def run_batch(self, sources, **kwargs):
+        results = []
+
+        def on_result(result):
+            with self.lock:
+                self.active.discard(result['source'])
+            results.append(result)
+
+        with mock.patch.object(self.transcriber, "prepare_source", side_effect=self.fake_prepare) as prepare:
+            totals = self.transcriber.transcribe_batch(sources, on_result=on_result, **kwargs)
+        return totals, results, prepare
+
+    def test_pipeline_limits_in_flight_and_removes_temp_audio(self) -> None:
+        sources = [f"https://www.youtube.com/watch?v=video{i}" for i in range(8)]
+
+        totals, results, _ = self.run_batch(sources, workers=1, downloads=2)
+
+        self.assertLessEqual(self.max_active, 3)
+        self.assertEqual(totals['files'], 8)
+        self.assertEqual(totals['failed'], 0)
+        self.assertEqual(totals['audio_seconds'], 80.0)
+        self.assertGreater(totals['wall_seconds'], 0)
+        self.assertEqual(sorted(r['source'] for r in results), sorted(sources))
+        self.assertTrue(all(r['path'].exists() for r in results))
+        self.assertEqual(list(self.audio_dir.iterdir()), [])
+
+    def test_errors_cached_and_local_sources(self) -> None:
+        cached = write_transcript(self.dir, "dQw4w9WgXcQ_1.txt", "dQw4w9WgXcQ", "Talk")
+        self.transcriber.index.record(cached)
+        local = self.audio_dir / "lecture.wav"
+        local.write_bytes(b"audio")
+        sources = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=unreachable",
+            "https://www.youtube.com/watch?v=broken",
+            str(local),
+        ]
+
+        totals, results, prepare = self.run_batch(sources)
+
+        by_source = {r['source']: r for r in results}
+        self.assertTrue(by_source[sources[0]]['cached'])
+        self.assertEqual(by_source[sources[0]]['path'], cached)
+        self.assertNotIn(mock.call(sources[0]), prepare.call_args_list)
+        self.assertIn("HTTP 404", by_source[sources[1]]['error'])
+        self.assertEqual(by_source[sources[2]]['error'], "decoder failed")
+        self.assertIsNone(by_source[str(local)]['error'])
+        self.assertEqual(totals, dict(totals, files=1, cached=1, failed=2, audio_seconds=10.0))
+
+        # The failed transcription's temp audio is removed; the local file is not
+        self.assertFalse((self.audio_dir / "broken.m4a").exists())
+        self.assertTrue(local.exists())
+
+        # --force transcribes cached sources again
+        totals, _, prepare = self.run_batch(sources[:1], force=True)
+        prepare.assert_called_once_with(sources[0])
+        self.assertEqual(totals['files'], 1)
+
+
+class BatchSourceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        with mock.patch.object(YouTubeTranscriber, "_check_dependencies"):
+            self.transcriber = YouTubeTranscriber(output_dir=self.dir / "transcriptions")
+
+    def tearDown(self) -> None:
+        self.transcriber.index.close()
+        self.tmp.cleanup()
+
+    def test_expand_sources_expands_playlists_only(self) -> None:
+        ydl = mock.MagicMock()
+        ydl.__enter__.return_value.extract_info.return_value = {'entries': [{'id': "a1"}, {'id': None}, {'id': "b2"}]}
+        yt_dlp = mock.Mock(YoutubeDL=mock.Mock(return_value=ydl))
+
+        with mock.patch.dict(sys.modules, {"yt_dlp": yt_dlp}):
+            expanded = self.transcriber.expand_sources([
+                "https://www.youtube.com/playlist?list=PL123",
+                "https://youtu.be/dQw4w9WgXcQ",
+                "talk.mp3",
+            ])
+
+        self.assertEqual(expanded, [
+            "https://www.youtube.com/watch?v=a1",
+            "https://www.youtube.com/watch?v=b2",
+            "https://youtu.be/dQw4w9WgXcQ",
+            "talk.mp3",
+        ])
+
+        ydl.__enter__.return_value.extract_info.side_effect = RuntimeError("private playlist")
+        with mock.patch.dict(sys.modules, {"yt_dlp": yt_dlp}):
+            with self.assertRaises(TranscriptionError):
+                self.transcriber.expand_sources(["https://www.youtube.com/playlist?list=PL123"])
+
+    def test_prepare_source(self) -> None:
+        local = self.dir / "talk.mp3"
+        local.write_bytes(b"audio")
+        self.assertEqual(self.transcriber.prepare_source(str(local)),
+                         (local, {'id': "talk", 'title': "talk.mp3", 'duration': None,
+                                  'uploader': None, 'upload_date': None}, False))
+
+        url = "https://youtu.be/dQw4w9WgXcQ"
+        with mock.patch.object(self.transcriber, "get_video_info", return_value={'id': "dQw4w9WgXcQ"}), \
+                mock.patch.object(self.transcriber, "download_audio", return_value=self.dir / "a.m4a") as download:
+            self.assertEqual(self.transcriber.prepare_source(url)[2], True)
+            self.transcriber.audio_cache = mock.Mock()
+            self.assertEqual(self.transcriber.prepare_source(url)[2], False)
+        download.assert_called_with(url, "dQw4w9WgXcQ")
+
+    def test_audio_waiting_for_transcription_is_not_evicted(self) -> None:
+        cache = AudioCache(self.dir / "audio", max_bytes=150)
+        self.transcriber.audio_cache = cache
+
+        def fake_ydl(options):
+            def extract_info(url, download):
+                path = Path(options['outtmpl'].replace("%(ext)s", "m4a"))
+                path.write_bytes(b"x" * 100)
+                return {'path': path}
+
+            ydl = mock.MagicMock()
+            ydl.__enter__.return_value.extract_info.side_effect = extract_info
+            ydl.__enter__.return_value.prepare_filename.side_effect = lambda info: str(info['path'])
+            return ydl
+
+        with mock.patch.dict(sys.modules, {"yt_dlp": mock.Mock(YoutubeDL=fake_ydl)}):
+            queued = self.transcriber.download_audio("https://youtu.be/first", "first")
+            self.transcriber.download_audio("https://youtu.be/second", "second")
+            self.assertTrue(queued.exists())
+
+            self.transcriber.release_audio(queued)
+            self.transcriber.download_audio("https://youtu.be/third", "third")
+            self.assertFalse(queued.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
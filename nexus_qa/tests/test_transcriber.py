@@ -0,0 +1,42 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from nexus_qa import transcriber
+from nexus_qa.transcriber import YouTubeTranscriber
+
+
+class RecordingModel:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        self.calls.append(options)
+        return {'text': " hello", 'segments': [{'start': 0.0, 'end': 1.0, 'text': " hello"}]}
+
+
+class DecodeOptionsTests(unittest.TestCase):
+    def test_every_path_decodes_with_the_same_options(self) -> None:
+        model = RecordingModel()
+        audio = np.zeros(16000, dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(YouTubeTranscriber, "_check_dependencies"), \
+                mock.patch("nexus_qa.transcriber.get_model", return_value=(model, 0.0)), \
+                mock.patch("nexus_qa.audio.load_audio", return_value=audio):
+            single = YouTubeTranscriber(output_dir=Path(tmp))
+            single.transcribe_audio(Path(tmp) / "a.m4a", device="cpu")
+            single.index.close()
+            transcriber._transcribe_worker("a.m4a", "base", "cpu")
+            transcriber._transcribe_chunk_worker(audio, 0.0, "base", "cpu")
+
+        self.assertEqual(len(model.calls), 3)
+        self.assertTrue(all(call == model.calls[0] for call in model.calls))
+        self.assertEqual(model.calls[0]['temperature'], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from nexus_qa import transcript_index
+from nexus_qa.transcriber import TranscriptionError, YouTubeTranscriber
+from nexus_qa.transcript_index import TranscriptIndex
+
+
+def write_transcript(directory: Path, name: str, video_id: str, title: str, text: str = "hello",
+                     model: str = "base", whisper: str = "20231117") -> Path:
+    path = directory / name
+    path.write_text(
+        "=" * 80 + "\n"
+        "YOUTUBE VIDEO TRANSCRIPTION\n"
+        + "=" * 80 + "\n"
+        f"Video ID:     {video_id}\n"
+        f"Title:        {title}\n"
+        "Uploader:     someone\n"
+        "Upload Date:  20240101\n"
+        "Duration:     42 seconds\n"
+        f"Model:        {model}\n"
+        f"Whisper:      {whisper}\n"
+        "Transcribed:  2024-01-01 00:00:00\n"
+        + "=" * 80 + "\n\n" + text,
+        encoding="utf-8",
+    )
+    return path
+
+
+class TranscriptIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.index = TranscriptIndex(self.dir)
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_lists_header_metadata_newest_first(self) -> None:
+        write_transcript(self.dir, "aaa_20240101_000000.txt", "aaa", "First")
+        write_transcript(self.dir, "bbb_20240102_000000.txt", "bbb", "Second: part 2")
+
+        entries = self.index.list()
+
+        self.assertEqual([e["file"] for e in entries], ["bbb_20240102_000000.txt", "aaa_20240101_000000.txt"])
+        self.assertEqual(entries[0]["title"], "Second: part 2")
+        self.assertEqual(entries[0]["video_id"], "bbb")
+        self.assertEqual(entries[0]["duration"], "42 seconds")
+        self.assertEqual(entries[0]["size"], (self.dir / entries[0]["file"]).stat().st_size)
+
+    def test_sync_only_reads_new_or_changed_files(self) -> None:
+        first = write_transcript(self.dir, "aaa.txt", "aaa", "First")
+        write_transcript(self.dir, "bbb.txt", "bbb", "Second")
+        self.assertEqual(self.index.sync(), 2)
+
+        with mock.patch.object(transcript_index, "read_header", wraps=transcript_index.read_header) as read:
+            self.assertEqual(self.index.sync(), 0)
+            read.assert_not_called()
+
+            write_transcript(self.dir, "aaa.txt", "aaa", "First (edited)", text="longer text")
+            stat = first.stat()
+            os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(self.index.sync(), 1)
+            read.assert_called_once_with(first)
+
+        self.assertEqual({e["title"] for e in self.index.list()}, {"First (edited)", "Second"})
+
+    def test_listing_never_reads_transcript_text(self) -> None:
+        write_transcript(self.dir, "aaa.txt", "aaa", "First", text="long body " * 1000)
+
+        with mock.patch.object(transcript_index, "read_segments") as read:
+            self.assertEqual([e["title"] for e in self.index.list()], ["First"])
+            read.assert_not_called()
+
+    def test_deleted_files_are_dropped(self) -> None:
+        path = write_transcript(self.dir, "aaa.txt", "aaa", "First")
+        self.index.record(path)
+        path.unlink()
+
+        self.assertEqual(self.index.list(), [])
+
+
+class TranscriptSearchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.index = TranscriptIndex(self.dir)
+
+    def tearDown(self) -> None:
+        self.index.close()
+        self.tmp.cleanup()
+
+    def write_with_segments(self, name: str, video_id: str, segments) -> Path:
+        (self.dir / (Path(name).stem + ".segments.json")).write_text(json.dumps(segments), encoding="utf-8")
+        return write_transcript(self.dir, name, video_id, f"Talk {video_id}",
+                                text=" ".join(segment["text"] for segment in segments))
+
+    def test_hits_carry_segment_timestamp_and_link(self) -> None:
+        self.write_with_segments("dQw4w9WgXcQ_1.txt", "dQw4w9WgXcQ", [
+            {"start": 0.0, "end": 4.0, "text": "Welcome to the talk."},
+            {"start": 754.2, "end": 760.0, "text": "Kubernetes deployments roll out gradually."},
+        ])
+
+        hits = self.index.search("kubernetes deploy", highlight=("<", ">"))
+
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0]["start"], 754.2)
+        self.assertEqual(hits[0]["title"], "Talk dQw4w9WgXcQ")
+        self.assertEqual(hits[0]["link"], "https://youtu.be/dQw4w9WgXcQ?t=754")
+        self.assertIn("<Kubernetes>", hits[0]["snippet"])
+        self.assertIn("<deployments>", hits[0]["snippet"])
+
+    def test_transcripts_without_sidecar_are_searchable(self) -> None:
+        write_transcript(self.dir, "local.txt", "local", "Local recording", text="notes about garbage collection")
+
+        hits = self.index.search("garbage")
+
+        self.assertEqual(len(hits), 1)
+        self.assertIsNone(hits[0]["start"])
+        self.assertIsNone(hits[0]["link"])
+
+    def test_new_and_deleted_transcripts_are_indexed_incrementally(self) -> None:
+        self.assertEqual(self.index.search("latency"), [])
+
+        path = self.write_with_segments("abcdefghijk_1.txt", "abcdefghijk", [
+            {"start": 12.0, "end": 15.0, "text": "Tail latency matters."},
+        ])
+        self.assertEqual([hit["file"] for hit in self.index.search("latency")], [path.name])
+
+        path.unlink()
+        self.assertEqual(self.index.search("latency"), [])
+
+    def test_search_indexes_segments_lazily(self) -> None:
+        path = write_transcript(self.dir, "local.txt", "local", "Local", text="about caching")
+        self.index.list()
+
+        with mock.patch.object(transcript_index, "read_segments", wraps=transcript_index.read_segments) as read:
+            self.assertEqual(len(self.index.search("caching")), 1)
+            self.assertEqual(len(self.index.search("caching")), 1)
+            read.assert_called_once_with(path)
+
+            write_transcript(self.dir, "local.txt", "local", "Local", text="about sharding")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(self.index.search("caching"), [])
+            self.assertEqual(len(self.index.search("sharding")), 1)
+            self.assertEqual(read.call_count, 2)
+
+
+class TranscriptionResultCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        with mock.patch.object(YouTubeTranscriber, "_check_dependencies"):
+            self.transcriber = YouTubeTranscriber(output_dir=self.dir)
+        version = mock.patch("nexus_qa.transcriber.whisper_version", return_value="20231117")
+        version.start()
+        self.addCleanup(version.stop)
+
+    def tearDown(self) -> None:
+        self.transcriber.index.close()
+        self.tmp.cleanup()
+
+    def test_hit_matches_video_model_and_whisper_version(self) -> None:
+        path = write_transcript(self.dir, "dQw4w9WgXcQ_1.txt", "dQw4w9WgXcQ", "Talk")
+        self.transcriber.index.record(path)
+
+        cached = self.transcriber.cached_transcription("https://youtu.be/dQw4w9WgXcQ", "base")
+
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached[0], path)
+        self.assertEqual(cached[1]["title"], "Talk")
+        self.assertEqual(cached[1]["duration"], 42)
+        self.assertTrue(cached[1]["cached"])
+        self.assertIsNone(self.transcriber.cached_transcription("https://youtu.be/dQw4w9WgXcQ", "small"))
+
+    def test_other_whisper_version_is_a_miss(self) -> None:
+        path = write_transcript(self.dir, "dQw4w9WgXcQ_1.txt", "dQw4w9WgXcQ", "Talk", whisper="20230314")
+        self.transcriber.index.record(path)
+
+        self.assertIsNone(self.transcriber.cached_transcription("https://youtu.be/dQw4w9WgXcQ", "base"))
+
+    def test_cached_transcribe_skips_download(self) -> None:
+        path = write_transcript(self.dir, "dQw4w9WgXcQ_1.txt", "dQw4w9WgXcQ", "Talk")
+        self.transcriber.index.record(path)
+
+        with mock.patch.object(self.transcriber, "get_video_info") as info:
+            output, metadata = self.transcriber.transcribe("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+            info.assert_not_called()
+        self.assertEqual(output, path)
+
+        with mock.patch.object(self.transcriber, "get_video_info", side_effect=RuntimeError("network")) as info:
+            with self.assertRaises(TranscriptionError):
+                self.transcriber.transcribe("https://www.youtube.com/watch?v=dQw4w9WgXcQ", force=True)
+            info.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+import types
+import unittest
+from unittest import mock
+
+from nexus_qa import whisper_models
+
+
+class FakeModel:
+    def __init__(self, size: str, device: str):
+        self.size = size
+        self.device = device
+        self.halved = False
+
+    def half(self) -> "FakeModel":
+        self.halved = True
+        return self
+
+
+class WhisperModelRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.loads = []
+        fake_whisper = types.ModuleType("whisper")
+
+        def load_model(size: str, device: str) -> FakeModel:
+            self.loads.append((size, device))
+            return FakeModel(size, device)
+
+        fake_whisper.load_model = load_model
+        self.modules = mock.patch.dict(sys.modules, {"whisper": fake_whisper})
+        self.modules.start()
+        whisper_models.release_models()
+
+    def tearDown(self) -> None:
+        whisper_models.release_models()
+        self.modules.stop()
+
+    def test_models_stay_resident_per_size_device_and_dtype(self) -> None:
+        first, first_load = whisper_models.get_model("base", "cpu")
+        again, again_load = whisper_models.get_model("base", "cpu")
+        gpu, _ = whisper_models.get_model("base", "cuda")
+        gpu_fp32, _ = whisper_models.get_model("base", "cuda", "float32")
+
+        self.assertIs(first, again)
+        self.assertGreaterEqual(first_load, 0.0)
+        self.assertEqual(again_load, 0.0)
+        self.assertTrue(gpu.halved)
+        self.assertFalse(gpu_fp32.halved)
+        self.assertEqual(self.loads, [("base", "cpu"), ("base", "cuda"), ("base", "cuda")])
+        self.assertEqual(whisper_models.loaded_models(),
+                         [("base", "cpu", "float32"), ("base", "cuda", "float16"), ("base", "cuda", "float32")])
+
+
+if __name__ == "__main__":
+    unittest.main()
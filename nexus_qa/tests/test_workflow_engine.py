@@ -1,8 +1,14 @@
+import os
 import tempfile
+import time
 import unittest
 from pathlib import Path
+from unittest import mock
 
-from nexus_qa.models import WorkflowStep
+from click.testing import CliRunner
+
+from nexus_qa.main import cli
+from nexus_qa.models import Workflow, WorkflowStep
 from nexus_qa.workflows.engine import WorkflowEngine
 
 
@@ -38,5 +44,104 @@ class WorkflowEngineExecuteStepTests(unittest.TestCase):
             self.assertEqual(output_path.read_text(encoding="utf-8"), "hello world")
 
 
+class WorkflowEngineExecuteWorkflowTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = WorkflowEngine()
+
+    def test_parallel_steps_overlap_and_report_in_declared_order(self) -> None:
+        steps = [
+            WorkflowStep(name=f"probe-{i}", command=f"sleep 0.3; echo {i}", shell=True)
+            for i in range(3)
+        ]
+        workflow = Workflow(name="probes", description="", steps=steps, parallel=True)
+
+        start = time.perf_counter()
+        execution = self.engine.execute_workflow(workflow)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(execution.status, "completed")
+        self.assertEqual(execution.steps_completed, 3)
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(execution.output, "✓ probe-0:\n0\n\n✓ probe-1:\n1\n\n✓ probe-2:\n2\n")
+
+    def test_depends_on_orders_steps(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "log"
+            steps = [
+                WorkflowStep(name="report", command=f"cat {log}", depends_on=["slow", "fast"]),
+                WorkflowStep(name="slow", command=f"sleep 0.2; echo slow >> {log}", shell=True),
+                WorkflowStep(name="fast", command=f"echo fast >> {log}", shell=True),
+            ]
+            workflow = Workflow(name="dag", description="", steps=steps, parallel=True)
+
+            execution = self.engine.execute_workflow(workflow)
+
+            self.assertEqual(execution.status, "completed")
+            self.assertTrue(execution.output.startswith("✓ report:\nfast\nslow\n"))
+
+    def test_failure_stops_dependents(self) -> None:
+        steps = [
+            WorkflowStep(name="ok", command="true"),
+            WorkflowStep(name="broken", command="false"),
+            WorkflowStep(name="after", command="echo after"),
+        ]
+        workflow = Workflow(name="chain", description="", steps=steps)
+
+        execution = self.engine.execute_workflow(workflow, max_workers=4)
+
+        self.assertEqual(execution.status, "failed")
+        self.assertEqual(execution.steps_completed, 2)
+        self.assertIn("Step 'broken' failed", execution.error)
+        self.assertNotIn("after", execution.output)
+
+    def test_continue_on_error_keeps_dependents_running(self) -> None:
+        steps = [
+            WorkflowStep(name="optional", command="false", continue_on_error=True),
+            WorkflowStep(name="after", command="echo after", depends_on=["optional"]),
+        ]
+        workflow = Workflow(name="optional", description="", steps=steps, parallel=True)
+
+        execution = self.engine.execute_workflow(workflow)
+
+        self.assertEqual(execution.status, "completed")
+        self.assertEqual(execution.steps_completed, 2)
+
+    def test_invalid_dependencies_are_rejected(self) -> None:
+        unknown = Workflow(name="unknown", description="",
+                           steps=[WorkflowStep(name="a", command="true", depends_on=["missing"])])
+        cycle = Workflow(name="cycle", description="", steps=[
+            WorkflowStep(name="a", command="true", depends_on=["b"]),
+            WorkflowStep(name="b", command="true", depends_on=["a"]),
+        ])
+
+        with self.assertRaisesRegex(ValueError, "unknown step 'missing'"):
+            self.engine.execute_workflow(unknown)
+        with self.assertRaisesRegex(ValueError, "dependency cycle"):
+            self.engine.execute_workflow(cycle)
+
+
+class WorkflowCreateTests(unittest.TestCase):
+    def test_copy_of_template_keeps_worker_cap(self) -> None:
+        with tempfile.TemporaryDirectory() as home, mock.patch.dict(os.environ, {"HOME": home}):
+            engine = WorkflowEngine()
+            (engine.user_dir / "probes.yaml").write_text(
+                "name: probes\n"
+                "description: Probe hosts\n"
+                "parallel: true\n"
+                "max_workers: 2\n"
+                "steps:\n"
+                "  - name: ping\n"
+                "    command: echo ok\n",
+                encoding="utf-8",
+            )
+
+            result = CliRunner().invoke(cli, ["workflow", "create", "my-probes", "-t", "probes"])
+
+            self.assertEqual(result.exit_code, 0, result.output)
+            copy = engine.load_workflow("my-probes")
+            self.assertTrue(copy.parallel)
+            self.assertEqual(copy.max_workers, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from nexus_qa.models import WorkflowStep
+from nexus_qa.workflows.engine import WorkflowEngine
+from nexus_qa.workflows.executor import MAX_LINE_LENGTH, StreamCapture, run_command
+
+
+class RunCommandTests(unittest.TestCase):
+    def test_keeps_only_the_last_lines_but_streams_all(self) -> None:
+        streamed = []
+
+        outcome = asyncio.run(run_command(["seq", "1", "10000"], max_lines=100,
+                                          on_line=lambda stream, line: streamed.append(line)))
+
+        self.assertEqual(outcome["exit_code"], 0)
+        self.assertEqual(len(streamed), 10000)
+        lines = outcome["stdout"].splitlines()
+        self.assertEqual(lines[0], "... (9900 earlier lines not kept)")
+        self.assertEqual(lines[1:], [str(i) for i in range(9901, 10001)])
+
+    def test_timeout_kills_the_whole_process_group(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            marker = Path(tmpdir) / "marker"
+
+            start = time.perf_counter()
+            outcome = asyncio.run(run_command(f"(sleep 0.6; touch {marker}) & echo started; sleep 10",
+                                              shell=True, timeout=0.3))
+            elapsed = time.perf_counter() - start
+            time.sleep(0.6)
+
+            self.assertTrue(outcome["timed_out"])
+            self.assertIsNone(outcome["exit_code"])
+            self.assertEqual(outcome["stdout"], "started\n")
+            self.assertLess(elapsed, 2)
+            self.assertFalse(marker.exists())
+
+    def test_watch_matches_across_lines_and_split_long_lines(self) -> None:
+        spanning = asyncio.run(run_command("printf 'status:\\nfailed\\n'", shell=True, watch="status:\nfailed"))
+        missing = asyncio.run(run_command("printf 'status:\\nok\\n'", shell=True, watch="status:\nfailed"))
+
+        self.assertTrue(spanning["watch_found"])
+        self.assertFalse(missing["watch_found"])
+
+        # Pieces of a line longer than MAX_LINE_LENGTH
+        capture = StreamCapture("stdout", 10, watch="NEEDLE")
+        capture.add("x" * MAX_LINE_LENGTH + "NEE")
+        self.assertFalse(capture.watch_found)
+        capture.add("DLE\n")
+        self.assertTrue(capture.watch_found)
+
+    def test_partial_lines_and_stderr(self) -> None:
+        outcome = asyncio.run(run_command("printf 'a\\nno newline'; echo oops >&2", shell=True))
+
+        self.assertEqual(outcome["stdout"], "a\nno newline")
+        self.assertEqual(outcome["stderr"], "oops\n")
+
+
+class StreamingStepTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = WorkflowEngine()
+
+    def test_output_checks_run_on_streamed_lines(self) -> None:
+        forbidden = WorkflowStep(name="check", command="printf 'ok\\nstatus: inactive\\n'", shell=True,
+                                 fail_if_output_contains="inactive")
+        empty = WorkflowStep(name="empty", command="printf '  \\n'", shell=True, fail_if_empty=True)
+
+        self.assertFalse(self.engine.execute_step(forbidden)["success"])
+        self.assertEqual(self.engine.execute_step(empty)["error"], "Command produced no output")
+
+    def test_step_timeout(self) -> None:
+        step = WorkflowStep(name="slow", command="sleep 5", timeout=1, continue_on_error=True)
+
+        result = self.engine.execute_step(step)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["error"], "Command timed out after 1 seconds")
+        self.assertLess(result["duration"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
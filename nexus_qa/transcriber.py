@@ -3,12 +3,20 @@
 import json
 import re
 import shutil
+import multiprocessing
+import os
 import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeRemainingColumn
 from rich.console import Console
+from nexus_qa.transcript_index import TranscriptIndex, segments_path
+from nexus_qa.whisper_models import default_device, default_dtype, get_model, whisper_version
 
 console = Console()
 
@@ -18,14 +26,105 @@ class TranscriptionError(Exception):
     pass
 
 
+def decode_options(dtype: str) -> Dict:
+    """Whisper decode options shared by every transcription path.
+    
+    ``temperature=0`` disables Whisper's sampling fallback, so repeated runs
+    produce identical text and single-pass, chunked and batch transcriptions
+    of the same audio decode the same way.
+    """
+    return {'verbose': False, 'fp16': dtype == "float16", 'temperature': 0.0}
+
+
+def _init_worker(torch_threads: int):
+    """Split CPU threads between batch worker processes instead of oversubscribing."""
+    import torch
+    torch.set_num_threads(torch_threads)
+
+
+def _transcribe_worker(audio_path: str, model_size: str, device: Optional[str]) -> Dict:
+    """Transcribe one file in a batch worker process.
+    
+    Runs in a process pool, so the model comes from that process's registry
+    and stays loaded for every file the worker handles.
+    """
+    from nexus_qa.audio import SAMPLE_RATE, load_audio
+    
+    device = device or default_device()
+    dtype = default_dtype(device)
+    model, load_seconds = get_model(model_size, device, dtype)
+    
+    start = time.perf_counter()
+    audio = load_audio(audio_path)
+    result = model.transcribe(audio, **decode_options(dtype))
+    return {
+        'text': result["text"].strip(),
+        'segments': [
+            {'start': segment['start'], 'end': segment['end'], 'text': segment['text'].strip()}
+            for segment in result['segments']
+        ],
+        'audio_seconds': len(audio) / SAMPLE_RATE,
+        'timings': {'model_load': load_seconds, 'inference': time.perf_counter() - start},
+    }
+
+
+def _transcribe_chunk_worker(chunk, offset: float, model_size: str, device: str) -> Dict:
+    """Transcribe one chunk of a long recording in a worker process.
+    
+    Segment timestamps are shifted by ``offset`` seconds so they refer to the
+    whole recording.
+    """
+    model, load_seconds = get_model(model_size, device, "float32")
+    result = model.transcribe(chunk, **decode_options("float32"))
+    segments = [
+        {'start': segment['start'] + offset, 'end': segment['end'] + offset, 'text': segment['text'].strip()}
+        for segment in result['segments']
+    ]
+    return {'text': result['text'].strip(), 'segments': segments, 'model_load': load_seconds}
+
+
+def transcribe_chunked(audio, model_size: str = "base", workers: int = 4, chunk_seconds: float = 60.0) -> Dict:
+    """Transcribe long 16 kHz mono audio on CPU by splitting it at silences.
+    
+    Chunks of about ``chunk_seconds`` are transcribed in parallel worker
+    processes and stitched back together in order. Returns ``text``,
+    ``segments`` (with timestamps relative to the whole recording), the
+    number of ``chunks`` and the slowest worker's ``model_load`` seconds.
+    """
+    from nexus_qa.audio import find_split_points, split_audio
+    
+    chunks = split_audio(audio, find_split_points(audio, chunk_seconds))
+    workers = max(1, min(workers, len(chunks)))
+    torch_threads = max(1, (os.cpu_count() or 1) // workers)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(torch_threads,)) as pool:
+        results = list(pool.map(
+            _transcribe_chunk_worker,
+            [chunk for _, chunk in chunks],
+            [offset for offset, _ in chunks],
+            repeat(model_size),
+            repeat("cpu"),
+        ))
+    
+    return {
+        'text': " ".join(result['text'] for result in results if result['text']),
+        'segments': [segment for result in results for segment in result['segments']],
+        'chunks': len(chunks),
+        'model_load': max(result['model_load'] for result in results),
+    }
+
+
 class YouTubeTranscriber:
     """Transcribes YouTube videos to text using yt-dlp and Whisper."""
     
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(self, output_dir: Optional[Path] = None, audio_cache=None):
         """Initialize YouTubeTranscriber.
         
         Args:
             output_dir: Directory to save transcriptions. Defaults to ./transcriptions
+            audio_cache: Optional ``AudioCache`` that keeps downloaded audio; without
+                one, downloads go to a temp directory and are deleted after use
         """
         if output_dir is None:
             # Default to transcriptions/ in current working directory
@@ -35,6 +134,13 @@ class YouTubeTranscriber:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.temp_dir = self.output_dir / ".temp"
         self.temp_dir.mkdir(exist_ok=True)
+        self.timings: Dict[str, float] = {}
+        self.segments: List[Dict] = []
+        self.index = TranscriptIndex(self.output_dir)
+        self.audio_cache = audio_cache
+        # Cached audio handed out but not yet transcribed; eviction skips it
+        self._audio_in_use: Set[Path] = set()
+        self._audio_lock = threading.Lock()
         
         self._check_dependencies()
     
@@ -100,20 +206,29 @@ class YouTubeTranscriber:
             raise TranscriptionError(f"Failed to get video info: {e}")
     
     def download_audio(self, url: str, video_id: str) -> Path:
-        """Download audio from YouTube video."""
+        """Download the best audio stream of a YouTube video in its native container.
+        
+        The stream (usually m4a or webm/opus) is kept as downloaded and decoded
+        straight to PCM when transcribing, instead of being re-encoded to MP3.
+        With an audio cache, a cached download is reused and new downloads are
+        kept in the cache.
+        """
         try:
             import yt_dlp
             
-            audio_path = self.temp_dir / f"{video_id}.mp3"
+            if self.audio_cache is not None:
+                with self._audio_lock:
+                    cached = self.audio_cache.get(video_id)
+                    if cached:
+                        self._audio_in_use.add(cached)
+                if cached:
+                    console.print("[green]✓[/green] Using cached audio")
+                    return cached
             
+            download_dir = self.audio_cache.directory if self.audio_cache is not None else self.temp_dir
             ydl_opts = {
                 'format': 'bestaudio/best',
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'mp3',
-                    'preferredquality': '192',
-                }],
-                'outtmpl': str(self.temp_dir / f"{video_id}.%(ext)s"),
+                'outtmpl': str(download_dir / f"{video_id}.%(ext)s"),
                 'quiet': True,
                 'no_warnings': True,
             }
@@ -121,26 +236,73 @@ class YouTubeTranscriber:
             console.print("[cyan]📥 Downloading audio...[/cyan]")
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+                info = ydl.extract_info(url, download=True)
+                audio_path = Path(ydl.prepare_filename(info))
             
             if not audio_path.exists():
                 raise TranscriptionError("Audio download failed")
             
+            if self.audio_cache is not None:
+                with self._audio_lock:
+                    self._audio_in_use.add(audio_path)
+                    self.audio_cache.evict(keep=self._audio_in_use)
             return audio_path
             
         except Exception as e:
             raise TranscriptionError(f"Failed to download audio: {e}")
     
-    def transcribe_audio(self, audio_path: Path, model_size: str = "base") -> str:
-        """Transcribe audio using Whisper."""
+    def release_audio(self, audio_path: Path):
+        """Allow downloaded audio to be evicted once it has been transcribed."""
+        with self._audio_lock:
+            self._audio_in_use.discard(audio_path)
+    
+    def transcribe_audio(self, audio_path: Path, model_size: str = "base",
+                         device: Optional[str] = None, workers: int = 1,
+                         chunk_seconds: float = 60.0) -> str:
+        """Transcribe audio using Whisper.
+        
+        The model comes from the process-wide registry, so only the first
+        transcription per (size, device, dtype) pays the load. Load and
+        inference time are recorded separately in ``self.timings`` and the
+        timestamped segments in ``self.segments``.
+        
+        With ``workers > 1`` on CPU, recordings longer than 1.5 chunks are
+        split at silences and the chunks transcribed in parallel processes.
+        """
         try:
-            import whisper
+            from nexus_qa.audio import SAMPLE_RATE, load_audio
+            
+            device = device or default_device()
+            dtype = default_dtype(device)
+            audio = load_audio(audio_path)
+            
+            if workers > 1 and device == "cpu" and len(audio) > chunk_seconds * 1.5 * SAMPLE_RATE:
+                console.print(f"[cyan]✍️  Transcribing in ~{chunk_seconds:.0f}s chunks "
+                              f"with {workers} workers ({model_size})...[/cyan]")
+                start = time.perf_counter()
+                result = transcribe_chunked(audio, model_size, workers, chunk_seconds)
+                elapsed = time.perf_counter() - start
+                console.print(f"[green]✓[/green] Transcribed {result['chunks']} chunks")
+                self.timings = {'model_load': result['model_load'],
+                                'inference': elapsed - result['model_load']}
+                self.segments = result['segments']
+                return result['text']
             
-            console.print(f"[cyan]🎤 Loading Whisper model ({model_size})...[/cyan]")
-            model = whisper.load_model(model_size)
+            console.print(f"[cyan]🎤 Loading Whisper model ({model_size}, {device})...[/cyan]")
+            model, load_seconds = get_model(model_size, device, dtype)
+            if load_seconds:
+                console.print(f"[green]✓[/green] Model loaded in {load_seconds:.1f}s")
+            else:
+                console.print("[green]✓[/green] Using resident model")
             
             console.print("[cyan]✍️  Transcribing audio...[/cyan]")
-            result = model.transcribe(str(audio_path), verbose=False)
+            start = time.perf_counter()
+            result = model.transcribe(audio, **decode_options(dtype))
+            self.timings = {'model_load': load_seconds, 'inference': time.perf_counter() - start}
+            self.segments = [
+                {'start': segment['start'], 'end': segment['end'], 'text': segment['text'].strip()}
+                for segment in result['segments']
+            ]
             
             return result["text"].strip()
             
@@ -151,13 +313,23 @@ class YouTubeTranscriber:
         self, 
         text: str, 
         metadata: Dict, 
-        video_id: str
+        video_id: str,
+        segments: Optional[List[Dict]] = None
     ) -> Path:
-        """Save transcription to file with metadata."""
+        """Save transcription to file with metadata.
+        
+        Timestamped ``segments`` are written to a ``<name>.segments.json``
+        sidecar, which the search index uses for segment-level hits.
+        """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{video_id}_{timestamp}.txt"
         output_path = self.output_dir / filename
         
+        # Written first so the index sees it when the transcript is recorded
+        if segments:
+            with open(segments_path(output_path), 'w', encoding='utf-8') as f:
+                json.dump(segments, f, ensure_ascii=False)
+        
         # Format metadata header
         header = "=" * 80 + "\n"
         header += "YOUTUBE VIDEO TRANSCRIPTION\n"
@@ -167,6 +339,8 @@ class YouTubeTranscriber:
         header += f"Uploader:     {metadata.get('uploader', 'N/A')}\n"
         header += f"Upload Date:  {metadata.get('upload_date', 'N/A')}\n"
         header += f"Duration:     {metadata.get('duration', 'N/A')} seconds\n"
+        header += f"Model:        {metadata.get('model_size', 'N/A')}\n"
+        header += f"Whisper:      {metadata.get('whisper_version', 'N/A')}\n"
         header += f"Transcribed:  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
         header += "=" * 80 + "\n\n"
         
@@ -175,6 +349,7 @@ class YouTubeTranscriber:
             f.write(header)
             f.write(text)
         
+        self.index.record(output_path)
         return output_path
     
     def cleanup(self):
@@ -183,27 +358,72 @@ class YouTubeTranscriber:
             shutil.rmtree(self.temp_dir)
             self.temp_dir.mkdir(exist_ok=True)
     
+    def cached_transcription(self, source: str, model_size: str) -> Optional[Tuple[Path, Dict]]:
+        """Find an existing transcript of a YouTube URL for this model and Whisper version.
+        
+        The video ID comes from the URL itself, so a hit costs no network
+        request. Returns ``(path, metadata)`` or ``None``.
+        """
+        if not source.startswith(("http://", "https://")):
+            return None
+        try:
+            video_id = self._extract_video_id(source)
+        except TranscriptionError:
+            return None
+        
+        entry = self.index.find(video_id, model_size, whisper_version())
+        if entry is None:
+            return None
+        duration = entry.get('duration', '').removesuffix(' seconds')
+        metadata = {
+            'id': video_id,
+            'title': entry.get('title'),
+            'duration': int(duration) if duration.isdigit() else None,
+            'model_size': model_size,
+            'whisper_version': entry.get('whisper_version'),
+            'cached': True,
+        }
+        return Path(entry['path']), metadata
+    
     def transcribe(
         self, 
         url: str, 
-        model_size: str = "base"
+        model_size: str = "base",
+        device: Optional[str] = None,
+        workers: int = 1,
+        force: bool = False
     ) -> Tuple[Path, Dict]:
         """Complete transcription workflow.
         
         Args:
             url: YouTube video URL
             model_size: Whisper model size (tiny, base, small, medium, large)
+            device: Torch device for Whisper (defaults to cuda when available)
+            workers: Parallel processes for chunked CPU transcription of long audio
+            force: Transcribe again even if a transcript for this video, model
+                size and Whisper version already exists
         
         Returns:
-            Tuple of (transcription_file_path, metadata)
+            Tuple of (transcription_file_path, metadata). ``metadata['timings']``
+            holds the model load and inference seconds; ``metadata['cached']``
+            is set when an existing transcript was returned instead.
         """
+        audio_path = None
         try:
+            if not force:
+                cached = self.cached_transcription(url, model_size)
+                if cached:
+                    console.print(f"[green]✓[/green] Already transcribed with the {model_size} model")
+                    return cached
+            
             console.print(f"[bold cyan]🎬 Starting transcription for:[/bold cyan] {url}")
             
             # Get video info
             console.print("[cyan]📋 Fetching video info...[/cyan]")
             metadata = self.get_video_info(url)
             video_id = metadata['id']
+            metadata['model_size'] = model_size
+            metadata['whisper_version'] = whisper_version()
             
             console.print(f"[green]✓[/green] Video: [bold]{metadata['title']}[/bold]")
             
@@ -212,11 +432,12 @@ class YouTubeTranscriber:
             console.print(f"[green]✓[/green] Audio downloaded")
             
             # Transcribe
-            text = self.transcribe_audio(audio_path, model_size)
+            text = self.transcribe_audio(audio_path, model_size, device, workers)
+            metadata['timings'] = self.timings
             console.print(f"[green]✓[/green] Transcription complete ({len(text)} chars)")
             
             # Save
-            output_path = self.save_transcription(text, metadata, video_id)
+            output_path = self.save_transcription(text, metadata, video_id, self.segments)
             console.print(f"[green]✓[/green] Saved to: [bold]{output_path}[/bold]")
             
             # Cleanup
@@ -230,42 +451,146 @@ class YouTubeTranscriber:
         except Exception as e:
             self.cleanup()
             raise TranscriptionError(f"Transcription failed: {e}")
+        finally:
+            if audio_path is not None:
+                self.release_audio(audio_path)
     
-    def list_transcriptions(self) -> List[Dict]:
-        """List all transcriptions with metadata."""
-        transcriptions = []
+    def expand_sources(self, sources: List[str]) -> List[str]:
+        """Expand playlist URLs into their video URLs; other sources pass through."""
+        expanded = []
+        for source in sources:
+            if source.startswith(("http://", "https://")) and "list=" in source:
+                try:
+                    import yt_dlp
+                    
+                    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, 'extract_flat': True}) as ydl:
+                        info = ydl.extract_info(source, download=False)
+                    for entry in info.get('entries') or []:
+                        video_id = entry.get('id')
+                        if video_id:
+                            expanded.append(f"https://www.youtube.com/watch?v={video_id}")
+                except Exception as e:
+                    raise TranscriptionError(f"Failed to expand playlist {source}: {e}")
+            else:
+                expanded.append(source)
+        return expanded
+    
+    def prepare_source(self, source: str) -> Tuple[Path, Dict, bool]:
+        """Resolve a URL or local audio file to ``(audio_path, metadata, is_temporary)``."""
+        local_path = Path(source).expanduser()
+        if local_path.is_file():
+            metadata = {
+                'id': local_path.stem,
+                'title': local_path.name,
+                'duration': None,
+                'uploader': None,
+                'upload_date': None,
+            }
+            return local_path, metadata, False
         
-        if not self.output_dir.exists():
-            return transcriptions
+        metadata = self.get_video_info(source)
+        audio_path = self.download_audio(source, metadata['id'])
+        # Audio in the cache outlives the transcription; temp downloads do not
+        return audio_path, metadata, self.audio_cache is None
+    
+    def transcribe_batch(
+        self,
+        sources: List[str],
+        model_size: str = "base",
+        device: Optional[str] = None,
+        workers: int = 2,
+        downloads: int = 2,
+        on_result: Optional[Callable[[Dict], None]] = None,
+        force: bool = False
+    ) -> Dict:
+        """Transcribe many URLs or local files with a two-stage pipeline.
         
-        for file_path in sorted(self.output_dir.glob("*.txt"), reverse=True):
-            try:
-                # Read metadata from file header
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Extract metadata
-                metadata = {
-                    'file': file_path.name,
-                    'path': str(file_path),
-                    'size': file_path.stat().st_size,
-                    'modified': datetime.fromtimestamp(file_path.stat().st_mtime),
-                }
-                
-                # Parse header for video info
-                lines = content.split('\n')
-                for line in lines[:10]:  # Check first 10 lines
-                    if line.startswith('Video ID:'):
-                        metadata['video_id'] = line.split(':', 1)[1].strip()
-                    elif line.startswith('Title:'):
-                        metadata['title'] = line.split(':', 1)[1].strip()
-                    elif line.startswith('Duration:'):
-                        metadata['duration'] = line.split(':', 1)[1].strip()
-                
-                transcriptions.append(metadata)
+        Downloads run on a thread pool (I/O bound) and feed a pool of
+        ``workers`` processes that transcribe (CPU bound), so the next file
+        downloads while the current one is transcribed. At most
+        ``workers + downloads`` files are in flight, which bounds temp disk use.
+        
+        URLs that already have a transcript for this model and Whisper version
+        are reported as ``cached`` without downloading, unless ``force``.
+        
+        ``on_result`` is called in this process for each finished source with a
+        dict of ``source``, ``path``, ``metadata``, ``audio_seconds``,
+        ``timings``, ``cached`` and ``error``. Returns aggregate totals.
+        """
+        workers = max(1, workers)
+        downloads = max(1, downloads)
+        pending = list(reversed(sources))
+        totals = {'files': 0, 'cached': 0, 'failed': 0, 'audio_seconds': 0.0, 'wall_seconds': 0.0}
+        start = time.perf_counter()
+        version = whisper_version()
+        
+        def new_result(source: str) -> Dict:
+            return {'source': source, 'path': None, 'metadata': None, 'audio_seconds': 0.0,
+                    'timings': {}, 'cached': False, 'error': None}
+        
+        def finish(result: Dict):
+            if result['error']:
+                totals['failed'] += 1
+            elif result['cached']:
+                totals['cached'] += 1
+            else:
+                totals['files'] += 1
+                totals['audio_seconds'] += result['audio_seconds']
+            if on_result:
+                on_result(result)
+        
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn: forking a process that has torch loaded and download threads running is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ThreadPoolExecutor(max_workers=downloads) as download_pool, \
+                ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                    initializer=_init_worker, initargs=(torch_threads,)) as transcribe_pool:
+            in_flight = {}
+            while pending or in_flight:
+                while pending and len(in_flight) < workers + downloads:
+                    source = pending.pop()
+                    cached = None if force else self.cached_transcription(source, model_size)
+                    if cached:
+                        result = new_result(source)
+                        result.update(path=cached[0], metadata=cached[1], cached=True)
+                        finish(result)
+                        continue
+                    in_flight[download_pool.submit(self.prepare_source, source)] = ('download', source, None)
                 
-            except Exception:
-                # Skip files that can't be read
-                continue
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, source, prepared = in_flight.pop(future)
+                    result = new_result(source)
+                    try:
+                        if stage == 'download':
+                            audio_path, metadata, is_temporary = future.result()
+                            job = transcribe_pool.submit(_transcribe_worker, str(audio_path), model_size, device)
+                            in_flight[job] = ('transcribe', source, (audio_path, metadata, is_temporary))
+                            continue
+                        
+                        audio_path, metadata, is_temporary = prepared
+                        output = future.result()
+                        if not metadata.get('duration'):
+                            metadata['duration'] = round(output['audio_seconds'])
+                        metadata.update(model_size=model_size, whisper_version=version)
+                        result.update(metadata=metadata, audio_seconds=output['audio_seconds'],
+                                      timings=output['timings'])
+                        result['path'] = self.save_transcription(output['text'], metadata, metadata['id'],
+                                                                 output['segments'])
+                    except Exception as e:
+                        result['error'] = str(e)
+                    
+                    if stage == 'transcribe':
+                        if prepared[2]:
+                            prepared[0].unlink(missing_ok=True)
+                        else:
+                            self.release_audio(prepared[0])
+                    finish(result)
         
-        return transcriptions
+        totals['wall_seconds'] = time.perf_counter() - start
+        return totals
+    
+    def list_transcriptions(self) -> List[Dict]:
+        """List all transcriptions with metadata from the directory's index."""
+        return self.index.list()
+        
\ No newline at end of file
@@ -0,0 +1,378 @@
+"""SQLite index of saved transcriptions, kept next to them in ``.index.db``."""
+
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Header written by YouTubeTranscriber.save_transcription: fields between '=' rules
+HEADER_LINES = 16
+HEADER_RULE = "=" * 80
+HEADER_FIELDS = {
+    'Video ID:': 'video_id',
+    'Title:': 'title',
+    'Duration:': 'duration',
+    'Model:': 'model',
+    'Whisper:': 'whisper_version',
+}
+SEGMENTS_SUFFIX = ".segments.json"
+
+YOUTUBE_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+
+def read_header(path: Path) -> Dict[str, str]:
+    """Parse the metadata header of a transcription without reading its text."""
+    header = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        rules = 0
+        for _ in range(HEADER_LINES):
+            line = f.readline()
+            if not line:
+                break
+            if line.startswith(HEADER_RULE):
+                rules += 1
+                if rules == 3:
+                    break
+            for prefix, field in HEADER_FIELDS.items():
+                if line.startswith(prefix):
+                    header[field] = line.split(':', 1)[1].strip()
+    return header
+
+
+def segments_path(path: Path) -> Path:
+    """Get the timestamped-segments sidecar of a transcription file."""
+    return path.with_name(path.stem + SEGMENTS_SUFFIX)
+
+
+def read_segments(path: Path) -> List[Dict]:
+    """Load the timestamped segments of a transcription.
+    
+    Transcripts saved without a segments sidecar are indexed as a single
+    segment holding the whole text, with no timestamp.
+    """
+    sidecar = segments_path(path)
+    if sidecar.exists():
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    text = path.read_text(encoding='utf-8')
+    # The header ends with a rule of '=' followed by a blank line
+    body = text.split(HEADER_RULE + "\n\n", 1)[-1].strip()
+    return [{'start': None, 'end': None, 'text': body}] if body else []
+
+
+def video_link(video_id: Optional[str], start: Optional[float]) -> Optional[str]:
+    """Get a youtu.be link to ``start`` seconds into a video, if it is a YouTube video."""
+    if not video_id or not YOUTUBE_ID.match(video_id):
+        return None
+    if start is None:
+        return f"https://youtu.be/{video_id}"
+    return f"https://youtu.be/{video_id}?t={int(start)}"
+
+
+class TranscriptIndex:
+    """Metadata and full-text index for the transcriptions in one output directory.
+    
+    Rows are keyed by file name and carry the file's mtime and size, so
+    ``sync`` only reads the header of new or changed files and listing is a
+    single query instead of a read of every transcript. Each transcript's
+    timestamped segments are indexed with FTS5 for ``search``: on ``record``,
+    or lazily by the first search after a file is added or changed, so
+    listing never reads transcript text.
+    """
+    
+    FILENAME = ".index.db"
+    
+    # Bumped whenever _migrate gains a step; stored in PRAGMA user_version
+    SCHEMA_VERSION = 4
+    
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.db_path = self.output_dir / self.FILENAME
+        self._conn: Optional[sqlite3.Connection] = None
+        self.has_fts = False
+    
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS transcripts (
+                        file TEXT PRIMARY KEY,
+                        mtime_ns INTEGER NOT NULL,
+                        size INTEGER NOT NULL,
+                        video_id TEXT,
+                        title TEXT,
+                        duration TEXT
+                    )
+                """)
+                self._migrate(conn)
+            self._conn = conn
+        return self._conn
+    
+    def _migrate(self, conn: sqlite3.Connection):
+        """Upgrade an existing index to the current schema version."""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            if version < 1:
+                # v1: timestamped segments; forget file stats so the next sync indexes every transcript
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS segments (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        file TEXT NOT NULL,
+                        start REAL,
+                        end REAL,
+                        text TEXT NOT NULL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_file ON segments(file)")
+                conn.execute("DELETE FROM transcripts")
+                version = 1
+            
+            if version < 2:
+                # v2: FTS5 index over segment text, created below whenever it is missing
+                version = 2
+            
+            if version < 3:
+                # v3: model and Whisper version from the header, the key of the result cache
+                conn.execute("ALTER TABLE transcripts ADD COLUMN model TEXT")
+                conn.execute("ALTER TABLE transcripts ADD COLUMN whisper_version TEXT")
+                conn.execute("""CREATE INDEX IF NOT EXISTS idx_transcripts_key
+                                ON transcripts(video_id, model, whisper_version)""")
+                conn.execute("DELETE FROM transcripts")
+                version = 3
+            
+            if version < 4:
+                # v4: mtime of the file version whose segments are indexed (NULL: not indexed yet)
+                conn.execute("ALTER TABLE transcripts ADD COLUMN segments_mtime_ns INTEGER")
+                conn.execute("DELETE FROM segments")
+                version = 4
+            
+            conn.execute(f"PRAGMA user_version = {version}")
+        
+        self.has_fts = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'segments_fts'").fetchone() is not None
+        if not self.has_fts:
+            try:
+                self._create_segment_index(conn)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5; search falls back to LIKE and retries next run
+                pass
+    
+    def _create_segment_index(self, conn: sqlite3.Connection):
+        """Create the segments_fts table and its sync triggers, then index existing rows."""
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+                text, content='segments', content_rowid='id', prefix='2 3'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS segments_fts_insert AFTER INSERT ON segments BEGIN
+                INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS segments_fts_delete AFTER DELETE ON segments BEGIN
+                INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+            END
+        """)
+        conn.execute("INSERT INTO segments_fts(segments_fts) VALUES ('rebuild')")
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Run one operation in a transaction."""
+        conn = self._get_connection()
+        with conn:
+            yield conn
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _upsert(self, conn: sqlite3.Connection, path: Path, stat: os.stat_result):
+        """Index one transcript's header, replacing any earlier version.
+        
+        The replaced row's ``segments_mtime_ns`` is NULL, so the transcript's
+        segments are re-indexed by the next search.
+        """
+        header = read_header(path)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO transcripts
+                (file, mtime_ns, size, video_id, title, duration, model, whisper_version)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (path.name, stat.st_mtime_ns, stat.st_size, header.get('video_id'), header.get('title'),
+             header.get('duration'), header.get('model'), header.get('whisper_version'))
+        )
+    
+    def _index_segments(self, conn: sqlite3.Connection, name: str, mtime_ns: int):
+        """Replace the indexed segments of one transcript."""
+        segments = read_segments(self.output_dir / name)
+        conn.execute("DELETE FROM segments WHERE file = ?", (name,))
+        conn.executemany(
+            "INSERT INTO segments (file, start, end, text) VALUES (?, ?, ?, ?)",
+            [(name, segment.get('start'), segment.get('end'), segment['text'])
+             for segment in segments if segment.get('text')]
+        )
+        conn.execute("UPDATE transcripts SET segments_mtime_ns = ? WHERE file = ?", (mtime_ns, name))
+    
+    def record(self, path: Path):
+        """Add or refresh one transcription, e.g. right after it was saved."""
+        path = Path(path)
+        stat = path.stat()
+        with self._connection() as conn:
+            self._upsert(conn, path, stat)
+            self._index_segments(conn, path.name, stat.st_mtime_ns)
+    
+    def sync(self) -> int:
+        """Bring the metadata index up to date with the directory.
+        
+        Only the headers of files whose mtime or size changed are read; rows
+        for deleted files are dropped. Returns the number of files re-read.
+        """
+        with self._connection() as conn:
+            known = {row['file']: (row['mtime_ns'], row['size'])
+                     for row in conn.execute("SELECT file, mtime_ns, size FROM transcripts")}
+            
+            reread = 0
+            seen = set()
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".txt") or not entry.is_file():
+                        continue
+                    seen.add(entry.name)
+                    stat = entry.stat()
+                    if known.get(entry.name) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    try:
+                        self._upsert(conn, Path(entry.path), stat)
+                    except (OSError, UnicodeDecodeError):
+                        # Skip files that can't be read
+                        continue
+                    reread += 1
+            
+            removed = [(name,) for name in known if name not in seen]
+            conn.executemany("DELETE FROM transcripts WHERE file = ?", removed)
+            conn.executemany("DELETE FROM segments WHERE file = ?", removed)
+            return reread
+    
+    def sync_segments(self) -> int:
+        """Index the segments of transcripts added or changed since they were last indexed.
+        
+        Returns the number of transcripts indexed.
+        """
+        with self._connection() as conn:
+            pending = conn.execute(
+                """SELECT file, mtime_ns FROM transcripts
+                   WHERE segments_mtime_ns IS NULL OR segments_mtime_ns != mtime_ns"""
+            ).fetchall()
+            indexed = 0
+            for row in pending:
+                try:
+                    self._index_segments(conn, row['file'], row['mtime_ns'])
+                except (OSError, UnicodeDecodeError, ValueError, KeyError):
+                    # Skip files (or sidecars) that can't be read; retried next search
+                    continue
+                indexed += 1
+            return indexed
+    
+    def _entry(self, row: sqlite3.Row) -> Dict:
+        entry = {
+            'file': row['file'],
+            'path': str(self.output_dir / row['file']),
+            'size': row['size'],
+            'modified': datetime.fromtimestamp(row['mtime_ns'] / 1e9),
+        }
+        for field in HEADER_FIELDS.values():
+            if row[field] is not None:
+                entry[field] = row[field]
+        return entry
+    
+    def find(self, video_id: str, model: str, whisper_version: str) -> Optional[Dict]:
+        """Find the newest transcription of a video made with this model and Whisper version."""
+        with self._connection() as conn:
+            rows = conn.execute(
+                """SELECT * FROM transcripts
+                   WHERE video_id = ? AND model = ? AND whisper_version = ?
+                   ORDER BY mtime_ns DESC""",
+                (video_id, model, whisper_version)
+            ).fetchall()
+        
+        # The index may lag behind deletions until the next sync
+        for row in rows:
+            if (self.output_dir / row['file']).is_file():
+                return self._entry(row)
+        return None
+    
+    def list(self) -> List[Dict]:
+        """List indexed transcriptions, newest file name first."""
+        self.sync()
+        with self._connection() as conn:
+            rows = conn.execute("SELECT * FROM transcripts ORDER BY file DESC").fetchall()
+        
+        return [self._entry(row) for row in rows]
+
+    def search(self, query: str, limit: int = 20,
+               highlight: Tuple[str, str] = ("", "")) -> List[Dict]:
+        """Search transcript segments.
+        
+        Every word in ``query`` must prefix-match a word in the segment and
+        results are ranked by BM25. Each hit has ``file``, ``video_id``,
+        ``title``, ``start``/``end`` seconds (None for transcripts saved
+        without segments), a ``snippet`` with matches wrapped in
+        ``highlight`` and a youtu.be ``link`` to the timestamp.
+        """
+        self.sync()
+        self.sync_segments()
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        
+        with self._connection() as conn:
+            if self.has_fts:
+                rows = conn.execute(
+                    """SELECT segments.file, segments.start, segments.end,
+                              transcripts.video_id, transcripts.title,
+                              snippet(segments_fts, 0, ?, ?, '…', 16) AS snippet
+                       FROM segments_fts
+                       JOIN segments ON segments.id = segments_fts.rowid
+                       JOIN transcripts ON transcripts.file = segments.file
+                       WHERE segments_fts MATCH ?
+                       ORDER BY segments_fts.rank
+                       LIMIT ?""",
+                    (highlight[0], highlight[1], " ".join(f'"{term}"*' for term in terms), limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    """SELECT segments.file, segments.start, segments.end,
+                              transcripts.video_id, transcripts.title, segments.text AS snippet
+                       FROM segments JOIN transcripts ON transcripts.file = segments.file
+                       WHERE segments.text LIKE ?
+                       ORDER BY segments.file DESC, segments.start
+                       LIMIT ?""",
+                    (f"%{query}%", limit)
+                ).fetchall()
+        
+        return [
+            {
+                'file': row['file'],
+                'video_id': row['video_id'],
+                'title': row['title'],
+                'start': row['start'],
+                'end': row['end'],
+                'snippet': row['snippet'],
+                'link': video_link(row['video_id'], row['start']),
+            }
+            for row in rows
+        ]
@@ -0,0 +1,70 @@
+"""Process-wide registry of loaded Whisper models for transcription."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+_models: Dict[Tuple[str, str, str], Any] = {}
+_lock = threading.Lock()
+
+
+def default_device() -> str:
+    """Use the GPU when torch can see one, otherwise the CPU."""
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def default_dtype(device: str) -> str:
+    """Whisper only runs float16 inference on GPU; CPU inference is float32."""
+    return "float32" if device == "cpu" else "float16"
+
+
+def whisper_version() -> str:
+    """Get the installed openai-whisper version without importing whisper."""
+    from importlib import metadata
+    try:
+        return metadata.version("openai-whisper")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def get_model(model_size: str = "base", device: Optional[str] = None,
+              dtype: Optional[str] = None) -> Tuple[Any, float]:
+    """Get a loaded Whisper model, loading it on first use.
+    
+    Models stay resident keyed by (size, device, dtype), so batch runs and the
+    daemon pay the multi-second load only once per process. Returns
+    ``(model, load_seconds)``; ``load_seconds`` is 0.0 for a resident model.
+    """
+    device = device or default_device()
+    dtype = dtype or default_dtype(device)
+    key = (model_size, device, dtype)
+    model = _models.get(key)
+    if model is not None:
+        return model, 0.0
+    
+    # Loads are serialized so concurrent callers never load the same model twice
+    with _lock:
+        model = _models.get(key)
+        if model is not None:
+            return model, 0.0
+        
+        import whisper
+        start = time.perf_counter()
+        model = whisper.load_model(model_size, device=device)
+        if dtype == "float16" and device != "cpu":
+            model = model.half()
+        _models[key] = model
+        return model, time.perf_counter() - start
+
+
+def loaded_models() -> List[Tuple[str, str, str]]:
+    """List the (size, device, dtype) keys of resident models."""
+    return sorted(_models)
+
+
+def release_models():
+    """Drop all resident models so their memory can be reclaimed."""
+    with _lock:
+        _models.clear()
@@ -1,20 +1,28 @@
 """Workflow execution engine for Nexus CLI Assistant."""
 
-import subprocess
+import asyncio
 import shlex
 import yaml
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Callable, Dict, List, Any, Tuple
 from datetime import datetime
 import os
 import sys
 
 from nexus_qa.models import Workflow, WorkflowStep, WorkflowExecution
+from nexus_qa.workflows.executor import MAX_OUTPUT_LINES, run_command
+
+# Default cap on concurrently running steps for parallel workflows
+DEFAULT_MAX_WORKERS = 4
 
 
 class WorkflowEngine:
     """Engine for loading and executing workflows."""
     
+    # Lines of stdout/stderr kept per step; earlier output is only streamed
+    max_output_lines = MAX_OUTPUT_LINES
+    
     def __init__(self):
         """Initialize the workflow engine."""
         self.config_dir = Path.home() / ".config" / "nexus"
@@ -92,7 +100,9 @@ class WorkflowEngine:
                 steps=steps,
                 output_format=data.get('output_format', 'summary'),
                 estimated_duration=data.get('estimated_duration'),
-                variables=data.get('variables', {})
+                variables=data.get('variables', {}),
+                parallel=data.get('parallel', False),
+                max_workers=data.get('max_workers')
             )
             
             return workflow
@@ -119,8 +129,14 @@ class WorkflowEngine:
         
         return workflows
     
-    def execute_step(self, step: WorkflowStep, variables: Dict[str, str] = None) -> Dict[str, Any]:
-        """Execute a single workflow step."""
+    def execute_step(self, step: WorkflowStep, variables: Dict[str, str] = None,
+                     on_line: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """Execute a single workflow step.
+        
+        Output is read line by line as the command runs; ``on_line(stream, line)``
+        sees every line, while the result keeps only the last
+        ``max_output_lines`` lines of stdout and stderr.
+        """
         if variables is None:
             variables = {}
 
@@ -170,37 +186,38 @@ class WorkflowEngine:
                     result['error'] = "Command is empty after parsing"
                     return result
                 shell = False
-            process = subprocess.run(
+            outcome = asyncio.run(run_command(
                 argv,
                 shell=shell,
-                capture_output=True,
-                text=True,
                 timeout=timeout,
-                cwd=os.getcwd()
-            )
+                cwd=os.getcwd(),
+                max_lines=self.max_output_lines,
+                watch=step.fail_if_output_contains,
+                on_line=on_line
+            ))
             
-            result['exit_code'] = process.returncode
-            result['output'] = process.stdout
-            if process.stderr:
-                result['error'] = process.stderr
+            result['exit_code'] = outcome['exit_code']
+            result['output'] = outcome['stdout']
+            if outcome['stderr']:
+                result['error'] = outcome['stderr']
             
             # Check conditions
-            if step.fail_if_exit_code_nonzero and process.returncode != 0:
+            if outcome['timed_out']:
+                result['error'] = f"Command timed out after {timeout} seconds"
+                result['success'] = step.continue_on_error
+            elif step.fail_if_exit_code_nonzero and outcome['exit_code'] != 0:
                 result['success'] = False
-            elif step.fail_if_empty and not process.stdout.strip():
+            elif step.fail_if_empty and not outcome['has_output']:
                 result['success'] = False
                 result['error'] = "Command produced no output"
-            elif step.fail_if_output_contains and step.fail_if_output_contains in process.stdout:
+            elif step.fail_if_output_contains and outcome['watch_found']:
                 result['success'] = False
                 result['error'] = f"Output contains forbidden string: {step.fail_if_output_contains}"
-            elif process.returncode == 0:
+            elif outcome['exit_code'] == 0:
                 result['success'] = True
             else:
                 result['success'] = step.continue_on_error
             
-        except subprocess.TimeoutExpired:
-            result['error'] = f"Command timed out after {timeout} seconds"
-            result['success'] = step.continue_on_error
         except Exception as e:
             result['error'] = str(e)
             result['success'] = step.continue_on_error
@@ -210,14 +227,93 @@ class WorkflowEngine:
         
         return result
     
+    def resolve_dependencies(self, workflow: Workflow) -> List[List[int]]:
+        """Resolve each step's dependencies to indexes of earlier-declared or named steps.
+        
+        Steps without ``depends_on`` run after the previous step, unless the
+        workflow is ``parallel``, in which case they can start immediately.
+        Raises ValueError for unknown step names and dependency cycles.
+        """
+        index = {step.name: i for i, step in enumerate(workflow.steps)}
+        dependencies = []
+        for i, step in enumerate(workflow.steps):
+            if step.depends_on is not None:
+                unknown = [name for name in step.depends_on if name not in index]
+                if unknown:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{unknown[0]}'")
+                dependencies.append(sorted({index[name] for name in step.depends_on}))
+            elif workflow.parallel or i == 0:
+                dependencies.append([])
+            else:
+                dependencies.append([i - 1])
+        
+        # Kahn's algorithm: anything left unvisited sits on a cycle
+        remaining = {i: set(deps) for i, deps in enumerate(dependencies)}
+        ready = [i for i, deps in remaining.items() if not deps]
+        while ready:
+            done = ready.pop()
+            del remaining[done]
+            for i, deps in remaining.items():
+                if done in deps:
+                    deps.discard(done)
+                    if not deps:
+                        ready.append(i)
+        if remaining:
+            names = ", ".join(workflow.steps[i].name for i in sorted(remaining))
+            raise ValueError(f"Workflow '{workflow.name}' has a dependency cycle between steps: {names}")
+        
+        return dependencies
+    
+    @staticmethod
+    def _line_printer(step_name: str) -> Callable[[str, str], None]:
+        """Build an ``on_line`` callback that prints output prefixed with the step name."""
+        def on_line(stream: str, line: str):
+            text = line.rstrip("\n")
+            print(f"[{step_name}] {text}", file=sys.stderr if stream == "stderr" else sys.stdout, flush=True)
+        return on_line
+    
+    def _run_step(self, step: WorkflowStep, variables: Dict[str, str],
+                  stream: bool = False) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Execute a step, falling back to its alternative command if it failed."""
+        on_line = self._line_printer(step.name) if stream else None
+        step_result = self.execute_step(step, variables, on_line)
+        alt_result = None
+        if not step_result['success'] and step.continue_on_error and step.alternative:
+            alt_step = WorkflowStep(
+                name=step.name + "_alt",
+                command=step.alternative,
+                description=step.description,
+                capture_output=step.capture_output,
+                continue_on_error=True,
+                timeout=step.timeout,
+                shell=step.shell
+            )
+            alt_result = self.execute_step(alt_step, variables, on_line)
+        return step_result, alt_result
+    
     def execute_workflow(self, workflow: Workflow, variables: Dict[str, str] = None, 
-                        verbose: bool = False) -> WorkflowExecution:
-        """Execute a complete workflow."""
+                        verbose: bool = False, max_workers: Optional[int] = None,
+                        stream: bool = False) -> WorkflowExecution:
+        """Execute a complete workflow.
+        
+        Steps run as a DAG: a step starts once every step it depends on has
+        finished, with up to ``max_workers`` steps running at a time. Results
+        are reported in declared order. A failing step without
+        ``continue_on_error`` stops any further steps from being scheduled.
+        With ``stream``, output lines are printed live, prefixed with the step name.
+        """
         if variables is None:
             variables = {}
         
         # Merge workflow variables with provided variables
         all_variables = {**workflow.variables, **variables}
+        dependencies = self.resolve_dependencies(workflow)
+        
+        # Plain sequential workflows keep a single worker and inline progress output
+        concurrent = workflow.parallel or any(step.depends_on is not None for step in workflow.steps)
+        workers = max_workers or workflow.max_workers or DEFAULT_MAX_WORKERS
+        workers = max(1, min(workers, len(workflow.steps))) if concurrent else 1
+        inline = workers == 1 and not stream
         
         execution = WorkflowExecution(
             workflow_name=workflow.name,
@@ -227,73 +323,84 @@ class WorkflowEngine:
             steps_completed=0
         )
         
-        results = []
-        output_lines = []
+        total = len(workflow.steps)
+        results: Dict[int, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = {}
+        waiting = {i: set(deps) for i, deps in enumerate(dependencies)}
+        running = {}
+        failed = []
         
         if verbose:
             print(f"🚀 Executing workflow: {workflow.name}")
             print(f"📋 Description: {workflow.description}")
-            print(f"📊 Steps: {len(workflow.steps)}")
+            print(f"📊 Steps: {total}" + (f" (up to {workers} in parallel)" if workers > 1 else ""))
             print()
         
-        for i, step in enumerate(workflow.steps, 1):
-            if verbose:
-                print(f"[{i}/{len(workflow.steps)}] {step.name}...", end=' ', flush=True)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # Schedule every ready step in declared order until something fails
+                if not failed:
+                    for i in sorted(i for i, deps in waiting.items() if not deps):
+                        if len(running) >= workers:
+                            break
+                        del waiting[i]
+                        if verbose and inline:
+                            print(f"[{i + 1}/{total}] {workflow.steps[i].name}...", end=' ', flush=True)
+                        running[pool.submit(self._run_step, workflow.steps[i], all_variables, stream)] = i
             
-            step_result = self.execute_step(step, all_variables)
-            results.append(step_result)
-            execution.steps_completed = i
+                if not running:
+                    break
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(finished, key=running.get):
+                    i = running.pop(future)
+                    step = workflow.steps[i]
+                    results[i] = future.result()
+                    step_result, alt_result = results[i]
+                    execution.steps_completed += 1
+                    
+                    if verbose:
+                        status_icon = "✓" if step_result['success'] else "✗"
+                        if inline:
+                            print(f"{status_icon} ({step_result['duration']:.2f}s)")
+                        else:
+                            print(f"[{execution.steps_completed}/{total}] {step.name} "
+                                  f"{status_icon} ({step_result['duration']:.2f}s)")
+                        if alt_result is not None:
+                            print(f"  Trying alternative command... {'✓' if alt_result['success'] else '✗'}")
+                    
+                    if step_result['success'] or step.continue_on_error:
+                        for deps in waiting.values():
+                            deps.discard(i)
+                    else:
+                        failed.append(i)
+        
+        output_lines = []
+        for i in sorted(results):
+            step = workflow.steps[i]
+            step_result, alt_result = results[i]
             
             # Format output
             if step_result['success']:
-                status_icon = "✓"
-                if verbose:
-                    print(f"{status_icon} ({step_result['duration']:.2f}s)")
-                
                 if step.capture_output and step_result['output']:
                     output_lines.append(f"✓ {step.name}:")
                     output_lines.append(step_result['output'])
                     if step.warn_on_output and step_result['output'].strip():
                         output_lines.append("⚠ Warning: Output detected")
             else:
-                status_icon = "✗"
-                if verbose:
-                    print(f"{status_icon} ({step_result['duration']:.2f}s)")
-                
                 output_lines.append(f"✗ {step.name}:")
                 if step_result['error']:
                     output_lines.append(f"Error: {step_result['error']}")
                 if step_result['output']:
                     output_lines.append(step_result['output'])
                 
-                # Check if we should continue
-                if not step.continue_on_error:
-                    execution.status = 'failed'
-                    execution.error = f"Step '{step.name}' failed: {step_result.get('error', 'Unknown error')}"
-                    break
-                else:
-                    # Try alternative command if available
-                    if step.alternative:
-                        if verbose:
-                            print(f"  Trying alternative command...", end=' ', flush=True)
-                        alt_step = WorkflowStep(
-                            name=step.name + "_alt",
-                            command=step.alternative,
-                            description=step.description,
-                            capture_output=step.capture_output,
-                            continue_on_error=True,
-                            timeout=step.timeout,
-                            shell=step.shell
-                        )
-                        alt_result = self.execute_step(alt_step, all_variables)
-                        if alt_result['success']:
-                            if verbose:
-                                print("✓")
-                            output_lines.append(f"✓ {step.name} (alternative):")
-                            output_lines.append(alt_result['output'])
-                        else:
-                            if verbose:
-                                print("✗")
+                if alt_result is not None and alt_result['success']:
+                    output_lines.append(f"✓ {step.name} (alternative):")
+                    output_lines.append(alt_result['output'])
+        
+        if failed:
+            step = workflow.steps[min(failed)]
+            execution.status = 'failed'
+            execution.error = f"Step '{step.name}' failed: {results[min(failed)][0].get('error', 'Unknown error')}"
         
         execution.completed_at = datetime.now()
         
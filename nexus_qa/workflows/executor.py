@@ -0,0 +1,153 @@
+"""Asyncio subprocess executor for workflow steps.
+
+Runs a step's command in its own process group, streams stdout/stderr line
+by line to an optional callback and keeps only the last ``max_lines`` lines
+of each stream, so steps that print hundreds of MB never sit in memory.
+"""
+
+import asyncio
+import codecs
+import os
+import signal
+from collections import deque
+from typing import Callable, Dict, List, Optional, Union
+
+# Lines kept per stream for the step result (older lines are dropped)
+MAX_OUTPUT_LINES = 2000
+
+READ_CHUNK_SIZE = 64 * 1024
+# Longer lines are split so one runaway line cannot grow without bound
+MAX_LINE_LENGTH = 64 * 1024
+
+# Seconds to wait for pipes to drain after the process group was killed
+KILL_GRACE_PERIOD = 1.0
+
+
+class StreamCapture:
+    """Ring buffer for one output stream plus the checks steps run on it."""
+    
+    def __init__(self, name: str, max_lines: int, watch: Optional[str] = None,
+                 on_line: Optional[Callable[[str, str], None]] = None):
+        self.name = name
+        self.lines = deque(maxlen=max_lines)
+        self.total_lines = 0
+        self.has_content = False
+        self.watch = watch
+        self.watch_found = False
+        # Last len(watch) - 1 characters seen, so matches spanning lines or split chunks are found
+        self._watch_tail = ""
+        self.on_line = on_line
+    
+    def add(self, line: str):
+        """Record one line of output."""
+        self.total_lines += 1
+        self.lines.append(line)
+        if not self.has_content and line.strip():
+            self.has_content = True
+        if self.watch and not self.watch_found:
+            window = self._watch_tail + line
+            if self.watch in window:
+                self.watch_found = True
+            else:
+                self._watch_tail = window[max(len(window) - len(self.watch) + 1, 0):]
+        if self.on_line:
+            self.on_line(self.name, line)
+    
+    @property
+    def dropped_lines(self) -> int:
+        return self.total_lines - len(self.lines)
+    
+    def text(self) -> str:
+        """Get the retained output, noting how many earlier lines were dropped."""
+        text = "".join(self.lines)
+        if self.dropped_lines:
+            text = f"... ({self.dropped_lines} earlier lines not kept)\n" + text
+        return text
+
+
+async def _pump(reader: asyncio.StreamReader, capture: StreamCapture):
+    """Read a pipe in chunks and feed complete lines to ``capture``."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while True:
+        chunk = await reader.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            capture.add(line + "\n")
+        while len(pending) > MAX_LINE_LENGTH:
+            capture.add(pending[:MAX_LINE_LENGTH])
+            pending = pending[MAX_LINE_LENGTH:]
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        capture.add(pending)
+
+
+def _kill_group(process: asyncio.subprocess.Process):
+    """Kill the step's whole process group (the shell and anything it started)."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def run_command(command: Union[str, List[str]], shell: bool = False,
+                      timeout: Optional[float] = None, cwd: Optional[str] = None,
+                      max_lines: int = MAX_OUTPUT_LINES, watch: Optional[str] = None,
+                      on_line: Optional[Callable[[str, str], None]] = None) -> Dict:
+    """Run a command, streaming its output and enforcing ``timeout``.
+    
+    ``on_line(stream, line)`` is called for every stdout/stderr line as it
+    arrives. ``watch`` is searched for in the whole stdout stream, including
+    matches that span lines.
+    
+    Returns a dict with ``exit_code`` (None on timeout), ``timed_out``,
+    ``stdout``/``stderr`` (the retained tail of each), ``has_output`` (stdout
+    had non-whitespace content) and ``watch_found``.
+    """
+    stdout = StreamCapture("stdout", max_lines, watch=watch, on_line=on_line)
+    stderr = StreamCapture("stderr", max_lines, on_line=on_line)
+    
+    # A new session makes the child a process group leader we can kill as a whole
+    if shell:
+        process = await asyncio.create_subprocess_shell(
+            command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.DEVNULL, cwd=cwd, start_new_session=True)
+    else:
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.DEVNULL, cwd=cwd, start_new_session=True)
+    
+    pumps = asyncio.gather(_pump(process.stdout, stdout), _pump(process.stderr, stderr))
+    
+    async def finish():
+        # Shielded so the pumps can drain what is left after a timeout kill
+        await asyncio.shield(pumps)
+        await process.wait()
+    
+    timed_out = False
+    try:
+        await asyncio.wait_for(finish(), timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        _kill_group(process)
+        await process.wait()
+        try:
+            # Pipes close once every process in the group is gone
+            await asyncio.wait_for(pumps, KILL_GRACE_PERIOD)
+        except asyncio.TimeoutError:
+            pass
+    finally:
+        if process.returncode is None:
+            _kill_group(process)
+            await process.wait()
+    
+    return {
+        'exit_code': None if timed_out else process.returncode,
+        'timed_out': timed_out,
+        'stdout': stdout.text(),
+        'stderr': stderr.text(),
+        'has_output': stdout.has_content,
+        'watch_found': stdout.watch_found,
+    }
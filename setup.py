@@ -36,7 +36,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "nexus=nexus_qa.main:cli",
+            "nexus=nexus_qa.main:run",
         ],
     },
 )